@@ -0,0 +1,205 @@
+"""
+CORE BENCHMARK
+
+Measures the hot paths of the core machine and reports the results as JSON so
+runs can be compared across releases.
+
+    character_input         characters per second for each machine type
+    make_machine            seconds to make each machine type with settings
+    settings_setter         seconds to apply settings to each machine type
+    plugboard               characters per second with no plugboard
+                            connections, a stecker plugboard and an uhr box
+    rotor_translation_maps  seconds for RotorCore._make_translation_maps with
+                            the shared tables made and with a table rebuild
+
+Run from the enigma directory with
+
+    python -m benchmarks.core_benchmark [--number N] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict
+from enigma_core.factory import make_machine, machine_list
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
+from enigma_core.settings.settings import EQUIPMENT_DICT
+
+MESSAGE = "WETTERBERICHTFUERDIEBISKAYA" * 40
+
+MACHINE_SETTINGS = {
+    "WEHRMACHT":{
+        "reflector":"UKW-B",
+        "rotor_types":{"RS":"I","RM":"II","RF":"III"},
+        "rotor_settings":{"RS":"A","RM":"D","RF":"U"},
+        "ring_settings":{"RS":"B","RM":"C","RF":"D"}
+    },
+    "LUFTWAFFE":{
+        "reflector":"UKW-C",
+        "rotor_types":{"RS":"VI","RM":"VII","RF":"VIII"},
+        "rotor_settings":{"RS":"C","RM":"L","RF":"X"}
+    },
+    "ENIGMA M3 Kriegsmarine":{
+        "reflector":"UKW-C",
+        "rotor_types":{"RS":"VII","RM":"V","RF":"I"},
+        "rotor_settings":{"RS":"H","RM":"Y","RF":"O"},
+        "ring_settings":{"RS":"A","RM":"F","RF":"K"}
+    },
+    "ENIGMA M4 u-boat":{
+        "reflector":"UKW-B",
+        "rotor_types":{"R4":"Beta","RS":"II","RM":"IV","RF":"I"},
+        "rotor_settings":{"R4":"V","RS":"J","RM":"N","RF":"A"},
+        "ring_settings":{"R4":"A","RS":"A","RM":"A","RF":"V"}
+    }
+}
+
+STECKER_CONNECTIONS = [
+    ["A","Z"],["B","Y"],["C","X"],["D","W"],["E","V"],
+    ["F","U"],["G","T"],["H","S"],["I","R"],["J","Q"]
+]
+
+UHR_BOX_CONNECTIONS = {
+    "01A":"A","02A":"B","03A":"C","04A":"D","05A":"E",
+    "06A":"F","07A":"G","08A":"H","09A":"I","10A":"J",
+    "01B":"K","02B":"L","03B":"M","04B":"N","05B":"O",
+    "06B":"P","07B":"Q","08B":"R","09B":"S","10B":"T"
+}
+
+
+def best_time(func: Callable, number: int, repeat: int=5) -> float:
+    """
+    Takes a function, a number of calls and a number of repeats. Returns the
+    best time in seconds for one call.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def character_rate(machine, number: int) -> float:
+    """
+    Takes a machine and a number of messages. Returns the characters per
+    second of character_input for the benchmark message.
+    """
+    character_input = machine.character_input
+
+    def encrypt():
+        for c in MESSAGE:
+            character_input(c)
+
+    return len(MESSAGE) / best_time(encrypt, number)
+
+
+def character_input(number: int=5) -> Dict[str, float]:
+    """
+    Takes a number of messages. Returns a dictionary of machine type to
+    characters per second.
+    """
+    return {
+        machine_type: character_rate(make_machine(machine_type, MACHINE_SETTINGS[machine_type]), number)
+        for machine_type in machine_list()
+    }
+
+
+def machine_construction(number: int=50) -> Dict[str, float]:
+    """
+    Takes a number of machines. Returns a dictionary of machine type to
+    seconds to make a machine with settings.
+    """
+    return {
+        machine_type: best_time(lambda: make_machine(machine_type, MACHINE_SETTINGS[machine_type]), number)
+        for machine_type in machine_list()
+    }
+
+
+def settings_setter(number: int=200) -> Dict[str, float]:
+    """
+    Takes a number of calls. Returns a dictionary of machine type to seconds
+    to apply settings to a machine.
+    """
+    results = {}
+    for machine_type in machine_list():
+        settings = MACHINE_SETTINGS[machine_type]
+        machine = make_machine(machine_type, settings)
+
+        def apply_settings():
+            machine.settings = settings
+
+        results[machine_type] = best_time(apply_settings, number)
+    return results
+
+
+def plugboard(number: int=5) -> Dict[str, float]:
+    """
+    Takes a number of messages. Returns a dictionary of plugboard to
+    characters per second for a LUFTWAFFE machine.
+    """
+    settings = MACHINE_SETTINGS["LUFTWAFFE"]
+    stecker = dict(settings, plugboard_mode='S', plugboard_connections=STECKER_CONNECTIONS)
+    uhr_box = dict(settings, plugboard_mode='U', uhr_box_setting=13, plugboard_connections=UHR_BOX_CONNECTIONS)
+    return {
+        "none": character_rate(make_machine("LUFTWAFFE", settings), number),
+        "stecker": character_rate(make_machine("LUFTWAFFE", stecker), number),
+        "uhr_box": character_rate(make_machine("LUFTWAFFE", uhr_box), number)
+    }
+
+
+def rotor_translation_maps(number: int=1000) -> Dict[str, float]:
+    """
+    Takes a number of calls. Returns a dictionary with the seconds for
+    RotorCore._make_translation_maps when the shared tables are already made
+    and when the tables are rebuilt.
+    """
+    collection = make_machine("WEHRMACHT", MACHINE_SETTINGS["WEHRMACHT"]).scrambler.collection
+    rotor = collection.borrow_device("IV")
+    core = rotor.core
+    key = tuple(EQUIPMENT_DICT["WEHRMACHT"]["ROTORS"]["IV"]["wiring_chars"])
+
+    def rebuild():
+        WiringTables._rotor_tables.pop(key, None)
+        core._make_translation_maps()
+
+    results = {
+        "cached": best_time(core._make_translation_maps, number),
+        "build": best_time(rebuild, number // 10 or 1)
+    }
+    collection.return_device(rotor)
+    return results
+
+
+def run(number: int=5) -> Dict:
+    """
+    Takes a number of messages for the character rate benchmarks. Returns a
+    dictionary of the benchmark results with the python version and
+    platform.
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "character_input": character_input(number),
+        "make_machine": machine_construction(),
+        "settings_setter": settings_setter(),
+        "plugboard": plugboard(number),
+        "rotor_translation_maps": rotor_translation_maps()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="core machine benchmarks")
+    parser.add_argument('-n', '--number', type=int, default=5, help='messages for each character rate')
+    parser.add_argument('-o', '--output', type=str, help='JSON results file')
+    args = parser.parse_args()
+
+    # keep stdout for the JSON results.
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run(args.number)
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
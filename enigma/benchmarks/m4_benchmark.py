@@ -0,0 +1,93 @@
+"""
+M4 BENCHMARK
+
+Compares the throughput of the ENIGMA M4 u-boat machine with the three rotor
+machines on each fast path: character_input, character_input with the
+scrambler permutation cache, Enigma.encrypt and BatchEnigma.encrypt (when
+numpy is installed). For each path the M4 rate is reported as a ratio of the
+mean three rotor rate.
+
+Run from the enigma directory with
+
+    python -m benchmarks.m4_benchmark [number]
+"""
+
+import sys
+from typing import Callable, Dict
+from benchmarks.core_benchmark import MACHINE_SETTINGS, MESSAGE, best_time, character_rate
+from enigma_core.factory import make_machine, machine_list
+from enigma_core.enigma_core.batch_enigma import BatchEnigma, np
+
+M4 = "ENIGMA M4 u-boat"
+
+BATCH_SIZE = 64
+
+
+def cached_character_rate(machine_type: str, number: int) -> float:
+    """
+    Takes a machine type and a number of messages. Returns the characters
+    per second of character_input with the permutation cache enabled.
+    """
+    machine = make_machine(machine_type, MACHINE_SETTINGS[machine_type])
+    machine.scrambler.permutation_cache_size = 26
+    return character_rate(machine, number)
+
+
+def encrypt_rate(machine_type: str, number: int) -> float:
+    """
+    Takes a machine type and a number of messages. Returns the characters
+    per second of Enigma.encrypt.
+    """
+    machine = make_machine(machine_type, MACHINE_SETTINGS[machine_type])
+    return len(MESSAGE) / best_time(lambda: machine.encrypt(MESSAGE), number)
+
+
+def batch_rate(machine_type: str, number: int) -> float:
+    """
+    Takes a machine type and a number of messages. Returns the characters
+    per second for each setting of BatchEnigma.encrypt with a batch of
+    BATCH_SIZE settings.
+    """
+    batch = BatchEnigma(machine_type, [MACHINE_SETTINGS[machine_type]] * BATCH_SIZE)
+    return len(MESSAGE) * BATCH_SIZE / best_time(lambda: batch.encrypt(MESSAGE), number)
+
+
+def paths() -> Dict[str, Callable[[str, int], float]]:
+    """
+    Returns a dictionary of path name to rate function.
+    """
+    rates = {
+        "character_input": lambda machine_type, number: character_rate(
+            make_machine(machine_type, MACHINE_SETTINGS[machine_type]), number),
+        "permutation_cache": cached_character_rate,
+        "encrypt": encrypt_rate
+    }
+    if np is not None:
+        rates["batch"] = batch_rate
+    return rates
+
+
+def run(number: int=5) -> Dict[str, Dict[str, float]]:
+    """
+    Takes a number of messages. Returns a dictionary of path name to a
+    dictionary of machine type to characters per second, with the M4 ratio
+    to the mean three rotor rate.
+    """
+    results = {}
+    for name, rate in paths().items():
+        rates = {machine_type: rate(machine_type, number) for machine_type in machine_list()}
+        three_rotor = [r for machine_type, r in rates.items() if machine_type != M4]
+        rates["m4_ratio"] = rates[M4] / (sum(three_rotor) / len(three_rotor))
+        results[name] = rates
+    return results
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, rates in run(number).items():
+        print(name)
+        for machine_type, rate in rates.items():
+            if machine_type == "m4_ratio":
+                print(f"    {'M4 / three rotor'.ljust(25, ' ')}{rate:>12.2f}")
+            else:
+                print(f"    {machine_type.ljust(25, ' ')}{rate:>12.0f} chars/s")
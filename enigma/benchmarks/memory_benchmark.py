@@ -0,0 +1,44 @@
+"""
+MEMORY BENCHMARK
+
+Reports the memory allocated for each Enigma instance. Machines are made with
+make_machine for each machine type and held in a list while tracemalloc
+measures the allocated memory.
+
+Run from the enigma directory with
+
+    python -m benchmarks.memory_benchmark [count]
+"""
+
+import sys
+import tracemalloc
+from typing import Dict
+from enigma_core.factory import make_machine, machine_list
+
+
+def machine_memory(machine_type: str, count: int=200) -> int:
+    """
+    Takes a machine type and a number of machines. Returns the average number
+    of bytes allocated for each machine.
+    """
+    machines = [make_machine(machine_type)]
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    machines = [make_machine(machine_type) for _ in range(count)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (end - start) // len(machines)
+
+
+def run(count: int=200) -> Dict[str, int]:
+    """
+    Takes a number of machines for each machine type. Returns a dictionary of
+    machine type to average bytes per machine.
+    """
+    return {machine_type: machine_memory(machine_type, count) for machine_type in machine_list()}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for machine_type, size in run(count).items():
+        print(f"{machine_type.ljust(25, ' ')}{size:>10} bytes per machine")
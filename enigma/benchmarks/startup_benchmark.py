@@ -0,0 +1,54 @@
+"""
+STARTUP BENCHMARK
+
+Reports the wall time of short enigma.py commands run in a new interpreter.
+Each command is run a number of times and the median time is reported, so
+the time is dominated by interpreter startup, imports and parser building.
+
+Run from the enigma directory with
+
+    python -m benchmarks.startup_benchmark [repeats]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ENIGMA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "statistics": ["statistics", "-s", "WETTERBERICHTFUERDIEBISKAYA", "-ioc"],
+    "enigma_simulator": ["enigma_simulator", "WEHRMACHT", "UKW-B", "I II III", "--message", "HELLOWORLD"],
+    "help": ["-h"]
+}
+
+
+def startup_time(args: List[str], repeats: int=10) -> float:
+    """
+    Takes a list of enigma.py arguments and a number of repeats. Returns the
+    median wall time in seconds of running enigma.py with those arguments.
+    """
+    command = [sys.executable, os.path.join(ENIGMA_DIR, "enigma.py"), *args]
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ENIGMA_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(repeats: int=10) -> Dict[str, float]:
+    """
+    Takes a number of repeats. Returns a dictionary of command name to median
+    wall time in seconds.
+    """
+    return {name: startup_time(args, repeats) for name, args in COMMANDS.items()}
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, seconds in run(repeats).items():
+        print(f"{name.ljust(25, ' ')}{seconds*1000:>10.1f} ms")
@@ -1,97 +1,74 @@
 import argparse
+import importlib
+import sys
 from argparse import RawTextHelpFormatter
-from enigma_cli.enigma_app_cli.enigma_app_cli import InteractiveEnigmaCli
-from enigma_cli.enigma_cli.enigma_cli1 import CommandLineEnigmaCli
-from enigma_cli.code_sheet_cli.code_sheet_cli import CodeSheetCli
-from enigma_cli.statistics_cli.statistics_cli import StatisticsCli
-from enigma_cli.indicators_cli.indicators_cli import IndicatorsCli
-from enigma_cli.permutations_cli.permutations_solver_cli import PermutationsSolverCli
-from enigma_cli.zygalski_sheets_cli.zygalski_sheet_cli import ZygalskiSheetCli
-from enigma_cli.wehrmacht_catalog_cli.wehrmacht_catalog_cli import WehrmachtCatalogCli
-from enigma_cli.turing_bombe_cli.turing_bombe_cli import TuringBombeCli
+
+# command name to (cli module, cli class, help, subparser kwargs, takes
+# parser). The cli module is only imported when its command is run, and its
+# class is made with the subparser if it takes the parser.
+COMMANDS = {
+    'interactive_enigma': (
+        'enigma_cli.enigma_app_cli.enigma_app_cli', 'InteractiveEnigmaCli',
+        'interactive enigma', {}, False),
+    'enigma_simulator': (
+        'enigma_cli.enigma_cli.enigma_cli1', 'CommandLineEnigmaCli',
+        'cli enigma', {'formatter_class': RawTextHelpFormatter}, True),
+    'code_sheet': (
+        'enigma_cli.code_sheet_cli.code_sheet_cli', 'CodeSheetCli',
+        'returns an enigma code sheet', {}, True),
+    'statistics': (
+        'enigma_cli.statistics_cli.statistics_cli', 'StatisticsCli',
+        'provides bigram trigram and index of coincidence values', {}, True),
+    'indicators': (
+        'enigma_cli.indicators_cli.indicators_cli', 'IndicatorsCli',
+        'generates and filters enigma indicators', {}, True),
+    'permutations': (
+        'enigma_cli.permutations_cli.permutations_solver_cli', 'PermutationsSolverCli',
+        'solves for rotor permutations', {}, True),
+    'zygalski_sheets': (
+        'enigma_cli.zygalski_sheets_cli.zygalski_sheet_cli', 'ZygalskiSheetCli',
+        'generates zygalski sheets', {}, True),
+    'wehrmacht_catalog': (
+        'enigma_cli.wehrmacht_catalog_cli.wehrmacht_catalog_cli', 'WehrmachtCatalogCli',
+        'generates the wehrmacht zygalski sheet data', {}, True),
+    'turing_bombe': (
+        'enigma_cli.turing_bombe_cli.turing_bombe_cli', 'TuringBombeCli',
+        '', {}, True)
+}
+
+
+def _make_command_cli(command, parser):
+    """
+    Takes a command name and its subparser. Imports the cli module for the
+    command and returns the cli object that adds its arguments to the parser.
+    """
+    module_name, class_name, _, _, takes_parser = COMMANDS[command]
+    cli_class = getattr(importlib.import_module(module_name), class_name)
+    return cli_class(parser) if takes_parser else cli_class()
 
 
 def enigma_cli(argv=None):
 
+    argv = sys.argv[1:] if argv is None else argv
+
     parser = argparse.ArgumentParser()
 
     subparsers = parser.add_subparsers(dest='command')
     subparsers.required = True
 
-    subparsers.add_parser(
-        'interactive_enigma',
-        help="interactive enigma")
-    interactive_enigma_cli = InteractiveEnigmaCli()
-
-    command_line_enigma = subparsers.add_parser(
-        'enigma_simulator',
-        help='cli enigma',
-        formatter_class=RawTextHelpFormatter)
-    command_line_enigma_cli = CommandLineEnigmaCli(command_line_enigma)
-
-    code_sheet = subparsers.add_parser(
-        'code_sheet',
-        help='returns an enigma code sheet')
-    code_sheet_cli = CodeSheetCli(code_sheet)
-
-    statistics = subparsers.add_parser(
-        'statistics',
-        help='provides bigram trigram and index of coincidence values')
-    statistics_cli = StatisticsCli(statistics)
-
-    indicators = subparsers.add_parser(
-        'indicators',
-        help='generates and filters enigma indicators')
-    indicators_cli = IndicatorsCli(indicators)
-
-    permutations_solver = subparsers.add_parser(
-        'permutations',
-        help='solves for rotor permutations')
-    permutations_solver_cli = PermutationsSolverCli(permutations_solver)
-
-    zygalski_sheets = subparsers.add_parser(
-        'zygalski_sheets',
-        help='generates zygalski sheets')
-    zygalski_sheets_cli = ZygalskiSheetCli(zygalski_sheets)
-
-    wehrmacht_catalog = subparsers.add_parser(
-        'wehrmacht_catalog',
-        help='generates the wehrmacht zygalski sheet data')
-    wehrmacht_catalog_cli = WehrmachtCatalogCli(wehrmacht_catalog)
+    # only the selected command cli is made. With no command the subparsers
+    # are added for the top level help and usage errors.
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    command_cli = None
 
-    turing_bombe = subparsers.add_parser(
-        'turing_bombe',
-        help='')
-    turing_bombe_cli = TuringBombeCli(turing_bombe)
+    for name, (_, _, _help, kwargs, _) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=_help, **kwargs)
+        if name == command:
+            command_cli = _make_command_cli(name, subparser)
 
     args = parser.parse_args(argv)
     args = vars(args)
 
-    if args['command'] == 'interactive_enigma':
-        interactive_enigma_cli.process_args(args)
-
-    elif args['command'] == 'enigma_simulator':
-        command_line_enigma_cli.process_args(args)
-
-    elif args['command'] == 'code_sheet':
-        code_sheet_cli.process_args(args)
-
-    elif args['command'] == 'statistics':
-        statistics_cli.process_args(args)
-
-    elif args['command'] == 'indicators':
-        indicators_cli.process_args(args)
-
-    elif args['command'] == 'permutations':
-        permutations_solver_cli.process_args(args)
-
-    elif args['command'] == 'zygalski_sheets':
-        zygalski_sheets_cli.process_args(args)
-
-    elif args['command'] == 'wehrmacht_catalog':
-        wehrmacht_catalog_cli.process_args(args)
-
-    elif args['command'] == 'turing_bombe':
-        turing_bombe_cli.process_args(args)
+    command_cli.process_args(args)
 
     return 0
@@ -1,4 +1,5 @@
 from enigma_core.factory import make_machine, machine_list
+from enigma_core.scrambler.collection.collection import Collection
 import argparse
 import json
 import re
@@ -323,8 +324,7 @@ class CommandLineEnigmaCli:
         machines = machine_list()
         
         for machine in machines:
-            machine_obj = make_machine(machine)
-            self._machine_data[machine] = machine_obj.scrambler.collection.collection_dict()
+            self._machine_data[machine] = Collection.machine_devices(machine)
 
     def _add_parser_arguments(self):
         self._add_machine_arg()
@@ -2,16 +2,33 @@ from enigma_core.validators.machine_validators import *
 from enigma_core.validators.scrambler_validators import *
 from enigma_core.validators.plugboard_validators import *
 from enigma_core.factory import make_machine, machine_list
+from enigma_core.scrambler.collection.collection import Collection
+from enigma_core.keyboard.keyboard import Keyboard
+from multiprocessing import Pool
 import argparse
 import json
 import re
 import os
+import sys
+
+
+def encrypt_chunk(machine, settings, offset, chunk):
+    """
+    Takes a machine type, settings dictionary, key press offset and a chunk
+    of keyboard characters. Returns the chunk encrypted from the rotor
+    settings that many key presses after the settings.
+    """
+    machine_obj = make_machine(machine)
+    machine_obj.settings = settings
+    machine_obj.advance(offset)
+    return machine_obj.encrypt(chunk)
 
 
 class CommandLineEnigmaCli:
 
     LETTERS = [chr(i) for i in range(65, 91)]
     NUMBERS = [f"{i+1}".rjust(2, '0') for i in range(26)]
+    BLOCK_SIZE = 1 << 16
 
     def __init__(self, parser):
         self._parser = parser
@@ -32,6 +49,8 @@ class CommandLineEnigmaCli:
         self._uhr_box_setting = None
         self._input_file_path = None
         self._output_file_path = None
+        self._workers = 1
+        self._stream = False
         self._msg = None
 
     def process_args(self, args):
@@ -43,6 +62,7 @@ class CommandLineEnigmaCli:
         self._valid_ring_settings(args)
         self._valid_plugboard_settings(args)
         self._valid_output_file(args)
+        self._valid_stream(args)
         self._get_machine_output(args)
 
     def _set_defaults(self, args):
@@ -150,6 +170,14 @@ class CommandLineEnigmaCli:
                 raise Exception(f"{dirpath} is not a valid directory path.")
             self._output_file_path = output_file
 
+    def _valid_stream(self, args):
+        """
+        
+        """
+        self._stream = args['stream']
+        if self._stream and self._workers > 1:
+            raise Exception("--stream can not be used with --workers.")
+
     def _get_machine_output(self, args):
         """
         
@@ -160,11 +188,17 @@ class CommandLineEnigmaCli:
 
         settings = machine_obj.settings
 
-        outp = ""
-        for c in self._msg:
-            o = machine_obj.character_input(c)
-            if o:
-                outp += o
+        if self._stream:
+            self._stream_machine_output(machine_obj)
+            return
+
+        if self._msg is None:
+            self._msg = self._read_input_file()
+
+        if self._workers > 1:
+            outp = self._get_parallel_output(settings)
+        else:
+            outp = machine_obj.encrypt(self._msg)
         outp += '\n'
         if self._output_file_path:
             with open(self._output_file_path, 'w') as f:
@@ -172,6 +206,80 @@ class CommandLineEnigmaCli:
         else:
             print(outp)
 
+    def _stream_machine_output(self, machine_obj):
+        """
+        Takes the machine. Reads the message in blocks of BLOCK_SIZE
+        characters and writes each encrypted block as soon as it is made.
+        One compiled machine is used for every block so the rotors carry on
+        from one block to the next. A machine with a plugboard that can not
+        be compiled encrypts each block itself.
+        """
+        if machine_obj.plugboard.valid_plugboard():
+            encrypt = machine_obj.compile().encrypt
+        else:
+            encrypt = machine_obj.encrypt
+        if self._output_file_path:
+            outf = open(self._output_file_path, 'w')
+        else:
+            outf = sys.stdout
+        try:
+            for block in self._input_blocks():
+                outf.write(encrypt(block))
+                outf.flush()
+            outf.write('\n')
+            if outf is sys.stdout:
+                # print adds a second new line to the output without --stream.
+                outf.write('\n')
+        finally:
+            if outf is not sys.stdout:
+                outf.close()
+
+    def _input_blocks(self):
+        """
+        Yields the message in blocks of BLOCK_SIZE characters from the message
+        argument, the input file or stdin if the input file is "-".
+        """
+        if self._msg is not None:
+            yield self._msg
+            return
+        if self._input_file_path == '-':
+            inf = sys.stdin
+        else:
+            inf = open(self._input_file_path, 'r')
+        try:
+            block = inf.read(self.BLOCK_SIZE)
+            while block:
+                yield block
+                block = inf.read(self.BLOCK_SIZE)
+        finally:
+            if inf is not sys.stdin:
+                inf.close()
+
+    def _read_input_file(self):
+        """
+        Returns the whole message from the input file or stdin if the input
+        file is "-".
+        """
+        if self._input_file_path == '-':
+            return sys.stdin.read()
+        with open(self._input_file_path, 'r') as f:
+            return f.read()
+
+    def _get_parallel_output(self, settings):
+        """
+        Takes the machine settings. Splits the keyboard characters of the
+        message into one chunk for each worker and encrypts the chunks in a
+        process pool. Each chunk starts from the rotor settings at its key
+        press offset so the output is the same as the serial output.
+        """
+        msg = Keyboard().clean_input_string(self._msg)
+        size = -(-len(msg) // self._workers) or 1
+        chunks = [(self._machine, settings, offset, msg[offset:offset+size])
+                  for offset in range(0, len(msg), size)]
+        with Pool(self._workers) as pool:
+            outputs = pool.starmap(encrypt_chunk, chunks)
+        return ''.join(outputs)
+
     def _make_settings_dict(self):
         """
         
@@ -198,8 +306,7 @@ class CommandLineEnigmaCli:
         machines = machine_list()
         
         for machine in machines:
-            machine_obj = make_machine(machine)
-            self._machine_data[machine] = machine_obj.scrambler.collection.collection_dict()
+            self._machine_data[machine] = Collection.machine_devices(machine)
 
     def _add_parser_arguments(self):
         """
@@ -217,6 +324,8 @@ class CommandLineEnigmaCli:
         self._add_uhr_box_setting_arg()
         self._add_plugboard_settings_arg()
         self._add_output_arg()
+        self._add_workers_arg()
+        self._add_stream_arg()
 
     def _add_machine_arg(self):
         machines = self._machine_data.keys()
@@ -271,17 +380,17 @@ class CommandLineEnigmaCli:
 
     def _add_inputs_arg(self):
         def input_file(v):
-            with open(v, 'r') as f:
-                msg = f.read()
-                self._msg = msg
-                return msg
+            if v != '-' and not os.path.isfile(v):
+                raise argparse.ArgumentTypeError(f'{v} is not a valid file path')
+            self._input_file_path = v
+            return v
 
         def input_msg(v):
             msg = v
             self._msg = msg
             return msg
         group = self._parser.add_mutually_exclusive_group()
-        group.add_argument('-i', '--input-file', type=input_file, help='The input file path')
+        group.add_argument('-i', '--input-file', type=input_file, help='The input file path or "-" for stdin')
         group.add_argument('--message', type=input_msg, help='The message string')
         group.required = True
 
@@ -380,3 +489,22 @@ class CommandLineEnigmaCli:
             '--output-file',
             type=str,
             help='The output file path')
+
+    def _add_workers_arg(self):
+        def validWorkers(v):
+            v = int(v)
+            if v >= 1:
+                self._workers = v
+                return v
+            else:
+                raise argparse.ArgumentTypeError(f'{v} is not a valid number of workers. Must be 1 or more')
+        self._parser.add_argument(
+            '--workers',
+            type=validWorkers,
+            help='Number of worker processes used to encrypt the message')
+
+    def _add_stream_arg(self):
+        self._parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Encrypt the input in blocks and write each block as it is made')
@@ -1,4 +1,4 @@
-from enigma_core.factory import make_machine, machine_list
+from enigma_core.scrambler.collection.collection import Collection
 from indicators.generate_indicators import generate_indicators
 from indicators.filter_females import filter_females
 from argparse import RawTextHelpFormatter
@@ -39,8 +39,7 @@ class IndicatorsCli:
             self._filter_indicators(args)
 
     def _load_machine_data(self):
-        machine_obj = make_machine("WEHRMACHT")
-        self._machine_data = machine_obj.scrambler.collection.collection_dict()
+        self._machine_data = Collection.machine_devices("WEHRMACHT")
 
     def _valid_reflector(self, args):
         pass
@@ -4,39 +4,137 @@ ARGUMENTS TO PROVIDE.
 1. Plain Text.
 2. Cipher Text.
 3. Permutation.
+
+With --workers N greater than 1 every permutation is split into position
+ranges which are solved in a pool of N processes. The stops of all the
+permutations are merged and printed when the run ends. Unlike the serial run
+the positions are not printed as they are tested, progress lines are written
+to stderr and each stop is printed in the stops log layout. The stops are
+the same as the serial run.
+
+With --quiet the positions are not printed. Progress lines are written to
+stderr and the stops are written to stdout as JSON lines.
+
+With --table-directory the scrambler permutation tables generated in that
+directory are memory mapped, tables that are not there are made in memory.
+
+Stops are logged to --log-directory, bombe_logs by default, in the
+--log-format text, jsonl or binary.
 """
-from turing_bombe.turing_bombe import TuringBombe
+from turing_bombe.turing_bombe import TuringBombe, POSITIONS, solve_positions, stop_json
+from turing_bombe.bombe_log import DEFAULT_DIRECTORY, LOG_FORMATS
+from turing_bombe.bombe_progress import BombeProgress
+from multiprocessing import Pool
 import argparse
 import json
 import re
 import os
+import sys
 
 
 class TuringBombeCli:
 
     LETTERS = [chr(i) for i in range(65, 91)]
     NUMBERS = [f"{i+1}".rjust(2, '0') for i in range(26)]
+    # positions in one pool task, every RM and RF position for one RS.
+    TASK_POSITIONS = 26*26
 
     def __init__(self, parser):
         self._parser = parser
+        self._workers = 1
+        self._table_directory = None
+        self._quiet = False
+        self._log_directory = DEFAULT_DIRECTORY
+        self._log_format = "text"
         self._add_parser_arguments()
 
     def process_args(self, args):
-        print(args)
+        self._quiet = args['quiet']
+        if not self._quiet:
+            print(args)
         plain_text = args["plain_text"]
         cipher_text = args["cipher_text"]
         perm_file_path = args["permutations"]
         test_register = args['test_register']
+        self._table_directory = args['table_directory']
+        self._log_directory = args['log_directory']
+        self._log_format = args['log_format']
 
         with open(perm_file_path, "r") as f:
             perms = f.readlines()
 
-        perms = [line.strip() for line in perms]
+        perms = [line.strip() for line in perms if line.strip()]
+
+        if self._workers > 1:
+            self._solve_parallel(plain_text, cipher_text, perms, test_register)
+            return
+
+        if self._quiet:
+            self._solve_quiet(plain_text, cipher_text, perms, test_register)
+            return
 
         for p in perms:
-            turing_bombe = TuringBombe(plain_text, cipher_text, p, test_register)
+            turing_bombe = TuringBombe(plain_text, cipher_text, p, test_register, self._table_directory,
+                                       self._log_directory, self._log_format)
             turing_bombe.solve()
 
+    def _solve_quiet(self, plain_text, cipher_text, perms, test_register):
+        """
+        Takes the plain text, cipher text, list of permutations and test
+        register. Solves each permutation without printing the positions,
+        writing progress lines for the whole run to stderr and each stop to
+        stdout as a JSON line. Returns the stops.
+        """
+        stops = []
+        progress = BombeProgress(len(perms) * POSITIONS)
+        for p in perms:
+            turing_bombe = TuringBombe(plain_text, cipher_text, p, test_register, self._table_directory,
+                                       self._log_directory, self._log_format)
+            stops.extend(turing_bombe.solve_range(0, POSITIONS, False, progress, sys.stdout))
+        progress.finish()
+        return stops
+
+    def _solve_parallel(self, plain_text, cipher_text, perms, test_register):
+        """
+        Takes the plain text, cipher text, list of permutations and test
+        register. Solves every position range of every permutation in a
+        process pool, writing the aggregate progress to stderr as ranges
+        finish. Prints the merged stops in permutation and position order,
+        in the stops log layout or as JSON lines with --quiet, and returns
+        them. The positions are not printed as in the serial run.
+        """
+        tasks = [(plain_text, cipher_text, p, test_register, start,
+                  min(start + self.TASK_POSITIONS, POSITIONS), self._table_directory,
+                  self._log_directory, self._log_format)
+                 for p in perms for start in range(0, POSITIONS, self.TASK_POSITIONS)]
+        stops = []
+        progress = BombeProgress(len(perms) * POSITIONS)
+
+        with Pool(self._workers) as pool:
+            for permutation, positions, task_stops in pool.imap_unordered(solve_positions, tasks):
+                stops.extend(task_stops)
+                progress.update(positions)
+        progress.finish()
+
+        order = {p: i for i, p in enumerate(perms)}
+        stops.sort(key=lambda stop: (order[stop["permutation"]], self._position(stop["settings"])))
+        for stop in stops:
+            if self._quiet:
+                print(stop_json(stop))
+            else:
+                steckers = ' '.join(f"{c1}{c2}" for c1, c2 in stop["stecker_pairs"])
+                print(f"{stop['permutation']} {stop['position']} {steckers}")
+        return stops
+
+    def _position(self, settings):
+        """
+        Takes a rotor settings dictionary and returns the rotor position value
+        RS*676 + RM*26 + RF.
+        """
+        return (self.LETTERS.index(settings["RS"])*676
+                + self.LETTERS.index(settings["RM"])*26
+                + self.LETTERS.index(settings["RF"]))
+
     def _add_parser_arguments(self):
         """
         
@@ -44,4 +142,23 @@ class TuringBombeCli:
         self._parser.add_argument('plain_text', type=str, help='The assumed plain text')
         self._parser.add_argument('cipher_text', type=str, help='The cipher text')
         self._parser.add_argument('permutations', type=str, help='The scrambler permutation file')
-        self._parser.add_argument('test_register', type=str, help='The test register should be a loop character A-Z')
\ No newline at end of file
+        self._parser.add_argument('test_register', type=str, help='The test register should be a loop character A-Z')
+        self._add_workers_arg()
+        self._parser.add_argument('--quiet', action='store_true', help='Write progress to stderr and stops as JSON lines instead of every position')
+        self._parser.add_argument('--table-directory', type=str, help='Directory of generated scrambler permutation tables')
+        self._parser.add_argument('--log-directory', type=str, default=DEFAULT_DIRECTORY, help='Directory of the stop logs')
+        self._parser.add_argument('--log-format', type=str, default='text', choices=LOG_FORMATS, help='Format of the stop logs')
+
+    def _add_workers_arg(self):
+        def validWorkers(v):
+            v = int(v)
+            if v >= 1:
+                self._workers = v
+                return v
+            else:
+                raise argparse.ArgumentTypeError(f'{v} is not a valid number of workers. Must be 1 or more')
+        self._parser.add_argument(
+            '--workers',
+            type=validWorkers,
+            help='Number of worker processes used to solve the permutations. '
+                 'Prints the stops when the run ends instead of every position')
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+BATCH ENIGMA
+
+Encrypts one message under many machine settings at once. Every setting is a
+row in a set of NumPy arrays (rotor types, ring offsets, rotor offsets,
+turnover flags, reflector and plugboard arrays) and each character of the
+message is pushed through all rows together with gather operations over rotor
+tables built once per machine type from EQUIPMENT_DICT. The M4 R4 rotor never
+steps so it is folded into each row's reflector and only the three stepping
+rotors are gathered for each character.
+
+settings = {
+    reflector:
+    rotor_types:
+    rotor_settings:
+    ring_settings:
+    turnover_flag:
+    plugboard_mode:
+    plugboard_connections:
+    uhr_box_setting:
+}
+
+Requires numpy.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+from enigma_core.settings.settings import EQUIPMENT_DICT, LETTERS, NUMBERS
+from enigma_core.keyboard.keyboard import Keyboard
+from enigma_core.scrambler.collection.collection import Collection
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
+from enigma_core.plugboard.stecker_plugboard import SteckerPlugboard
+from enigma_core.plugboard.uhr_box_plugboard import UhrBoxPlugboard
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchEnigma:
+    """
+    Vectorized enigma for N settings of one machine type.
+    """
+
+    _tables = {}
+
+    @classmethod
+    def rotor_tables(cls, machine: str):
+        """
+        Takes a machine type. Returns a dictionary with the rotor ids, the
+        flat LH and RH rotor tables indexed by [rotor, offset*26 + index], the
+        turnover notch table indexed by [rotor, rotor offset] and the
+        reflector ids and tables for that machine type. Tables are built once
+        per machine type.
+        """
+        try:
+            return cls._tables[machine]
+        except KeyError:
+            pass
+
+        Collection.valid_machine(machine)
+
+        rotors = EQUIPMENT_DICT[machine]["ROTORS"]
+        reflectors = EQUIPMENT_DICT[machine]["REFLECTORS"]
+
+        lh_tables = np.zeros((len(rotors), 26*26), dtype=np.uint8)
+        rh_tables = np.zeros((len(rotors), 26*26), dtype=np.uint8)
+        notches = np.zeros((len(rotors), 26), dtype=bool)
+
+        for r, rotor_dict in enumerate(rotors.values()):
+            lh_table, rh_table = WiringTables.rotor_flat_tables(rotor_dict["wiring_chars"])
+            lh_tables[r] = np.frombuffer(lh_table, dtype=np.uint8)
+            rh_tables[r] = np.frombuffer(rh_table, dtype=np.uint8)
+            for char in rotor_dict["turnover_chars"]:
+                notches[r, LETTERS.index(char)] = True
+
+        reflector_tables = np.array(
+            [[LETTERS.index(l) for l in wiring] for wiring in reflectors.values()],
+            dtype=np.uint8)
+
+        tables = {
+            "ROTOR_IDS": list(rotors.keys()),
+            "LH_TABLES": lh_tables,
+            "RH_TABLES": rh_tables,
+            "NOTCHES": notches,
+            "REFLECTOR_IDS": list(reflectors.keys()),
+            "REFLECTORS": reflector_tables
+        }
+        cls._tables[machine] = tables
+        return tables
+
+    def __init__(self, machine: str, settings: Sequence[Dict]) -> None:
+        """
+        Takes a machine type and a sequence of N settings dictionaries in the
+        same format as Enigma.settings. Each setting must include a reflector
+        and rotor types for every rotor position. Raises an ImportError if
+        numpy is not installed.
+        """
+        if np is None:
+            raise ImportError("BatchEnigma requires numpy")
+
+        self.machine = Collection.valid_machine(machine)
+        rotors_dict = Collection.device_signature(machine, ["F_ROT","R_ROT"])
+        # rotor positions ordered from the fast rotor towards the reflector.
+        self.positions = list(rotors_dict.keys())
+        self.positions.reverse()
+        # a static rotor next to the reflector is folded into the reflector.
+        self._rotor_count = len(self.positions)
+        if rotors_dict[self.positions[-1]] == "F_ROT":
+            self._rotor_count -= 1
+        self._keyboard = Keyboard()
+        self._make_arrays(settings)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of settings in the batch.
+        """
+        return len(self._rot_offsets)
+
+    def encrypt(self, message: Union[str, Sequence[int]]):
+        """
+        Takes a message string or a sequence of keyboard indexes 0-25 of
+        length M. Characters that are not on the keyboard are dropped. Returns
+        an N x M uint8 array of lamp indexes, one row per setting. Each call
+        continues from the rotor offsets left by the previous call.
+        """
+        if isinstance(message, str) and message.isascii():
+            indices = np.frombuffer(Keyboard.translate_bytes(message.encode('ascii')), dtype=np.uint8)
+        elif isinstance(message, str):
+            indices = []
+            for char in message:
+                try:
+                    indices.append(self._keyboard.character_input(char))
+                except ValueError:
+                    pass
+        else:
+            indices = message
+
+        indices = np.asarray(indices, dtype=np.intp)
+
+        tables = self.rotor_tables(self.machine)
+        lh_tables = tables["LH_TABLES"]
+        rh_tables = tables["RH_TABLES"]
+        notches = tables["NOTCHES"]
+
+        rows = np.arange(len(self))
+        types = self._rotor_types
+        rot = self._rot_offsets
+        rng = self._rng_offsets
+        turnover = self._turnover_flags
+
+        output = np.empty((len(self), len(indices)), dtype=np.uint8)
+
+        for column, index in enumerate(indices):
+            # step the rotors, see SteppingSchedule. RM on a notch steps both
+            # RS and RM (double step).
+            rm_turnover = notches[types[:, 1], rot[:, 1]] & turnover
+            rf_turnover = notches[types[:, 0], rot[:, 0]] & turnover
+            rot[:, 2] += rm_turnover
+            rot[:, 1] += rf_turnover | rm_turnover
+            rot[:, 0] += 1
+            rot %= 26
+
+            core = ((rot - rng) % 26) * 26
+
+            signal = self._lg_contact_arr[:, index]
+            for k in range(self._rotor_count):
+                signal = lh_tables[types[:, k], core[:, k] + signal]
+            signal = self._reflectors[rows, signal]
+            for k in reversed(range(self._rotor_count)):
+                signal = rh_tables[types[:, k], core[:, k] + signal]
+            output[:, column] = self._sm_contact_arr[rows, signal]
+
+        return output
+
+    @staticmethod
+    def to_strings(output) -> List[str]:
+        """
+        Takes an output array from encrypt and returns a list of strings, one
+        for each setting.
+        """
+        letters = np.frombuffer(''.join(LETTERS).encode('ascii'), dtype=np.uint8)
+        return [row.tobytes().decode('ascii') for row in letters[output]]
+
+    def _make_arrays(self, settings: Sequence[Dict]) -> None:
+        """
+        Takes the settings sequence and makes the per setting arrays.
+        """
+        tables = self.rotor_tables(self.machine)
+        rotor_ids = tables["ROTOR_IDS"]
+        reflector_ids = tables["REFLECTOR_IDS"]
+        n = len(settings)
+        p = len(self.positions)
+
+        self._rotor_types = np.zeros((n, p), dtype=np.intp)
+        self._rot_offsets = np.zeros((n, p), dtype=np.intp)
+        self._rng_offsets = np.zeros((n, p), dtype=np.intp)
+        self._turnover_flags = np.ones(n, dtype=bool)
+        self._reflectors = np.zeros((n, 26), dtype=np.uint8)
+        self._lg_contact_arr = np.tile(np.arange(26, dtype=np.uint8), (n, 1))
+        self._sm_contact_arr = np.tile(np.arange(26, dtype=np.uint8), (n, 1))
+
+        for row, setting in enumerate(settings):
+            reflector = setting["reflector"]
+            Collection.compatible_device_position(self.machine, reflector, "REF")
+            self._reflectors[row] = tables["REFLECTORS"][reflector_ids.index(reflector)]
+
+            rotor_settings = setting.get("rotor_settings") or {}
+            ring_settings = setting.get("ring_settings") or {}
+
+            for k, position in enumerate(self.positions):
+                rotor = setting["rotor_types"][position]
+                Collection.compatible_device_position(self.machine, rotor, position)
+                self._rotor_types[row, k] = rotor_ids.index(rotor)
+                self._rot_offsets[row, k] = self._offset(rotor_settings.get(position))
+                self._rng_offsets[row, k] = self._offset(ring_settings.get(position))
+
+            if self._rotor_count < p:
+                self._fold_static_rotor(row, reflector, setting["rotor_types"][self.positions[-1]])
+
+            self._turnover_flags[row] = setting.get("turnover_flag", True)
+
+            lg, sm = self._plugboard_arrays(setting)
+            self._lg_contact_arr[row] = lg
+            self._sm_contact_arr[row] = sm
+
+    def _fold_static_rotor(self, row: int, reflector: str, rotor: str) -> None:
+        """
+        Takes a settings row, its reflector id and the id of the static rotor
+        next to the reflector. Sets the row reflector to the reflector folded
+        with the static rotor at its core offset.
+        """
+        machine_dict = EQUIPMENT_DICT[self.machine]
+        lh_table, rh_table = WiringTables.rotor_flat_tables(machine_dict["ROTORS"][rotor]["wiring_chars"])
+        folded = WiringTables.folded_reflector_table(
+            WiringTables.reflector_table(machine_dict["REFLECTORS"][reflector]), lh_table, rh_table)
+        core = ((self._rot_offsets[row, -1] - self._rng_offsets[row, -1]) % 26) * 26
+        self._reflectors[row] = np.frombuffer(folded[core:core + 26], dtype=np.uint8)
+
+    @staticmethod
+    def _offset(character: Optional[str]) -> int:
+        """
+        Takes a rotor or ring setting character from either character set and
+        returns its offset. A setting of None is offset 0.
+        """
+        if character is None:
+            return 0
+        if character in LETTERS:
+            return LETTERS.index(character)
+        if character in NUMBERS:
+            return NUMBERS.index(character)
+        msg = f"{character} is not a valid ring character."
+        raise ValueError(msg)
+
+    @staticmethod
+    def _plugboard_arrays(setting: Dict):
+        """
+        Takes a settings dictionary and returns the LG and SM contact arrays
+        for its plugboard. As with Enigma.settings the plugboard connections
+        are only used if a plugboard mode is given.
+        """
+        try:
+            mode = setting["plugboard_mode"]
+        except KeyError:
+            return list(range(26)), list(range(26))
+
+        if mode == 'S': plugboard = SteckerPlugboard()
+        elif mode == 'U': plugboard = UhrBoxPlugboard()
+        else:
+            msg = f"{mode} is not a valid plugboard mode. Must be 'S' or 'U'"
+            raise ValueError(msg)
+
+        plugboard.settings = setting
+        return plugboard.lg_contact_arr, plugboard.sm_contact_arr
@@ -0,0 +1,272 @@
+"""
+COMPILED ENIGMA
+
+A compiled enigma is a snapshot of a valid Enigma machine reduced to flat
+integer tables. The rotor wirings, ring offsets, rotor offsets, turnover
+notches, reflector and plugboard arrays are copied out of the machine once so
+that characters can be encrypted without any of the per character validation
+done by the Scrambler, Collection and RotorCore objects.
+
+Bulk encryption takes the stepping sequence for the whole message from the
+scrambler stepping schedule first. The rotors other than the fast rotor only
+move every 26 key presses or so, so the composite permutation through those
+rotors and the reflector is built once for each of their states and each
+character then only needs the plugboard, the fast rotor and that composite
+permutation. The M4 R4 rotor never steps so it is folded into the reflector
+and the M4 runs the same tables as a three rotor machine.
+
+The compiled enigma owns its own rotor offsets. Encrypting with it does not
+change the state of the machine it was compiled from.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from enigma_core.settings.settings import LETTERS
+from enigma_core.keyboard.keyboard import Keyboard
+from enigma_core.scrambler.exceptions.exceptions import ScramblerNotValid
+from enigma_core.scrambler.stepping.stepping_schedule import SteppingSchedule
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
+
+
+class CompiledEnigma:
+    """
+    Flat table cipher engine produced by Enigma.compile().
+    """
+
+    def __init__(self, enigma) -> None:
+        """
+        Takes a valid Enigma machine and snapshots its current state. Raises a
+        ScramblerNotValid error if the scrambler is not valid or a ValueError
+        if the plugboard is not valid.
+        """
+        scrambler = enigma.scrambler
+
+        if not scrambler.valid_scrambler():
+            raise ScramblerNotValid("Rotor group is not valid")
+
+        if not enigma.plugboard.valid_plugboard():
+            raise ValueError("Plugboard is not valid")
+
+        rotors_dict = scrambler.collection.device_signature(scrambler.machine, ["F_ROT","R_ROT"])
+
+        # rotor positions ordered from the fast rotor towards the reflector.
+        positions = list(rotors_dict.keys())
+        positions.reverse()
+
+        self.machine_type = enigma.machine_type
+        self.positions = positions
+        self._lh_tables: List[List[int]] = []
+        self._rh_tables: List[List[int]] = []
+        self._rng_offsets: List[int] = []
+        self._rot_offsets: List[int] = []
+        self._core_offsets: List[int] = []
+
+        for position in positions:
+            rotor = scrambler.get_device(position)
+            self._lh_tables.append(list(rotor.core.lh_table))
+            self._rh_tables.append(list(rotor.core.rh_table))
+            self._rng_offsets.append(rotor._rng_offset)
+            self._rot_offsets.append(rotor._rot_offset)
+            self._core_offsets.append(rotor.core_offset() * 26)
+
+        reflector = scrambler.get_device("REF")._translation_array
+
+        if rotors_dict[positions[-1]] == "F_ROT":
+            # fold the static rotor next to the reflector into the reflector.
+            static = scrambler.get_device(positions[-1])
+            folded = WiringTables.folded_reflector_table(
+                reflector, static.core.lh_table, static.core.rh_table)
+            reflector = folded[self._core_offsets[-1]:self._core_offsets[-1] + 26]
+            self._lh_tables.pop()
+            self._rh_tables.pop()
+
+        self._rh_order = range(len(self._lh_tables) - 1, -1, -1)
+
+        self._reflector = list(reflector)
+        self._lg_contact_arr = list(enigma.plugboard.lg_contact_arr)
+        self._sm_contact_arr = list(enigma.plugboard.sm_contact_arr)
+        self._schedule = scrambler.stepping_schedule()
+        self._inner_perms: Dict[Tuple[int, ...], List[int]] = {}
+        self._key_map: Dict[str, int] = {}
+        self._make_key_map(enigma.keyboard)
+
+    def character_input(self, char: str) -> Optional[str]:
+        """
+        Takes a character and returns the encrypted letter. Returns None if
+        the character is not on the keyboard, in which case the rotors do not
+        step. Mirrors Enigma.character_input.
+        """
+        index = self._key_index(char)
+        if index is None:
+            return None
+        return LETTERS[self.integer_input(index)]
+
+    def integer_input(self, index: int) -> int:
+        """
+        Takes a keyboard index 0-25. Steps the rotors and returns the lamp
+        index. The index is not validated.
+        """
+        self._step()
+        return self._output(index)
+
+    def encrypt(self, text: str) -> str:
+        """
+        Takes a string and returns the encrypted string. Characters that are
+        not on the keyboard are dropped, exactly as if each character had been
+        passed to Enigma.character_input and the None results discarded.
+        """
+        if text.isascii():
+            indices = Keyboard.translate_bytes(text.encode('ascii'))
+            return Keyboard.lamp_bytes(self._encrypt_indices(indices)).decode('ascii')
+
+        key_index = self._key_index
+        indices = [key_index(char) for char in text]
+        indices = [index for index in indices if index is not None]
+        return ''.join([LETTERS[index] for index in self._encrypt_indices(indices)])
+
+    def encrypt_indices(self, indices: Sequence[int]) -> bytes:
+        """
+        Takes a sequence of keyboard indexes 0-25 and returns the bytes of
+        the lamp indexes. The indexes are not validated.
+        """
+        return bytes(self._encrypt_indices(indices))
+
+    @property
+    def rotor_offsets(self) -> Dict[str, int]:
+        """
+        Returns a dictionary of rotor position to current rotor offset.
+        """
+        return dict(zip(self.positions, self._rot_offsets))
+
+    def _encrypt_indices(self, indices: Sequence[int]) -> List[int]:
+        """
+        Takes a sequence of keyboard indexes and returns the list of lamp
+        indexes. The stepping sequence for the whole sequence is computed
+        first and then applied in a single pass.
+        """
+        lh_table = self._lh_tables[0]
+        rh_table = self._rh_tables[0]
+        lg_contact_arr = self._lg_contact_arr
+        sm_contact_arr = self._sm_contact_arr
+
+        outp = []
+        for index, (offset, inner) in zip(indices, self._stepping_sequence(len(indices))):
+            index = lh_table[offset + lg_contact_arr[index]]
+            outp.append(sm_contact_arr[rh_table[offset + inner[index]]])
+        return outp
+
+    def _stepping_sequence(self, count: int) -> List[Tuple[int, List[int]]]:
+        """
+        Takes a number of key presses. Steps the rotors that many times and
+        returns a list with the fast rotor table offset and the inner
+        permutation for each key press.
+        """
+        rng_offset = self._rng_offsets[0]
+        fast_offsets = [((rf - rng_offset) % 26) * 26 for rf in range(26)]
+
+        sequence = []
+        slow = self._state() // 26
+        inner = self._inner_permutation()
+        for state in self._schedule.sequence(self._state(), count):
+            if state // 26 != slow:
+                slow = state // 26
+                self._set_state(state)
+                inner = self._inner_permutation()
+            sequence.append((fast_offsets[state % 26], inner))
+        if sequence:
+            self._set_state(state)
+        return sequence
+
+    def _inner_permutation(self) -> List[int]:
+        """
+        Returns the permutation through every rotor except the fast rotor and
+        the reflector for the current rotor offsets. Permutations are cached
+        by rotor offsets.
+        """
+        key = tuple(self._core_offsets[1:])
+        try:
+            return self._inner_perms[key]
+        except KeyError:
+            pass
+
+        core = self._core_offsets
+        permutation = []
+        for index in range(26):
+            for i in range(1, len(self._lh_tables)):
+                index = self._lh_tables[i][core[i] + index]
+            index = self._reflector[index]
+            for i in self._rh_order[:-1]:
+                index = self._rh_tables[i][core[i] + index]
+            permutation.append(index)
+        self._inner_perms[key] = permutation
+        return permutation
+
+    def _key_index(self, char: str) -> Optional[int]:
+        """
+        Takes a character and returns its keyboard index or None if it is not
+        a keyboard character.
+        """
+        index = self._key_map.get(char)
+        if index is None:
+            index = self._key_map.get(char.upper())
+        return index
+
+    def _step(self) -> bool:
+        """
+        Steps the rotor offsets for one key press using the stepping schedule
+        of the scrambler. Returns True if a rotor other than the fast rotor
+        stepped.
+        """
+        state = self._state()
+        next_state = self._schedule.next_state[state]
+        self._set_state(next_state)
+        return next_state // 26 != state // 26
+
+    def _state(self) -> int:
+        """
+        Returns the RS, RM and RF rotor offsets as a stepping schedule state.
+        """
+        rot = self._rot_offsets
+        return SteppingSchedule.state(rot[2], rot[1], rot[0])
+
+    def _set_state(self, state: int) -> None:
+        """
+        Takes a stepping schedule state and sets the RS, RM and RF rotor
+        offsets.
+        """
+        rs, rm, rf = SteppingSchedule.offsets(state)
+        self._set_rotor_offset(0, rf)
+        self._set_rotor_offset(1, rm)
+        self._set_rotor_offset(2, rs)
+
+    def _set_rotor_offset(self, rotor: int, offset: int) -> None:
+        """
+        Takes a rotor index and a rotor offset. Sets the rotor offset and the
+        table row offset for the rotor core.
+        """
+        offset %= 26
+        self._rot_offsets[rotor] = offset
+        self._core_offsets[rotor] = ((offset - self._rng_offsets[rotor]) % 26) * 26
+
+    def _output(self, index: int) -> int:
+        """
+        Takes a keyboard index and returns the lamp index for the current
+        rotor offsets without stepping.
+        """
+        core = self._core_offsets
+        index = self._lg_contact_arr[index]
+        for table, offset in zip(self._lh_tables, core):
+            index = table[offset + index]
+        index = self._reflector[index]
+        for i in self._rh_order:
+            index = self._rh_tables[i][core[i] + index]
+        return self._sm_contact_arr[index]
+
+    def _make_key_map(self, keyboard) -> None:
+        """
+        Makes a map of keyboard characters, in upper and lower case, to their
+        keyboard index.
+        """
+        for char, letter in keyboard._translation_map.items():
+            index = LETTERS.index(letter)
+            self._key_map[char] = index
+            self._key_map[char.lower()] = index
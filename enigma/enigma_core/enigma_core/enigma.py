@@ -2,16 +2,23 @@
 ENIGMA DESCRIPTION
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+from collections import namedtuple
 from enigma_core.settings.settings import LETTERS
 from enigma_core.keyboard.keyboard import Keyboard
 from enigma_core.scrambler.scrambler.scrambler import Scrambler
 from enigma_core.plugboard.stecker_plugboard import SteckerPlugboard
 from enigma_core.plugboard.uhr_box_plugboard import UhrBoxPlugboard
+from enigma_core.enigma_core.compiled_enigma import CompiledEnigma
+from enigma_core.enigma_core.enigma_profiler import EnigmaProfiler
+from enigma_core.scrambler.exceptions.exceptions import (ScramblerNotValid,
+                                                         SteppingStateError)
 
 ROTORS = Dict[str, Dict[str, List[str]]]
 REFLECTORS = Dict[str, List[str]]
 
+EnigmaState = namedtuple("EnigmaState", ["machine_type", "scrambler", "plugboard"])
+
 class Enigma:
 
     def __init__(self,
@@ -26,6 +33,8 @@ class Enigma:
         self.scrambler = Scrambler(machine_type, scrambler_char_flag)
         self.plugboard = None
         self.set_plugboard_mode(plugboard_mode)
+        self._origin: Optional[Dict[str, int]] = None
+        self.profiler: Optional[EnigmaProfiler] = None
 
     def __str__(self) -> str:
         _str = f"{' '*16}{self.machine_type}\n\n"
@@ -77,6 +86,152 @@ class Enigma:
         index = self.plugboard.sm_contact_output(index)
         return index
 
+    def encrypt(self, text: str) -> str:
+        """
+        Takes a message string and returns the encrypted string. Characters
+        that are not on the keyboard are dropped. The machine is left in the
+        same state as if each character had been passed to character_input.
+        A machine with a plugboard that is not valid can not be compiled and
+        is run through character_input.
+        """
+        if not self.plugboard.valid_plugboard():
+            output = (self.character_input(c) for c in text)
+            return ''.join(c for c in output if c is not None)
+        compiled = self.compile()
+        output = compiled.encrypt(text)
+        self._set_rotor_offsets(compiled.rotor_offsets)
+        return output
+
+    def encrypt_bytes(self, buf: bytes) -> bytes:
+        """
+        Takes a bytes like object and returns the encrypted bytes. Bytes that
+        are not keyboard characters are dropped. The machine is left in the
+        same state as if each byte had been passed to character_input.
+        """
+        return Keyboard.lamp_bytes(self.encrypt_indices(Keyboard.translate_bytes(buf)))
+
+    def encrypt_indices(self, indices: Sequence[int]) -> bytes:
+        """
+        Takes a sequence of keyboard indexes 0-25, such as bytes, a bytearray,
+        an array or a list. Returns the bytes of the lamp indexes. The machine
+        is left in the same state as if each index had been passed to
+        integer_input. Raises a ValueError if an index is not in 0-25. A
+        machine with a plugboard that is not valid is run through
+        integer_input.
+        """
+        if not isinstance(indices, (bytes, bytearray)):
+            indices = bytes(iter(indices))
+        if indices and max(indices) > 25:
+            msg = f"{max(indices)} is not a valid keyboard input. Must be 0-25"
+            raise ValueError(msg)
+        if not self.plugboard.valid_plugboard():
+            return bytes(self.integer_input(index) for index in indices)
+        compiled = self.compile()
+        output = compiled.encrypt_indices(indices)
+        self._set_rotor_offsets(compiled.rotor_offsets)
+        return output
+
+    def compile(self) -> CompiledEnigma:
+        """
+        Returns a CompiledEnigma snapshot of the current machine state. The
+        compiled enigma encrypts without per character validation and gives
+        the same output as character_input. Raises ScramblerNotValid or
+        ValueError if the machine is not valid, a Uhr box plugboard is only
+        valid with no connections or all 20 connections.
+        """
+        return CompiledEnigma(self)
+
+    def enable_profiling(self) -> EnigmaProfiler:
+        """
+        Enables per stage profiling of character_input and integer_input and
+        returns the profiler. The counters carry on from any earlier
+        profiling until the profiler is reset.
+        """
+        if self.profiler is None:
+            self.profiler = EnigmaProfiler(self)
+        self.profiler.enable()
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        """
+        Disables profiling. The profiler and its counters are kept for the
+        report.
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def set_origin(self) -> None:
+        """
+        Sets the current rotor settings as the origin used by seek. The
+        origin is also set each time the machine settings are set.
+        """
+        self._origin = self._rotor_offsets()
+
+    def seek(self, n: int) -> None:
+        """
+        Takes a number of key presses and sets the rotors to where they would
+        be that many key presses after the origin. Raises a
+        SteppingStateError if no origin has been set.
+        """
+        if self._origin is None:
+            raise SteppingStateError("Machine has no origin to seek from")
+        self._set_rotor_offsets(self._origin)
+        self.scrambler.advance(n)
+
+    def advance(self, n: int) -> None:
+        """
+        Takes a number of key presses and sets the rotors to where they would
+        be after that many key presses.
+        """
+        self.scrambler.advance(n)
+
+    def rewind(self, n: int) -> None:
+        """
+        Takes a number of key presses and sets the rotors to where they were
+        that many key presses before. Raises a SteppingStateError if the
+        rotors are on a start only state, use seek to return to those.
+        """
+        self.scrambler.rewind(n)
+
+    def snapshot(self) -> EnigmaState:
+        """
+        Returns an immutable EnigmaState token with the machine type, the
+        scrambler devices, rotor and ring offsets and turnover flag and the
+        plugboard connections, contact arrays and uhr box setting.
+        """
+        return EnigmaState(self.machine_type,
+                           self.scrambler.snapshot(),
+                           self.plugboard.snapshot())
+
+    def restore(self, state: EnigmaState) -> None:
+        """
+        Takes an EnigmaState token from snapshot and sets the machine to that
+        state. Offsets and plugboard arrays are set directly without
+        validation. Devices are only changed where they differ from the
+        token. Raises a ValueError if the token is for another machine type.
+        """
+        if state.machine_type != self.machine_type:
+            msg = f"{state.machine_type} state can not be restored to a {self.machine_type} machine"
+            raise ValueError(msg)
+
+        self.scrambler.restore(state.scrambler)
+        if state.plugboard[0] != self.plugboard.plugboard_mode:
+            self.set_plugboard_mode(state.plugboard[0])
+        self.plugboard.restore(state.plugboard)
+
+    def clone(self) -> "Enigma":
+        """
+        Returns a new machine in the same state as this machine with the same
+        seek origin.
+        """
+        machine = Enigma(self.machine_type,
+                         self.scrambler.character_set_flag,
+                         self.plugboard.character_set_flag,
+                         self.plugboard.plugboard_mode)
+        machine.restore(self.snapshot())
+        machine._origin = dict(self._origin) if self._origin else None
+        return machine
+
     def valid_enigma(self) -> bool:
         """
 
@@ -90,6 +245,28 @@ class Enigma:
         self.scrambler.default_settings()
         self.plugboard.clear()
 
+    def _set_rotor_offsets(self, rotor_offsets: Dict[str, int]) -> None:
+        """
+        Takes a dictionary of rotor position to rotor offset and sets each
+        rotor to that offset.
+        """
+        for position, offset in rotor_offsets.items():
+            self.scrambler.get_device(position).rotor_offset = offset
+
+    def _rotor_offsets(self) -> Dict[str, int]:
+        """
+        Returns a dictionary of rotor position to rotor offset.
+        """
+        rotors_signature = self.scrambler.collection.device_signature(
+            self.machine_type, ["F_ROT","R_ROT"])
+        rotor_offsets = {}
+        for position in rotors_signature.keys():
+            rotor_obj = self.scrambler.get_device(position)
+            if rotor_obj is None:
+                raise ScramblerNotValid("Rotor group is not valid")
+            rotor_offsets[position] = rotor_obj.rotor_offset
+        return rotor_offsets
+
     @property
     def settings(self) -> Dict:
         """
@@ -108,6 +285,8 @@ class Enigma:
         """
         #self.scrambler.clear_scrambler()
         self.scrambler.settings = settings
+        if self.scrambler.valid_scrambler():
+            self.set_origin()
         try:
             self.set_plugboard_mode(settings['plugboard_mode'])
         except KeyError:
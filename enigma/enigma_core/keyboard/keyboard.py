@@ -1,13 +1,70 @@
+from typing import Iterable
 from enigma_core.settings.settings import LETTERS
 
+NUMBER_KEYS = {
+    '0':'P','1':'Q',
+    '2':'W','3':'E',
+    '4':'R','5':'T',
+    '6':'Z','7':'U',
+    '8':'I','9':'O'
+    }
+
+INVALID_KEY = 0xFF
+
+
+def _make_byte_table() -> bytes:
+    """
+    Returns a 256 byte table of each byte value to the keyboard index of that
+    ASCII character, letters in either case and numbers, or INVALID_KEY if it
+    is not a keyboard character.
+    """
+    table = bytearray([INVALID_KEY]*256)
+    for index, letter in enumerate(LETTERS):
+        table[ord(letter)] = index
+        table[ord(letter.lower())] = index
+    for number, letter in NUMBER_KEYS.items():
+        table[ord(number)] = LETTERS.index(letter)
+    return bytes(table)
+
+
+BYTE_TABLE = _make_byte_table()
+
+INVALID_BYTES = bytes(i for i in range(256) if BYTE_TABLE[i] == INVALID_KEY)
+
+LAMP_TABLE = bytes(ord(LETTERS[i % 26]) for i in range(256))
+
 
 class Keyboard:
 
+    BYTE_TABLE = BYTE_TABLE
+
+    INVALID_BYTES = INVALID_BYTES
+
+    LAMP_TABLE = LAMP_TABLE
+
+    @classmethod
+    def translate_bytes(cls, buf: bytes) -> bytes:
+        """
+        Takes a bytes like object of ASCII characters. Returns bytes of the
+        keyboard index of each character. Bytes that are not keyboard
+        characters are dropped.
+        """
+        return bytes(buf).translate(cls.BYTE_TABLE, cls.INVALID_BYTES)
+
+    @classmethod
+    def lamp_bytes(cls, indices: Iterable[int]) -> bytes:
+        """
+        Takes lamp indexes 0-25 and returns the bytes of their ASCII lamp
+        letters.
+        """
+        return bytes(indices).translate(cls.LAMP_TABLE)
+
     def __init__(self) -> None:
         """
 
         """
         self._translation_map = {}
+        self._index_map = {}
         self._make_translation_map()
 
     def __repr__(self) -> str:
@@ -36,8 +93,7 @@ class Keyboard:
 
         """
         try:
-            char = self._translation_map[char.upper()]
-            char = LETTERS.index(char)
+            char = self._index_map[char.upper()]
         except KeyError:
             msg = "Invalid keyboard character input!. "
             msg += f"{char} is not a valid enigma character. Must ne a-zA-Z0-9"
@@ -60,12 +116,7 @@ class Keyboard:
         """
 
         """
-        self._translation_map = {
-            '0':'P','1':'Q',
-            '2':'W','3':'E',
-            '4':'R','5':'T',
-            '6':'Z','7':'U',
-            '8':'I','9':'O'
-            }
+        self._translation_map = dict(NUMBER_KEYS)
         for l in LETTERS:
             self._translation_map[l] = l
+        self._index_map = {k: LETTERS.index(v) for k, v in self._translation_map.items()}
@@ -1,13 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
+from collections import deque
+from enigma_core.settings.settings import LETTERS, NUMBERS
 
 
-class Plugboard:
+class Plugboard(ABC):
+
+    __slots__ = ("lg_contact_arr", "sm_contact_arr", "_journal")
+
+    UNDO_LIMIT = 1000
+
+    SOCKET_INDEXES = {
+        'L': {socket_id : i for i, socket_id in enumerate(LETTERS)},
+        'N': {socket_id : i for i, socket_id in enumerate(NUMBERS)}
+    }
 
     def __init__(self) -> None:
         """
-        Initialize the connection lists.
+        Initialize the connection arrays and the undo journal.
         """
-        self.lg_contact_arr = [i for i in range(26)]
-        self.sm_contact_arr = [i for i in range(26)]
+        self.lg_contact_arr = bytearray(range(26))
+        self.sm_contact_arr = bytearray(range(26))
+        self._journal = deque(maxlen=self.UNDO_LIMIT)
 
     def __repr__(self) -> str:
         """
@@ -42,4 +56,71 @@ class Plugboard:
         except Exception as e:
             raise e
         else:
-            return index
\ No newline at end of file
+            return index
+
+    def swap(self, s1: str, s2: str) -> None:
+        """
+        Takes two socket ids and swaps what is plugged into them. Only the
+        contact array entries for the sockets involved are changed.
+        """
+        self.apply([("swap", s1, s2)])
+
+    def apply(self, operations: Sequence[Tuple]) -> None:
+        """
+        Takes a sequence of operations, each a tuple of an operation name
+        'connect', 'disconnect' or 'swap' and its arguments. Applies them in
+        order as a single change that one call to undo reverts. If any
+        operation is not valid the changes already made are reverted and the
+        error is raised.
+        """
+        changes: List[Tuple] = []
+        try:
+            for operation in operations:
+                name, *args = operation
+                if name not in ("connect", "disconnect", "swap"):
+                    msg = (f"{name} is not a valid plugboard operation. "
+                           f"Must be 'connect', 'disconnect' or 'swap'")
+                    raise ValueError(msg)
+                getattr(self, f"_{name}")(changes, *args)
+        except Exception:
+            self._revert(changes)
+            raise
+        self._journal.append(changes)
+
+    def undo(self) -> None:
+        """
+        Reverts the last connect, disconnect, swap or apply. Raises a
+        ValueError if there is nothing to undo.
+        """
+        try:
+            changes = self._journal.pop()
+        except IndexError:
+            raise ValueError("There are no plugboard changes to undo")
+        self._revert(changes)
+
+    @abstractmethod
+    def _connect(self, changes: List[Tuple], *args: str) -> None:
+        """
+        Takes the change list and the connect arguments. Makes the connection
+        and records the previous state in the change list.
+        """
+
+    @abstractmethod
+    def _disconnect(self, changes: List[Tuple], *args: str) -> None:
+        """
+        Takes the change list and the disconnect arguments. Removes the
+        connection and records the previous state in the change list.
+        """
+
+    @abstractmethod
+    def _swap(self, changes: List[Tuple], s1: str, s2: str) -> None:
+        """
+        Takes the change list and two socket ids. Swaps what is plugged into
+        them and records the previous state in the change list.
+        """
+
+    @abstractmethod
+    def _revert(self, changes: List[Tuple]) -> None:
+        """
+        Takes a list of changes and reverts them in reverse order.
+        """
@@ -6,6 +6,8 @@ from enigma_core.plugboard.exceptions import SocketIDError
 
 class SteckerPlugboard(Plugboard):
 
+    __slots__ = ("plugboard_mode", "sockets", "_charset_flag", "_charset")
+
     def __init__(self, character_set_flag: Optional[str]='L') -> None:
         """
 
@@ -63,26 +65,39 @@ class SteckerPlugboard(Plugboard):
 
     def connect(self, s1: str, s2: str) -> None:
         """
-
+        Takes two socket ids. Disconnects both sockets and connects them to
+        each other. Only the contact array entries for the sockets involved
+        are changed.
         """
-        self.valid_socket_id(s1)
-        self.valid_socket_id(s2)
-        self.disconnect(s1)
-        self.disconnect(s2)
-        self.sockets[s1] = s2
-        self.sockets[s2] = s1
-        self._make_translation_arrays()
+        self.apply([("connect", s1, s2)])
 
     def disconnect(self, s: str) -> None:
         """
         Takes a socket id. Disconnectes that socket and its connected socket.
-        After disconnect the translation arrays are regenerated.
+        Only the contact array entries for those sockets are changed.
         """
-        self.valid_socket_id(s)
-        o = self.sockets[s]
-        self.sockets[s] = s
-        self.sockets[o] = o
-        self._make_translation_arrays()
+        self.apply([("disconnect", s)])
+
+    def snapshot(self) -> Tuple:
+        """
+        Returns a tuple of the plugboard mode, character set flag, socket
+        connections, uhr box setting (None) and the LG and SM contact arrays.
+        """
+        return ("S", self._charset_flag, tuple(self.sockets.items()), None,
+                bytes(self.lg_contact_arr), bytes(self.sm_contact_arr))
+
+    def restore(self, state: Tuple) -> None:
+        """
+        Takes a tuple from snapshot and sets the plugboard to that state
+        without validation.
+        """
+        _, char_flag, sockets, _, lg_contact_arr, sm_contact_arr = state
+        self._charset_flag = char_flag
+        self._charset = LETTERS if char_flag == 'L' else NUMBERS
+        self.sockets = dict(sockets)
+        self.lg_contact_arr = bytearray(lg_contact_arr)
+        self.sm_contact_arr = bytearray(sm_contact_arr)
+        self._journal.clear()
 
     def is_connected(self, s: str) -> bool:
         """
@@ -103,9 +118,11 @@ class SteckerPlugboard(Plugboard):
 
     def clear(self) -> None:
         """
-        Clears the stecker plugboard.
+        Clears the stecker plugboard and the undo journal.
         """
         self._make_sockets()
+        self._make_translation_arrays()
+        self._journal.clear()
 
     def number_of_connections(self) -> int:
         """
@@ -259,3 +276,78 @@ class SteckerPlugboard(Plugboard):
         for index, socket_id in enumerate(self._charset):
             self.lg_contact_arr[index] = self._charset.index(self.sockets[socket_id])
             self.sm_contact_arr[index] = self._charset.index(self.sockets[socket_id])
+
+    def _connect(self, changes: List[Tuple], s1: str, s2: str) -> None:
+        """
+        Takes the changes list and two socket ids. Connects the sockets and
+        records each socket change.
+        """
+        self.valid_socket_id(s1)
+        self.valid_socket_id(s2)
+        self._unplug(changes, s1)
+        self._unplug(changes, s2)
+        self._set_partner(changes, s1, s2)
+        self._set_partner(changes, s2, s1)
+
+    def _disconnect(self, changes: List[Tuple], s: str) -> None:
+        """
+        Takes the changes list and a socket id. Disconnects the socket and
+        records each socket change.
+        """
+        self.valid_socket_id(s)
+        self._unplug(changes, s)
+
+    def _swap(self, changes: List[Tuple], s1: str, s2: str) -> None:
+        """
+        Takes the changes list and two socket ids. Connects each socket to the
+        socket the other was connected to and records each socket change.
+        """
+        self.valid_socket_id(s1)
+        self.valid_socket_id(s2)
+        p1 = self.sockets[s1]
+        p2 = self.sockets[s2]
+        if s1 == s2 or p1 == s2:
+            return
+        self._unplug(changes, s1)
+        self._unplug(changes, s2)
+        if p2 != s2:
+            self._set_partner(changes, s1, p2)
+            self._set_partner(changes, p2, s1)
+        if p1 != s1:
+            self._set_partner(changes, s2, p1)
+            self._set_partner(changes, p1, s2)
+
+    def _unplug(self, changes: List[Tuple], s: str) -> None:
+        """
+        Takes the changes list and a socket id. Disconnects the socket and the
+        socket it is connected to.
+        """
+        o = self.sockets[s]
+        if o != s:
+            self._set_partner(changes, s, s)
+            self._set_partner(changes, o, o)
+
+    def _set_partner(self, changes: List[Tuple], s: str, p: str) -> None:
+        """
+        Takes the changes list, a socket id and the socket id to connect it
+        to. Records the previous connection and patches the contact arrays.
+        """
+        changes.append((s, self.sockets[s]))
+        self._patch(s, p)
+
+    def _patch(self, s: str, p: str) -> None:
+        """
+        Takes a socket id and the socket id it is connected to. Sets the
+        socket connection and the contact array entries for that socket.
+        """
+        indexes = self.SOCKET_INDEXES[self._charset_flag]
+        self.sockets[s] = p
+        index = indexes[s]
+        self.lg_contact_arr[index] = self.sm_contact_arr[index] = indexes[p]
+
+    def _revert(self, changes: List[Tuple]) -> None:
+        """
+        Takes a list of socket changes and reverts them in reverse order.
+        """
+        for s, p in reversed(changes):
+            self._patch(s, p)
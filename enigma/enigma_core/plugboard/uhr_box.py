@@ -1,8 +1,11 @@
-from collections import deque        
+from typing import Dict, List, Tuple
+from collections import deque
 
 
 class UhrBox:
 
+    __slots__ = ("setting", "_contacts_map")
+
     POSITIONS = 40
 
     CONNECTIONS = [
@@ -48,11 +51,32 @@ class UhrBox:
         36: ('04B','LG'), 38: ('04B','SM')
     }
 
+    _rotor_tables: Dict[int, List[int]] = {}
+
+    _contacts_maps: Dict[int, Dict[Tuple[str, str], Tuple[str, str]]] = {}
+
+    @classmethod
+    def contacts_map(cls, setting: int) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """
+        Takes an uhr box rotor setting and returns the shared contact map for
+        that setting. The rotor tables and the contact maps for every setting
+        are made once for all uhr boxes.
+        """
+        if not cls._contacts_maps:
+            cls._make_rotor_tables()
+            for i in range(cls.POSITIONS):
+                contact_map = {}
+                for t1, c1 in cls.PLUG_A_MAP.items():
+                    t2 = cls._rotor_tables[i][t1]
+                    c2 = cls.PLUG_B_MAP[t2]
+                    contact_map[c1] = c2
+                    contact_map[c2] = c1
+                cls._contacts_maps[i] = contact_map
+        return cls._contacts_maps[setting]
+
     def __init__(self) -> None:
         self.setting = 0
-        self._rotor_tables = {}
         self._contacts_map = {}
-        self._make_rotor_tables()
         self._make_contacts_map()
 
     def __str__(self) -> str:
@@ -130,33 +154,27 @@ class UhrBox:
 
     def _make_contacts_map(self) -> None:
         """
-        Makes a contact map that maps contact ids of connected uhr box 
-        contacts.
+        Sets the contact map that maps contact ids of connected uhr box
+        contacts to the shared contact map for the current setting.
         """
-        contact_map = {}
-        
-        for t1, c1 in self.PLUG_A_MAP.items():
-            t2 = self._rotor_tables[self.setting][t1]
-            c2 = self.PLUG_B_MAP[t2]
-            contact_map[c1] = c2
-            contact_map[c2] = c1
-        self._contacts_map = contact_map
+        self._contacts_map = self.contacts_map(self.setting)
 
-    def _make_rotor_tables(self) -> None:
+    @classmethod
+    def _make_rotor_tables(cls) -> None:
         """
         Makes a map of each uhr box rotor position to a rotor wiring 
         translation array for that rotor position.
         """
         table = {}
 
-        connections = deque(self.CONNECTIONS)
+        connections = deque(cls.CONNECTIONS)
 
-        for i in range(self.POSITIONS):
+        for i in range(cls.POSITIONS):
             table[i] = [*connections]
             connections.rotate(-1)
             for j in range(len(connections)):
                 num = connections[j] -1
                 if num == -1:
-                    num = self.POSITIONS -1
+                    num = cls.POSITIONS -1
                 connections[j] = num
-        self._rotor_tables = table
+        cls._rotor_tables = table
@@ -1,4 +1,4 @@
-from typing import Optional, Sequence, Dict, List
+from typing import Optional, Sequence, Dict, List, Tuple
 from enigma_core.plugboard.plugboard import Plugboard
 from enigma_core.plugboard.exceptions import SocketIDError, PlugIDError
 from enigma_core.plugboard.uhr_box import UhrBox
@@ -7,6 +7,9 @@ from enigma_core.settings.settings import LETTERS, NUMBERS
 
 class UhrBoxPlugboard(Plugboard):
 
+    __slots__ = ("plugboard_mode", "ub", "_charset_flag", "_charset", "uhr_plugs_map",
+                 "_setting_tables_key", "_setting_tables")
+
     def __init__(self, character_set_flag: Optional[str]='L') -> None:
         """
         Takes an optional character set flag of 'L' or 'N'. Defaults to 'L' if
@@ -19,6 +22,8 @@ class UhrBoxPlugboard(Plugboard):
         self._charset_flag = None
         self._charset = None
         self.uhr_plugs_map = {}
+        self._setting_tables_key = None
+        self._setting_tables: List[Tuple[bytes, bytes]] = []
         self._make_uhr_plugs_map()
         self.character_set_flag = character_set_flag
 
@@ -58,33 +63,44 @@ class UhrBoxPlugboard(Plugboard):
     def rotor_setting(self, setting: int) -> None:
         """
         Takes an uhr box rotor setting and sets uhr box rotor to that 
-        settting.
+        settting. The contact arrays are looked up in the setting tables for
+        the current plug connections.
         """
         self.ub.rotor_setting = setting
-        self._make_translation_arrays()
+        lg_contact_arr, sm_contact_arr = self.setting_tables()[setting]
+        self.lg_contact_arr = bytearray(lg_contact_arr)
+        self.sm_contact_arr = bytearray(sm_contact_arr)
+
+    def setting_tables(self) -> List[Tuple[bytes, bytes]]:
+        """
+        Returns a list of the LG and SM contact arrays for each of the 40 uhr
+        box settings with the current plug connections. The tables are made
+        once for each set of plug connections.
+        """
+        key = (self._charset_flag, tuple(self.uhr_plugs_map.items()))
+        if key != self._setting_tables_key:
+            tables = []
+            for setting in range(self.ub.POSITIONS):
+                lg_contact_arr, sm_contact_arr = self._contact_arrays(UhrBox.contacts_map(setting))
+                tables.append((bytes(lg_contact_arr), bytes(sm_contact_arr)))
+            self._setting_tables = tables
+            self._setting_tables_key = key
+        return self._setting_tables
 
     def connect(self, plug_id: str, socket_id: str) -> None:
         """
         Takes an uhr box plug id and plugboard socket id. Makes a connection
-        betwen that uhr box plug and plugboard socket.
+        betwen that uhr box plug and plugboard socket. Only the contact array
+        entries for the sockets involved are changed.
         """
-        self.valid_plug_id(plug_id)
-        self.valid_socket_id(socket_id)
-        self.disconnect(socket_id)
-        self.uhr_plugs_map[plug_id] = socket_id
-        self._make_translation_arrays()
+        self.apply([("connect", plug_id, socket_id)])
 
     def disconnect(self, socket_id: str) -> None:
         """
         Takes a plugboard socket id. If an uhr box plug is connected to that
         plugboard socket the plug will be disconnected.
         """
-        self.valid_socket_id(socket_id)
-        for _, _socket_id in self.uhr_plugs_map.items():
-            if socket_id == _socket_id:
-                self.uhr_plugs_map[socket_id] = None
-                self._make_translation_arrays()
-                break
+        self.apply([("disconnect", socket_id)])
 
     def is_connected(self, socket_id: str) -> bool:
         """
@@ -122,6 +138,30 @@ class UhrBoxPlugboard(Plugboard):
                 return self.uhr_plugs_map[_plug_id]
         return socket_id
 
+    def snapshot(self) -> Tuple:
+        """
+        Returns a tuple of the plugboard mode, character set flag, uhr plug
+        connections, uhr box setting and the LG and SM contact arrays.
+        """
+        return ("U", self._charset_flag, tuple(self.uhr_plugs_map.items()),
+                self.ub.rotor_setting, bytes(self.lg_contact_arr),
+                bytes(self.sm_contact_arr))
+
+    def restore(self, state: Tuple) -> None:
+        """
+        Takes a tuple from snapshot and sets the plugboard to that state
+        without validation.
+        """
+        _, char_flag, uhr_plugs, setting, lg_contact_arr, sm_contact_arr = state
+        self._charset_flag = char_flag
+        self._charset = LETTERS if char_flag == 'L' else NUMBERS
+        self.uhr_plugs_map = dict(uhr_plugs)
+        if setting != self.ub.rotor_setting:
+            self.ub.rotor_setting = setting
+        self.lg_contact_arr = bytearray(lg_contact_arr)
+        self.sm_contact_arr = bytearray(sm_contact_arr)
+        self._journal.clear()
+
     def number_of_connected(self) -> int:
         """
         Returns the number of connected uhr box plugs.
@@ -134,10 +174,11 @@ class UhrBoxPlugboard(Plugboard):
 
     def clear(self) -> None:
         """
-        Clears all plugboard connections.
+        Clears all plugboard connections and the undo journal.
         """
         self._make_uhr_plugs_map()
         self._make_translation_arrays()
+        self._journal.clear()
 
     def make_connections(self, connections: Dict[str, str]) -> None:
         """
@@ -253,7 +294,7 @@ class UhrBoxPlugboard(Plugboard):
         except KeyError:
             pass
         else:
-            self.ub.rotor_setting = uhr_box_setting
+            self.rotor_setting = uhr_box_setting
 
         try:
             connections = settings["plugboard_connections"]
@@ -280,16 +321,104 @@ class UhrBoxPlugboard(Plugboard):
         other if there is no plug connected at that socket or through the
         uhr box if there is an uhr box plug connected at that location.
         """
-        lg_contact_arr = [i for i in range(26)]
-        sm_contact_arr = [i for i in range(26)]
+        contacts_map = UhrBox.contacts_map(self.ub.rotor_setting)
+        self.lg_contact_arr, self.sm_contact_arr = self._contact_arrays(contacts_map)
+
+    def _contact_arrays(self, contacts_map: Dict) -> Tuple[bytearray, bytearray]:
+        """
+        Takes an uhr box contact map and returns the LG and SM contact arrays
+        for the current plug connections through that contact map.
+        """
+        indexes = self.SOCKET_INDEXES[self._charset_flag]
+        lg_contact_arr = bytearray(range(26))
+        sm_contact_arr = bytearray(range(26))
 
-        for _, socket_id in self.uhr_plugs_map.items():
+        for plug_id, socket_id in self.uhr_plugs_map.items():
             if socket_id:
-                socket_id1 = self.connected_to(socket_id, 'LG')
+                index = indexes[socket_id]
+                socket_id1 = self.uhr_plugs_map[contacts_map[(plug_id, 'LG')][0]]
                 if socket_id1:
-                    lg_contact_arr[self._charset.index(socket_id)] = self._charset.index(socket_id1)
-                socket_id2 = self.connected_to(socket_id, 'SM')
+                    lg_contact_arr[index] = indexes[socket_id1]
+                socket_id2 = self.uhr_plugs_map[contacts_map[(plug_id, 'SM')][0]]
                 if socket_id2:
-                    sm_contact_arr[self._charset.index(socket_id)] = self._charset.index(socket_id2)
-        self.lg_contact_arr = lg_contact_arr
-        self.sm_contact_arr = sm_contact_arr
+                    sm_contact_arr[index] = indexes[socket_id2]
+        return lg_contact_arr, sm_contact_arr
+
+    def _connect(self, changes: List[Tuple], plug_id: str, socket_id: str) -> None:
+        """
+        Takes the changes list, an uhr box plug id and a plugboard socket id.
+        Disconnects any plug at the socket, connects the plug and records each
+        plug change.
+        """
+        self.valid_plug_id(plug_id)
+        self.valid_socket_id(socket_id)
+        holder = self.connected_plug(socket_id)
+        if holder and holder != plug_id:
+            self._set_plug(changes, holder, None)
+        self._set_plug(changes, plug_id, socket_id)
+
+    def _disconnect(self, changes: List[Tuple], socket_id: str) -> None:
+        """
+        Takes the changes list and a plugboard socket id. Disconnects any plug
+        at the socket and records the plug change.
+        """
+        self.valid_socket_id(socket_id)
+        holder = self.connected_plug(socket_id)
+        if holder:
+            self._set_plug(changes, holder, None)
+
+    def _swap(self, changes: List[Tuple], s1: str, s2: str) -> None:
+        """
+        Takes the changes list and two plugboard socket ids. Moves the plug at
+        each socket to the other socket and records each plug change.
+        """
+        h1 = self.connected_plug(s1)
+        h2 = self.connected_plug(s2)
+        if h1: self._set_plug(changes, h1, None)
+        if h2: self._set_plug(changes, h2, None)
+        if h1: self._set_plug(changes, h1, s2)
+        if h2: self._set_plug(changes, h2, s1)
+
+    def _set_plug(self, changes: List[Tuple], plug_id: str, socket_id: Optional[str]) -> None:
+        """
+        Takes the changes list, an uhr box plug id and a plugboard socket id
+        or None. Records the previous socket and connects the plug.
+        """
+        changes.append((plug_id, self.uhr_plugs_map[plug_id]))
+        self._patch(plug_id, socket_id)
+
+    def _patch(self, plug_id: str, socket_id: Optional[str]) -> None:
+        """
+        Takes an uhr box plug id and a plugboard socket id or None. Connects
+        the plug and updates the contact array entries for the previous
+        socket, the new socket and the sockets of the plugs wired to this plug
+        in the uhr box.
+        """
+        indexes = self.SOCKET_INDEXES[self._charset_flag]
+        old_socket_id = self.uhr_plugs_map[plug_id]
+        self.uhr_plugs_map[plug_id] = socket_id
+
+        if old_socket_id:
+            index = indexes[old_socket_id]
+            self.lg_contact_arr[index] = self.sm_contact_arr[index] = index
+
+        plug_ids = [plug_id]
+        for contact_type in ("LG", "SM"):
+            plug_ids.append(self.ub.connected_contact_id(plug_id, contact_type)[0])
+
+        for _plug_id in plug_ids:
+            _socket_id = self.uhr_plugs_map[_plug_id]
+            if not _socket_id:
+                continue
+            index = indexes[_socket_id]
+            for contact_type, contact_arr in (("LG", self.lg_contact_arr), ("SM", self.sm_contact_arr)):
+                _contact_plug_id = self.ub.connected_contact_id(_plug_id, contact_type)[0]
+                _contact_socket_id = self.uhr_plugs_map[_contact_plug_id]
+                contact_arr[index] = indexes[_contact_socket_id] if _contact_socket_id else index
+
+    def _revert(self, changes: List[Tuple]) -> None:
+        """
+        Takes a list of plug changes and reverts them in reverse order.
+        """
+        for plug_id, socket_id in reversed(changes):
+            self._patch(plug_id, socket_id)
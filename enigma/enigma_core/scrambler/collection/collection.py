@@ -78,6 +78,20 @@ class Collection:
                     device_list.append(rotor)
 
         return device_list
+
+    @classmethod
+    def machine_devices(cls, machine):
+        """
+        Takes a machine. Returns a dictionary object with keys of
+        'REFLECTORS', 'ROTORS_STATIC' and 'ROTORS_DYNAMIC' to values of list
+        of compatible device types for each key. Read from the equipment
+        settings without making any devices.
+        """
+        return {
+            "REFLECTORS":cls.device_list(machine, ["REF"]),
+            "ROTORS_STATIC":cls.device_list(machine, ["F_ROT"]),
+            "ROTORS_DYNAMIC":cls.device_list(machine, ["R_ROT"])
+        }
     
     @classmethod
     def valid_machine(cls, machine):
@@ -335,13 +349,7 @@ class Collection:
         and 'rotors_dynamic' to values of list of compatible device types for
         each key.
         """
-        collection = {
-            "REFLECTORS":self.device_list(self.machine, ["REF"]),
-            "ROTORS_STATIC":self.device_list(self.machine, ["F_ROT"]),
-            "ROTORS_DYNAMIC":self.device_list(self.machine, ["R_ROT"])
-        }
-
-        return collection
+        return self.machine_devices(self.machine)
 
     def _make_collection_dict(self):
         """
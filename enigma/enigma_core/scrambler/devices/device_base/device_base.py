@@ -5,6 +5,8 @@ from typing import Optional, List
 
 class DeviceBase:
 
+    __slots__ = ("_device_id", "_charset", "_charset_flag")
+
     def __init__(self, device_id, charset_flag='L') -> None:
         """
         Takes a device id and optional character set flag which defaults to 'L'.
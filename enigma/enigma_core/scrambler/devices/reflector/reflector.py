@@ -3,6 +3,7 @@ from enigma_core.settings.settings import LETTERS, NUMBERS
 from enigma_core.scrambler.devices.validators.valid_wiring import WiringCharactersDescriptor
 from enigma_core.scrambler.exceptions.exceptions import ReflectorIndexError
 from enigma_core.scrambler.devices.device_base.device_base import DeviceBase
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
 
 
 class Reflector(DeviceBase):
@@ -10,6 +11,8 @@ class Reflector(DeviceBase):
     
     """
 
+    __slots__ = ("_reflector_id", "_flag", "_translation_array", "_valid_wire_chars")
+
     _wire_chars = WiringCharactersDescriptor()
 
     def __init__(self, reflector_id: str, wiring_characters: List[str], charset_flag: Optional[str]='L') -> None:
@@ -73,8 +76,8 @@ class Reflector(DeviceBase):
 
     def _make_translation_array(self):
         """
-        Makes the translation array to convert the reflector input index to
-        an output index.
+        Gets the shared translation array to convert the reflector input index
+        to an output index from the wiring tables registry.
         """
-        self._translation_array = [LETTERS.index(l) for l in self._wire_chars]
+        self._translation_array = WiringTables.reflector_table(self._wire_chars)
 
@@ -9,6 +9,8 @@ class Rotor(RotorRing):
     
     """
 
+    __slots__ = ("core", "_valid_turn_chars")
+
     POSITIONS = 26
     _turn_chars = TurnoverListDescriptor()
 
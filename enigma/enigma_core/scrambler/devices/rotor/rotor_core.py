@@ -1,8 +1,9 @@
-from typing import Optional, Dict, List
-from collections import deque
+import operator
+from typing import Optional, Dict, List, Tuple
 from enigma_core.settings.settings import LETTERS, NUMBERS
 from enigma_core.scrambler.devices.validators.valid_wiring import WiringCharactersDescriptor
 from enigma_core.scrambler.devices.device_base.device_base import DeviceBase
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
 from enigma_core.scrambler.exceptions.exceptions import RotorInputIndexError
 
 
@@ -11,6 +12,9 @@ class RotorCore(DeviceBase):
     
     """
 
+    __slots__ = ("_rotor", "_valid_wire_chars", "_lh_translation_map", "_rh_translation_map",
+                 "_lh_table", "_rh_table")
+
     _wire_chars = WiringCharactersDescriptor(self_wired=True)
 
     def __init__(
@@ -29,8 +33,10 @@ class RotorCore(DeviceBase):
         self._charset_flag = None
         self._charset: Optional[List[str]] = None
         self.character_set_flag: List[str] = charset_flag
-        self._lh_translation_map: Dict[int, List[int]] = {}
-        self._rh_translation_map: Dict[int, List[int]] = {}
+        self._lh_translation_map: Tuple[bytes, ...] = ()
+        self._rh_translation_map: Tuple[bytes, ...] = ()
+        self._lh_table = b''
+        self._rh_table = b''
         self._make_translation_maps()
 
     def __repr__(self) -> str:
@@ -46,14 +52,14 @@ class RotorCore(DeviceBase):
                    f"TURNOVER CHARACTERS : {self._rotor.turnover_characters}\n")
 
         rot_str += "LH_TRANSLATION_TABLE\n"
-        for position, translation in self._lh_translation_map.items():
+        for position, translation in enumerate(self._lh_translation_map):
             trans_str = ""
             for i in translation:
                 trans_str += f"{LETTERS[i]} "
             rot_str += f"{str(position).rjust(2, '0')} {trans_str}\n"
 
         rot_str += "RH_TRANSLATION_TABLE\n"
-        for position, translation in self._rh_translation_map.items():
+        for position, translation in enumerate(self._rh_translation_map):
             trans_str = ""
             for i in translation:
                 trans_str += f"{LETTERS[i]} "
@@ -106,14 +112,29 @@ class RotorCore(DeviceBase):
             "TURNOVER_CHARACTERS": self._rotor.turnover_characters
             }
 
+    @property
+    def lh_table(self) -> bytes:
+        """
+        Returns the left hand translation table as a single 26*26 bytes
+        object indexed by rotor core offset*26 + input index.
+        """
+        return self._lh_table
+
+    @property
+    def rh_table(self) -> bytes:
+        """
+        Returns the right hand translation table as a single 26*26 bytes
+        object indexed by rotor core offset*26 + input index.
+        """
+        return self._rh_table
+
     def lh_output(self, index: int) -> int:
         """
         Returns an integer value for the output index for the left hand 
         output of the rotor core.
         """
         if self.valid_input_index(index):
-            offset = self._rotor.core_offset()
-            return self._lh_translation_map[offset][index]
+            return self._lh_table[self._rotor.core_offset()*26 + index]
 
     def rh_output(self, index: int) -> int:
         """
@@ -121,16 +142,33 @@ class RotorCore(DeviceBase):
         output of the rotor core.
         """
         if self.valid_input_index(index):
-            offset = self._rotor.core_offset()
-            return self._rh_translation_map[offset][index]
+            return self._rh_table[self._rotor.core_offset()*26 + index]
+
+    def lh_output_unchecked(self, index: int) -> int:
+        """
+        Takes an index 0-25 and returns the left hand output index without
+        validating the index. Used by the scrambler for valid machines.
+        """
+        return self._lh_table[self._rotor.core_offset()*26 + index]
+
+    def rh_output_unchecked(self, index: int) -> int:
+        """
+        Takes an index 0-25 and returns the right hand output index without
+        validating the index. Used by the scrambler for valid machines.
+        """
+        return self._rh_table[self._rotor.core_offset()*26 + index]
 
     def valid_input_index(self, index: int) -> bool:
         """
         Takes an index integer value and returns True if valid else raises
         a RotorInputIndexError.
         """
-        if index not in range(26):
-            msg = f"{index} is not a valid index for rotor {self.device_id}"
+        msg = f"{index} is not a valid index for rotor {self.device_id}"
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise RotorInputIndexError(msg)
+        if not 0 <= index < 26:
             raise RotorInputIndexError(msg)
         else:
             return True
@@ -145,22 +183,12 @@ class RotorCore(DeviceBase):
 
     def _make_translation_maps(self) -> None:
         """
-        Makes the translation maps for left hand and right hand output.
-        Each translation map maps rotor core position to an integer list
-        of the output indexes for that rotor core position.
-        """
-        lh_translation_map = {}
-        rh_translation_map = {}
-
-        connections = deque(self._wire_chars)
-        letters = deque(LETTERS)
-
-        for i in range(26):
-            lh_translation_arr = [letters.index(l) for l in connections]
-            rh_translation_arr = [connections.index(l) for l in letters]
-            lh_translation_map[i] = lh_translation_arr
-            rh_translation_map[i] = rh_translation_arr
-            connections.rotate(-1)
-            letters.rotate(-1)
-        self._lh_translation_map = lh_translation_map
-        self._rh_translation_map = rh_translation_map
\ No newline at end of file
+        Gets the shared translation maps for left hand and right hand output
+        from the wiring tables registry. Each translation map is indexed by
+        rotor core position and holds a bytes object of the output indexes
+        for that rotor core position. The flat tables hold the same maps in
+        a single bytes object each.
+        """
+        tables = WiringTables.rotor_tables(self._wire_chars)
+        self._lh_translation_map, self._rh_translation_map = tables
+        self._lh_table, self._rh_table = WiringTables.rotor_flat_tables(self._wire_chars)
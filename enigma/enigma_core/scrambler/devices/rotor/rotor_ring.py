@@ -6,6 +6,8 @@ from enigma_core.scrambler.exceptions.exceptions import RingCharacterError
 
 class RotorRing(DeviceBase):
 
+    __slots__ = ("_rng_offset", "_rot_offset")
+
     def __init__(self):
         pass
 
@@ -31,6 +33,21 @@ class RotorRing(DeviceBase):
         rotor_setting = self.valid_ring_character(rotor_setting)
         self._rot_offset = self._charset.index(rotor_setting)
 
+    @property
+    def rotor_offset(self) -> int:
+        """
+        Returns the current rotor offset.
+        """
+        return self._rot_offset
+
+    @rotor_offset.setter
+    def rotor_offset(self, offset: int) -> None:
+        """
+        Takes a rotor offset and sets that value within the limits of the
+        rotor positions.
+        """
+        self._rot_offset = offset % self.POSITIONS
+
     @property
     def ring_setting(self) -> str:
         """
@@ -100,10 +117,7 @@ class RotorRing(DeviceBase):
         """
         Returns the rotor core offset.
         """
-        offset = self._rot_offset - self._rng_offset
-        if offset < 0:
-            offset = offset + 26
-        return offset
+        return (self._rot_offset - self._rng_offset) % 26
     
     def current_ring_characters(self):
         """
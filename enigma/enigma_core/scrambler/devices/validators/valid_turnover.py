@@ -17,7 +17,7 @@ class TurnoverListDescriptor(object):
         """
 
         """
-        self.private_name = '_' + name
+        self.private_name = '_valid' + name
 
     def __get__(self, obj: Any, objtype: Optional[type]=None) -> List[str]:
         """
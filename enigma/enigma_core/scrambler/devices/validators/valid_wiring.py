@@ -20,12 +20,13 @@ class WiringCharactersDescriptor:
 
         """
         self.self_wired = self_wired
+        self._valid_wirings = set()
 
     def __set_name__(self, owner: str, name: str) -> None:
         """
 
         """
-        self.private_name = '_' + name
+        self.private_name = '_valid' + name
 
     def __get__(self, obj: Any, objtype: Optional[type]=None) -> List[str]:
         """
@@ -35,8 +36,12 @@ class WiringCharactersDescriptor:
 
     def __set__(self, obj: Any, val: List[str]) -> None:
         """
-
+        Takes a wiring list. Raises a WiringError if the wiring is not valid.
+        Wirings that have already been validated are not checked again.
         """
+        if type(val) == list and tuple(val) in self._valid_wirings:
+            setattr(obj, self.private_name, list(val))
+            return
 
         # check is list
         if type(val) != list:
@@ -75,4 +80,5 @@ class WiringCharactersDescriptor:
             raise WiringError(msg, 5)
 
         val = [char.upper() for char in val]
+        self._valid_wirings.add(tuple(val))
         setattr(obj, self.private_name, val)
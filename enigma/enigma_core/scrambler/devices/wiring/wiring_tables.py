@@ -0,0 +1,113 @@
+"""
+WIRING TABLES
+
+Process wide registry of the immutable translation tables for rotor and
+reflector wirings. Tables are made the first time a wiring is used and then
+shared by every device with that wiring, so making a machine does not rebuild
+any tables. The tables for every device in EQUIPMENT_DICT can be made up front
+with preload.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+from enigma_core.settings.settings import EQUIPMENT_DICT, LETTERS
+
+ROTOR_TABLES = Tuple[Tuple[bytes, ...], Tuple[bytes, ...]]
+
+FLAT_TABLES = Tuple[bytes, bytes]
+
+
+class WiringTables:
+    """
+    Shared rotor and reflector translation tables keyed by wiring.
+    """
+
+    _rotor_tables: Dict[Tuple[str, ...], ROTOR_TABLES] = {}
+    _flat_tables: Dict[Tuple[str, ...], FLAT_TABLES] = {}
+    _reflector_tables: Dict[Tuple[str, ...], bytes] = {}
+    _folded_tables: Dict[Tuple[bytes, bytes], bytes] = {}
+
+    @classmethod
+    def rotor_tables(cls, wiring_characters: Sequence[str]) -> ROTOR_TABLES:
+        """
+        Takes a list of rotor wiring characters A-Z. Returns a tuple of the
+        left hand and right hand translation tables. Each table is a tuple
+        indexed by rotor core offset of bytes objects of the output index for
+        each input index.
+        """
+        key = tuple(wiring_characters)
+        try:
+            return cls._rotor_tables[key]
+        except KeyError:
+            pass
+
+        wiring = [LETTERS.index(l) for l in key]
+        inverse = [wiring.index(i) for i in range(26)]
+        lh_table = []
+        rh_table = []
+        for offset in range(26):
+            lh_table.append(bytes([(wiring[(i + offset) % 26] - offset) % 26 for i in range(26)]))
+            rh_table.append(bytes([(inverse[(i + offset) % 26] - offset) % 26 for i in range(26)]))
+        tables = (tuple(lh_table), tuple(rh_table))
+        cls._rotor_tables[key] = tables
+        return tables
+
+    @classmethod
+    def rotor_flat_tables(cls, wiring_characters: Sequence[str]) -> FLAT_TABLES:
+        """
+        Takes a list of rotor wiring characters A-Z. Returns a tuple of the
+        left hand and right hand translation tables as single 26*26 bytes
+        objects indexed by rotor core offset*26 + input index.
+        """
+        key = tuple(wiring_characters)
+        try:
+            return cls._flat_tables[key]
+        except KeyError:
+            lh_table, rh_table = cls.rotor_tables(key)
+            tables = (b''.join(lh_table), b''.join(rh_table))
+            cls._flat_tables[key] = tables
+            return tables
+
+    @classmethod
+    def reflector_table(cls, wiring_characters: Sequence[str]) -> bytes:
+        """
+        Takes a list of reflector wiring characters A-Z. Returns a bytes
+        object of the output index for each input index.
+        """
+        key = tuple(wiring_characters)
+        try:
+            return cls._reflector_tables[key]
+        except KeyError:
+            table = bytes([LETTERS.index(l) for l in key])
+            cls._reflector_tables[key] = table
+            return table
+
+    @classmethod
+    def folded_reflector_table(cls, reflector: bytes, lh_table: bytes, rh_table: bytes) -> bytes:
+        """
+        Takes a reflector translation table and the flat left hand and right
+        hand tables of a rotor that never steps, such as the M4 R4 rotor.
+        Returns the reflector and the rotor folded into one reflector for
+        each rotor core offset as a single 26*26 bytes object indexed by
+        rotor core offset*26 + input index.
+        """
+        key = (reflector, lh_table)
+        try:
+            return cls._folded_tables[key]
+        except KeyError:
+            pass
+
+        table = bytes(rh_table[offset + reflector[lh_table[offset + index]]]
+                      for offset in range(0, 26*26, 26) for index in range(26))
+        cls._folded_tables[key] = table
+        return table
+
+    @classmethod
+    def preload(cls) -> None:
+        """
+        Makes the tables for every rotor and reflector in EQUIPMENT_DICT.
+        """
+        for machine_dict in EQUIPMENT_DICT.values():
+            for rotor_dict in machine_dict["ROTORS"].values():
+                cls.rotor_tables(rotor_dict["wiring_chars"])
+            for wiring in machine_dict["REFLECTORS"].values():
+                cls.reflector_table(wiring)
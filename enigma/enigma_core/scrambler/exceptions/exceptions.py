@@ -91,4 +91,18 @@ class ScramblerNotValid(Exception):
         """
         
         """
-        super().__init__(msg)
\ No newline at end of file
+        super().__init__(msg)
+
+class SteppingStateError(Exception):
+    def __init__(self, msg):
+        """
+        
+        """
+        super().__init__(msg)
+
+class PermutationTableError(Exception):
+    def __init__(self, msg):
+        """
+        
+        """
+        super().__init__(msg)
@@ -0,0 +1,257 @@
+"""
+PERMUTATION TABLES
+
+For a fixed reflector and rotor order the scrambler is one of 26*26*26
+permutations, one for each RS, RM and RF rotor core offset. The core offset
+of a rotor is its rotor offset minus its ring offset, so one table covers
+every ring setting.
+
+A permutation table file holds all 17576 permutations of 26 bytes each
+(456976 bytes) after a 64 byte header. The permutation for core offsets
+(rs, rm, rf) starts at
+
+    HEADER_SIZE + (rs*676 + rm*26 + rf) * 26
+
+The header is the magic bytes, the format version, the length of the key and
+the key, the reflector, rotor ids and for the M4 the R4 rotor and its core
+offset. The M4 R4 rotor never steps so it is folded into the reflector and
+each R4 core offset has its own table.
+
+Files are named REF_RS_RM_RF.perm, or REF_R4.X_RS_RM_RF.perm for the M4 where
+X is the R4 core offset letter. Tables are generated from EQUIPMENT_DICT with
+generate_table or generate_tables and are opened with PermutationTable,
+which maps the file with mmap and returns permutations without computing
+anything.
+"""
+
+import mmap
+import os
+from itertools import permutations
+from typing import Iterable, List, Optional, Tuple
+from enigma_core.settings.settings import EQUIPMENT_DICT, LETTERS
+from enigma_core.scrambler.collection.collection import Collection
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
+from enigma_core.scrambler.exceptions.exceptions import (PermutationTableError,
+                                                         ScramblerNotValid)
+
+MAGIC = b"ENIGPERM"
+VERSION = 1
+HEADER_SIZE = 64
+STATES = 26*26*26
+TABLE_SIZE = STATES * 26
+
+R4 = Optional[Tuple[str, int]]
+
+
+def table_key(reflector: str, rotors: Iterable[str], r4: R4=None) -> str:
+    """
+    Takes a reflector id, the RS, RM and RF rotor ids and for the M4 a tuple
+    of the R4 rotor id and core offset. Returns the table key.
+    """
+    key = [reflector]
+    if r4:
+        key.append(f"{r4[0]}.{LETTERS[r4[1]]}")
+    key.extend(rotors)
+    return ' '.join(key)
+
+
+def table_name(reflector: str, rotors: Iterable[str], r4: R4=None) -> str:
+    """
+    Takes a reflector id, the RS, RM and RF rotor ids and for the M4 a tuple
+    of the R4 rotor id and core offset. Returns the table file name.
+    """
+    return table_key(reflector, rotors, r4).replace(' ', '_') + ".perm"
+
+
+def make_table(machine: str, reflector: str, rotors: Tuple[str, ...], r4: R4=None) -> bytes:
+    """
+    Takes a machine type, a reflector id, the RS, RM and RF rotor ids and for
+    the M4 a tuple of the R4 rotor id and core offset. Returns the 17576
+    permutations of the table.
+    """
+    machine_dict = EQUIPMENT_DICT[machine]
+    for device in (reflector, *rotors):
+        Collection.compatible_device_type(machine, device, ["REF","R_ROT"])
+
+    def pad(row: bytes) -> bytes:
+        # bytes.translate needs a 256 byte table.
+        return row + bytes(256 - len(row))
+
+    def rows(rotor_id: str) -> Tuple[List[bytes], List[bytes]]:
+        wiring = machine_dict["ROTORS"][rotor_id]["wiring_chars"]
+        lh_table, rh_table = WiringTables.rotor_tables(wiring)
+        return [pad(row) for row in lh_table], [pad(row) for row in rh_table]
+
+    reflector_row = WiringTables.reflector_table(machine_dict["REFLECTORS"][reflector])
+
+    if r4:
+        r4_id, r4_offset = r4
+        Collection.compatible_device_type(machine, r4_id, ["F_ROT"])
+        lh_table, rh_table = WiringTables.rotor_flat_tables(machine_dict["ROTORS"][r4_id]["wiring_chars"])
+        folded = WiringTables.folded_reflector_table(reflector_row, lh_table, rh_table)
+        reflector_row = folded[r4_offset*26:r4_offset*26 + 26]
+
+    reflector_row = pad(reflector_row)
+
+    rs_lh, rs_rh = rows(rotors[0])
+    rm_lh, rm_rh = rows(rotors[1])
+    rf_lh, rf_rh = rows(rotors[2])
+    rf_lh = [row[:26] for row in rf_lh]
+
+    table = bytearray(TABLE_SIZE)
+    position = 0
+    for rs in range(26):
+        # RS and the reflector for this RS core offset.
+        outer = pad(rs_lh[rs][:26].translate(reflector_row).translate(rs_rh[rs]))
+        for rm in range(26):
+            inner = pad(rm_lh[rm][:26].translate(outer).translate(rm_rh[rm]))
+            for rf in range(26):
+                table[position:position + 26] = rf_lh[rf].translate(inner).translate(rf_rh[rf])
+                position += 26
+    return bytes(table)
+
+
+def generate_table(
+        machine: str,
+        reflector: str,
+        rotors: Iterable[str],
+        directory: str,
+        r4: R4=None
+    ) -> str:
+    """
+    Takes a machine type, a reflector id, the RS, RM and RF rotor ids, a
+    directory and for the M4 a tuple of the R4 rotor id and core offset.
+    Writes the table file to the directory and returns its path.
+    """
+    rotors = tuple(rotors)
+    key = table_key(reflector, rotors, r4).encode('ascii')
+    header = MAGIC + bytes([VERSION, len(key)]) + key
+    header += bytes(HEADER_SIZE - len(header))
+
+    path = os.path.join(directory, table_name(reflector, rotors, r4))
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(make_table(machine, reflector, rotors, r4))
+    return path
+
+
+def generate_tables(
+        machine: str,
+        directory: str,
+        reflectors: Optional[Iterable[str]]=None,
+        r4: R4=None
+    ) -> List[str]:
+    """
+    Takes a machine type, a directory, optionally a list of reflector ids and
+    for the M4 a tuple of the R4 rotor id and core offset. Writes a table for
+    every rotor order of the machine rotors with each reflector and returns
+    the list of paths. Raises a PermutationTableError for an M4 without r4.
+    """
+    machine_dict = Collection.machine_devices(machine)
+    if machine_dict["ROTORS_STATIC"] and not r4:
+        raise PermutationTableError(f"{machine} tables need an R4 rotor and core offset")
+
+    reflectors = reflectors or machine_dict["REFLECTORS"]
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for reflector in reflectors:
+        for rotors in permutations(machine_dict["ROTORS_DYNAMIC"], 3):
+            paths.append(generate_table(machine, reflector, rotors, directory, r4))
+    return paths
+
+
+def scrambler_table(scrambler) -> Tuple[str, Tuple[str, ...], R4]:
+    """
+    Takes a valid scrambler. Returns the reflector id, RS, RM and RF rotor ids
+    and for the M4 the R4 rotor id and core offset of its table. Raises
+    ScramblerNotValid if the scrambler is not valid.
+    """
+    if not scrambler.valid_scrambler():
+        raise ScramblerNotValid("Rotor group is not valid")
+
+    reflector = scrambler.get_device_id("REF")
+    rotors = tuple(scrambler.get_device_id(position) for position in ("RS", "RM", "RF"))
+    r4 = None
+    if "R4" in scrambler.rotor_types:
+        r4 = (scrambler.get_device_id("R4"), scrambler.get_device("R4").core_offset())
+    return reflector, rotors, r4
+
+
+class PermutationTable:
+    """
+    Memory mapped permutation table file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Takes the path of a table file and maps it. Raises a
+        PermutationTableError if the file is not a valid table.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise PermutationTableError(f"{path} is an empty file")
+
+        header = self._mmap[:HEADER_SIZE]
+        if (header[:len(MAGIC)] != MAGIC
+                or header[len(MAGIC)] != VERSION
+                or len(self._mmap) != HEADER_SIZE + TABLE_SIZE):
+            self._mmap.close()
+            raise PermutationTableError(f"{path} is not a version {VERSION} permutation table")
+
+        key_length = header[len(MAGIC) + 1]
+        self.key = header[len(MAGIC) + 2:len(MAGIC) + 2 + key_length].decode('ascii')
+        self._view = memoryview(self._mmap)[HEADER_SIZE:]
+
+    @classmethod
+    def load(cls, directory: str, scrambler) -> "PermutationTable":
+        """
+        Takes a table directory and a valid scrambler. Returns the table for
+        the scrambler devices.
+        """
+        return cls(os.path.join(directory, table_name(*scrambler_table(scrambler))))
+
+    def __enter__(self) -> "PermutationTable":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases the table view and unmaps the file.
+        """
+        self._view.release()
+        self._mmap.close()
+
+    def permutation(self, rs: int, rm: int, rf: int) -> bytes:
+        """
+        Takes the RS, RM and RF rotor core offsets and returns the bytes of
+        the output index for each input index.
+        """
+        start = (rs*676 + rm*26 + rf) * 26
+        return self._mmap[HEADER_SIZE + start:HEADER_SIZE + start + 26]
+
+    def row(self, state: int) -> memoryview:
+        """
+        Takes a core offset state rs*676 + rm*26 + rf and returns a memoryview
+        of its permutation without copying.
+        """
+        return self._view[state*26:state*26 + 26]
+
+    def scrambler_permutation(self, scrambler) -> bytes:
+        """
+        Takes a scrambler with the devices of this table. Returns the
+        permutation for its current rotor core offsets.
+        """
+        return self.permutation(*(scrambler.get_device(position).core_offset()
+                                  for position in ("RS", "RM", "RF")))
+
+    @property
+    def table(self) -> memoryview:
+        """
+        Returns a memoryview of all 17576 permutations.
+        """
+        return self._view
@@ -1,11 +1,15 @@
+import operator
 from typing import Optional, Any, Union, Dict, List, Tuple
 from collections import OrderedDict
 from enigma_core.scrambler.scrambler.cell import Cell
 from enigma_core.scrambler.collection.collection import Collection
+from enigma_core.scrambler.stepping.stepping_schedule import SteppingSchedule
+from enigma_core.scrambler.devices.wiring.wiring_tables import WiringTables
 from enigma_core.settings.settings import EQUIPMENT_DICT, LETTERS, NUMBERS
 from enigma_core.scrambler.exceptions.exceptions import (ScramblerNotValid,
                                                          DeviceBorrowedError,
-                                                         CellDeviceError)
+                                                         CellDeviceError,
+                                                         RotorInputIndexError)
 
 
 class Scrambler:
@@ -19,6 +23,11 @@ class Scrambler:
         self._cells = OrderedDict()
         self._make_cells(machine)
         self._turnover_flag = True
+        self._schedule_key: Optional[Tuple] = None
+        self._schedule: Optional[SteppingSchedule] = None
+        self._permutation_cache_size = 0
+        self._permutation_cache: OrderedDict = OrderedDict()
+        self._signal_path: Optional[Tuple] = None
 
     def __str__(self) -> str:
         """
@@ -100,6 +109,8 @@ class Scrambler:
             raise e
         else:
             self._cells[position].set_device(device_obj)
+            self._permutation_cache.clear()
+            self._signal_path = None
 
     def get_device(self, position: str):
         """
@@ -126,6 +137,8 @@ class Scrambler:
             pass
         else:
             self.collection.return_device(device_obj)
+            self._permutation_cache.clear()
+            self._signal_path = None
 
     def get_device_id(self, position: str) -> Union[None, str]:
         """
@@ -236,6 +249,63 @@ class Scrambler:
         else:
             self.turnover_flag = turnover_flag
 
+    def snapshot(self) -> Tuple:
+        """
+        Returns a tuple of the character set flag, the device id at each
+        position, the rotor and ring offsets at each position (None for the
+        reflector) and the turnover flag.
+        """
+        devices = []
+        rotor_offsets = []
+        ring_offsets = []
+        for position, cell in self._cells.items():
+            try:
+                device_obj = cell.get_device()
+            except CellDeviceError:
+                device_obj = None
+            devices.append((position, device_obj.device_id if device_obj else None))
+            if device_obj and cell.flag != "REF":
+                rotor_offsets.append(device_obj._rot_offset)
+                ring_offsets.append(device_obj._rng_offset)
+            else:
+                rotor_offsets.append(None)
+                ring_offsets.append(None)
+        return (self.collection.character_set_flag, tuple(devices),
+                tuple(rotor_offsets), tuple(ring_offsets), self._turnover_flag)
+
+    def restore(self, state: Tuple) -> None:
+        """
+        Takes a tuple from snapshot and sets the scrambler to that state. The
+        rotor and ring offsets are set directly. Devices are only borrowed and
+        returned for positions where the device id differs.
+        """
+        char_flag, devices, rotor_offsets, ring_offsets, turnover_flag = state
+
+        if char_flag != self.collection.character_set_flag:
+            self.character_set_flag = char_flag
+
+        changed = []
+        for position, device_id in devices:
+            try:
+                current_id = self._cells[position].get_device().device_id
+            except CellDeviceError:
+                current_id = None
+            if current_id != device_id:
+                changed.append((position, device_id))
+        for position, _ in changed:
+            self.remove_device(position)
+        for position, device_id in changed:
+            if device_id:
+                self.set_device(position, device_id)
+
+        for (position, _), rot_offset, rng_offset in zip(devices, rotor_offsets, ring_offsets):
+            if rot_offset is not None:
+                device_obj = self._cells[position].get_device()
+                device_obj._rot_offset = rot_offset
+                device_obj._rng_offset = rng_offset
+
+        self._turnover_flag = turnover_flag
+
     def keyed_input(self, index: int) -> int:
         """
         
@@ -245,42 +315,218 @@ class Scrambler:
 
     def output(self, index: int) -> int:
         """
-        
+        Takes an input index and returns the output index for the current
+        rotor offsets without stepping. The permutation cache is used if it
+        is enabled.
         """
-        rotors_dict = self.collection.device_signature(self.machine, ["F_ROT","R_ROT"])
+        if self._permutation_cache_size:
+            return self.permutation()[index]
+        return self._signal_output(index)
 
-        positions = list(rotors_dict.keys())
+    def permutation(self) -> Tuple[int, ...]:
+        """
+        Returns the tuple of output indexes for each input index 0-25 through
+        the rotors and reflector for the current rotor offsets. If the
+        permutation cache is enabled the permutation is cached by the rotor
+        core offsets and the least recently used permutation is dropped when
+        the cache is full. Cached permutations are returned to every caller,
+        so they are tuples which can not be changed.
+        """
+        if not self.valid_scrambler():
+            raise ScramblerNotValid("Rotor group is not valid")
 
-        positions.reverse()
+        if not self._permutation_cache_size:
+            return self._signal_permutation()
 
+        key = tuple(cell.get_device().core_offset()
+                    for cell in self._cells.values() if cell.flag != "REF")
+        cache = self._permutation_cache
         try:
-            for position in positions:
-                rotor_obj = self.get_device(position)
-                index = rotor_obj.core.lh_output(index)
-            reflector_obj = self.get_device("REF")
-            index = reflector_obj.output(index)
-            positions.reverse()
-            for position in positions:
-                rotor_obj = self.get_device(position)
-                index = rotor_obj.core.rh_output(index)
-            return index
-        except CellDeviceError as e:
-            raise e
+            permutation = cache[key]
+        except KeyError:
+            permutation = self._signal_permutation()
+            cache[key] = permutation
+            if len(cache) > self._permutation_cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return permutation
 
-    def rotor_turnover(self) -> None:
+    @property
+    def permutation_cache_size(self) -> int:
         """
-        
+        Returns the maximum number of cached permutations. 0 when the cache is
+        disabled.
+        """
+        return self._permutation_cache_size
+
+    @permutation_cache_size.setter
+    def permutation_cache_size(self, size: int) -> None:
         """
-        if self.valid_scrambler():
-            if self._turnover_flag:
-                if self._cells["RM"].get_device().on_turnover():
-                    self._cells["RS"].get_device().inc_rotor_setting()
-                if self._cells["RF"].get_device().on_turnover():
-                    self._cells["RM"].get_device().inc_rotor_setting()
-            self._cells["RF"].get_device().inc_rotor_setting()
+        Takes the maximum number of permutations to cache. 0 disables the
+        cache. Any cached permutations are dropped.
+        """
+        if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+            msg = f"{size} is not a valid cache size. Must be an int of 0 or more"
+            raise ValueError(msg)
+        self._permutation_cache_size = size
+        self._permutation_cache.clear()
+
+    def _signal_output(self, index: int) -> int:
+        """
+        Takes an input index and returns the output index through each rotor
+        core, the reflector and back through each rotor core. The index is
+        validated once and the unchecked rotor core outputs are used.
+        """
+        msg = f"{index} is not a valid scrambler input index"
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise RotorInputIndexError(msg)
+        if not 0 <= index < 26:
+            raise RotorInputIndexError(msg)
+
+        path = self._signal_path
+        if path is None:
+            path = self._make_signal_path()
+
+        lh_outputs, reflector, static_offset, rh_outputs, _ = path
+        for lh_output in lh_outputs:
+            index = lh_output(index)
+        if static_offset is None:
+            index = reflector[index]
         else:
+            index = reflector[static_offset()*26 + index]
+        for rh_output in rh_outputs:
+            index = rh_output(index)
+        return index
+
+    def _signal_permutation(self) -> Tuple[int, ...]:
+        """
+        Returns the tuple of output indexes for each input index 0-25 for the
+        current rotor offsets. Each rotor core offset is read once and all 26
+        indexes are passed through each table together.
+        """
+        path = self._signal_path
+        if path is None:
+            path = self._make_signal_path()
+
+        _, reflector, static_offset, _, cores = path
+        cores = [(lh_table, rh_table, core_offset()*26)
+                 for lh_table, rh_table, core_offset in cores]
+        permutation = range(26)
+        for lh_table, _, offset in reversed(cores):
+            permutation = [lh_table[offset + i] for i in permutation]
+        offset = 0 if static_offset is None else static_offset()*26
+        permutation = [reflector[offset + i] for i in permutation]
+        for _, rh_table, offset in cores:
+            permutation = [rh_table[offset + i] for i in permutation]
+        return tuple(permutation)
+
+    def _make_signal_path(self) -> Tuple:
+        """
+        Makes the signal path of the unchecked rotor core outputs from the
+        fast rotor to the reflector, the reflector translation array and
+        the rotor core outputs back from the reflector, with the rotor core
+        tables and core offset methods from the slow rotor to the fast rotor
+        for whole permutations. A static rotor next to the reflector, the M4
+        R4 rotor, is folded into the reflector with the core offset method
+        of the rotor to select the folded reflector. The path is kept until
+        a device is set or removed. Raises ScramblerNotValid if the
+        scrambler is not valid.
+        """
+        if not self.valid_scrambler():
+            raise ScramblerNotValid("Rotor group is not valid")
+
+        rotors_dict = self.collection.device_signature(self.machine, ["F_ROT","R_ROT"])
+        rotors = [self._cells[position].get_device() for position in rotors_dict.keys()]
+        reflector = self._cells["REF"].get_device()._translation_array
+        static_offset = None
+
+        if rotors and self._cells[next(iter(rotors_dict))].flag == "F_ROT":
+            static = rotors.pop(0)
+            reflector = WiringTables.folded_reflector_table(
+                reflector, static.core.lh_table, static.core.rh_table)
+            static_offset = static.core_offset
+
+        self._signal_path = (
+            tuple(rotor.core.lh_output_unchecked for rotor in reversed(rotors)),
+            reflector,
+            static_offset,
+            tuple(rotor.core.rh_output_unchecked for rotor in rotors),
+            tuple((rotor.core.lh_table, rotor.core.rh_table, rotor.core_offset) for rotor in rotors)
+        )
+        return self._signal_path
+
+    def rotor_turnover(self) -> None:
+        """
+        Steps the rotors for one key press. The next rotor offsets, including
+        the double step of the middle rotor, are looked up in the stepping
+        schedule for the current rotors. Raises ScramblerNotValid if the
+        rotor group is not valid.
+        """
+        # stepping_schedule checks the scrambler, checking every cell again
+        # here costs the M4 one more cell than the three rotor machines.
+        schedule = self.stepping_schedule()
+        self.stepping_state = schedule.next_state[self.stepping_state]
+
+    def advance(self, n: int) -> None:
+        """
+        Takes a number of key presses and sets the rotors to where they would
+        be after that many key presses without stepping through them.
+        """
+        schedule = self.stepping_schedule()
+        self.stepping_state = schedule.state_after(self.stepping_state, n)
+
+    def rewind(self, n: int) -> None:
+        """
+        Takes a number of key presses and sets the rotors to where they were
+        that many key presses before. Raises a SteppingStateError if the
+        rotors are on a start only state such as RM resting on its turnover
+        notch.
+        """
+        schedule = self.stepping_schedule()
+        self.stepping_state = schedule.state_before(self.stepping_state, n)
+
+    def stepping_schedule(self) -> SteppingSchedule:
+        """
+        Returns the stepping schedule for the turnover notches of the current
+        RM and RF rotors and the turnover flag. Raises ScramblerNotValid if
+        the rotor group is not valid.
+        """
+        if not self.valid_scrambler():
             raise ScramblerNotValid("Rotor group is not valid")
 
+        rm_obj = self._cells["RM"].get_device()
+        rf_obj = self._cells["RF"].get_device()
+        key = (rm_obj, rf_obj, self._turnover_flag)
+        if key != self._schedule_key:
+            self._schedule = SteppingSchedule.schedule(
+                rm_obj._turn_chars, rf_obj._turn_chars, self._turnover_flag)
+            self._schedule_key = key
+        return self._schedule
+
+    @property
+    def stepping_state(self) -> int:
+        """
+        Returns the RS, RM and RF rotor offsets as a stepping schedule state.
+        """
+        return SteppingSchedule.state(
+            self._cells["RS"].get_device().rotor_offset,
+            self._cells["RM"].get_device().rotor_offset,
+            self._cells["RF"].get_device().rotor_offset)
+
+    @stepping_state.setter
+    def stepping_state(self, state: int) -> None:
+        """
+        Takes a stepping schedule state and sets the RS, RM and RF rotor
+        offsets.
+        """
+        rs, rm, rf = SteppingSchedule.offsets(state)
+        self._cells["RS"].get_device().rotor_offset = rs
+        self._cells["RM"].get_device().rotor_offset = rm
+        self._cells["RF"].get_device().rotor_offset = rf
+
     @property
     def turnover_flag(self) -> bool:
         """
@@ -0,0 +1,270 @@
+"""
+STEPPING SCHEDULE
+
+The rotor stepping of a three rotor enigma group is fully determined by the
+turnover notches of the middle and fast rotors and the turnover flag. The
+slow rotor notches are never used and the M4 R4 rotor never steps.
+
+A stepping schedule maps every (RS, RM, RF) rotor offset state to the state
+after the next key press. With the turnover flag set the rotors step as the
+real machine does:
+
+    RF steps on every key press.
+    RM steps when RF is on a turnover notch.
+    RM and RS both step when RM is on a turnover notch (double step).
+
+Following the next state map from any state leads onto a cycle, the period of
+the machine. For single notch rotors the period is 26*25*26 = 16900 states.
+Some states, such as RM resting on its notch while RF is not just past its
+notch, can only be the start state of a message and lead onto the cycle
+within two key presses. Once the cycles are known the state n key presses
+from any state is found in constant time. Going back n key presses follows the
+cycle, so the start only states can not be reached by going back.
+
+States are integers RS*676 + RM*26 + RF of rotor offsets, not core offsets.
+The core offset of a rotor is its rotor offset minus its ring offset.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+from enigma_core.scrambler.exceptions.exceptions import SteppingStateError
+
+STATES = 26*26*26
+
+
+class SteppingSchedule:
+    """
+    Next state map and cycle table for one set of turnover notches.
+    """
+
+    _schedules: Dict[Tuple, "SteppingSchedule"] = {}
+
+    @classmethod
+    def schedule(cls,
+            rm_notches: Iterable[int],
+            rf_notches: Iterable[int],
+            turnover_flag: bool=True
+        ) -> "SteppingSchedule":
+        """
+        Takes the middle rotor and fast rotor turnover offsets and the
+        turnover flag. Returns the shared stepping schedule for them, making
+        it the first time it is asked for.
+        """
+        key = (tuple(sorted(rm_notches)), tuple(sorted(rf_notches)), turnover_flag)
+        try:
+            return cls._schedules[key]
+        except KeyError:
+            schedule = cls(*key)
+            cls._schedules[key] = schedule
+            return schedule
+
+    @staticmethod
+    def state(rs: int, rm: int, rf: int) -> int:
+        """
+        Takes the RS, RM and RF rotor offsets and returns the state integer.
+        """
+        return rs*676 + rm*26 + rf
+
+    @staticmethod
+    def offsets(state: int) -> Tuple[int, int, int]:
+        """
+        Takes a state integer and returns the RS, RM and RF rotor offsets.
+        """
+        return state // 676, (state // 26) % 26, state % 26
+
+    def __init__(self,
+            rm_notches: Iterable[int],
+            rf_notches: Iterable[int],
+            turnover_flag: bool=True
+        ) -> None:
+        """
+        Takes the middle rotor and fast rotor turnover offsets and the
+        turnover flag. Makes the next state map. The cycle table is made the
+        first time it is needed.
+        """
+        self.rm_notches = tuple(rm_notches)
+        self.rf_notches = tuple(rf_notches)
+        self.turnover_flag = turnover_flag
+        self.next_state: List[int] = []
+        self._cycles: List[List[int]] = []
+        self._cycle_id: List[int] = []
+        self._cycle_index: List[int] = []
+        self._tail_length: List[int] = []
+        self._tail_entry: List[int] = []
+        self._make_next_state()
+
+    def step(self, state: int) -> int:
+        """
+        Takes a state and returns the state after one key press.
+        """
+        return self.next_state[state]
+
+    def state_after(self, state: int, n: int) -> int:
+        """
+        Takes a state and a number of key presses and returns the state after
+        that many key presses.
+        """
+        if n < 0:
+            raise ValueError(f"{n} is not a valid number of key presses.")
+
+        self._make_cycles()
+
+        tail_length = self._tail_length[state]
+        if n < tail_length:
+            for _ in range(n):
+                state = self.next_state[state]
+            return state
+
+        entry = self._tail_entry[state]
+        cycle = self._cycles[self._cycle_id[entry]]
+        return cycle[(self._cycle_index[entry] + n - tail_length) % len(cycle)]
+
+    def state_before(self, state: int, n: int) -> int:
+        """
+        Takes a state on the period cycle and a number of key presses and
+        returns the cycle state that many key presses before it. Raises a
+        SteppingStateError if the state is not on the cycle.
+        """
+        if n < 0:
+            raise ValueError(f"{n} is not a valid number of key presses.")
+
+        if n == 0:
+            return state
+
+        self._make_cycles()
+
+        if self._tail_length[state]:
+            msg = f"{state} is a start state with no state before it."
+            raise SteppingStateError(msg)
+
+        cycle = self._cycles[self._cycle_id[state]]
+        return cycle[(self._cycle_index[state] - n) % len(cycle)]
+
+    def sequence(self, state: int, count: int) -> List[int]:
+        """
+        Takes a state and a number of key presses. Returns the list of states
+        after each key press.
+        """
+        sequence = []
+
+        if not self._cycles and count < STATES:
+            # shorter than a period, following the next state map is quicker
+            # than making the cycle table.
+            next_state = self.next_state
+            for _ in range(count):
+                state = next_state[state]
+                sequence.append(state)
+            return sequence
+
+        self._make_cycles()
+
+        while count and self._tail_length[state]:
+            state = self.next_state[state]
+            sequence.append(state)
+            count -= 1
+
+        if count:
+            cycle = self._cycles[self._cycle_id[state]]
+            start = self._cycle_index[state] + 1
+            while count:
+                part = cycle[start:start + count]
+                sequence.extend(part)
+                count -= len(part)
+                start = 0
+        return sequence
+
+    def on_cycle(self, state: int) -> bool:
+        """
+        Takes a state and returns True if the state is on the period cycle
+        and False if it can only be the start state of a message.
+        """
+        self._make_cycles()
+        return self._tail_length[state] == 0
+
+    def period(self, state: int) -> int:
+        """
+        Takes a state and returns the period of the cycle that state leads
+        onto.
+        """
+        self._make_cycles()
+        entry = self._tail_entry[state]
+        return len(self._cycles[self._cycle_id[entry]])
+
+    def cycle(self, state: int) -> List[int]:
+        """
+        Takes a state and returns the list of states of the full period that
+        state leads onto, starting from the state where it joins the cycle.
+        """
+        self._make_cycles()
+        entry = self._tail_entry[state]
+        cycle = self._cycles[self._cycle_id[entry]]
+        index = self._cycle_index[entry]
+        return cycle[index:] + cycle[:index]
+
+    def _make_next_state(self) -> None:
+        """
+        Makes the next state map for every rotor offset state.
+        """
+        next_state = []
+        for rs in range(26):
+            for rm in range(26):
+                for rf in range(26):
+                    n_rs, n_rm = rs, rm
+                    if self.turnover_flag:
+                        if rm in self.rm_notches:
+                            n_rs = (rs + 1) % 26
+                            n_rm = (rm + 1) % 26
+                        elif rf in self.rf_notches:
+                            n_rm = (rm + 1) % 26
+                    next_state.append(n_rs*676 + n_rm*26 + (rf + 1) % 26)
+        self.next_state = next_state
+
+    def _make_cycles(self) -> None:
+        """
+        Makes the cycle table. Every state gets the length of the tail before
+        it joins a cycle and the state where it joins. Cycle states get the
+        cycle they are on and their index in it.
+        """
+        if self._cycles:
+            return
+
+        next_state = self.next_state
+        cycle_id = [-1]*STATES
+        cycle_index = [-1]*STATES
+        tail_length = [-1]*STATES
+        tail_entry = [-1]*STATES
+
+        for start in range(STATES):
+            if tail_length[start] != -1:
+                continue
+
+            # walk until reaching a state already known or repeating a state.
+            path = []
+            on_path = {}
+            state = start
+            while tail_length[state] == -1 and state not in on_path:
+                on_path[state] = len(path)
+                path.append(state)
+                state = next_state[state]
+
+            if tail_length[state] == -1:
+                # new cycle found at the end of the path.
+                cycle = path[on_path[state]:]
+                for index, s in enumerate(cycle):
+                    cycle_id[s] = len(self._cycles)
+                    cycle_index[s] = index
+                    tail_length[s] = 0
+                    tail_entry[s] = s
+                self._cycles.append(cycle)
+                path = path[:on_path[state]]
+                state = cycle[0]
+
+            # unwind the tail states in front of the known state.
+            for s in reversed(path):
+                tail_length[s] = tail_length[state] + 1
+                tail_entry[s] = tail_entry[state]
+                state = s
+
+        self._cycle_id = cycle_id
+        self._cycle_index = cycle_index
+        self._tail_length = tail_length
+        self._tail_entry = tail_entry
@@ -29,10 +29,7 @@ def generate_indicators(settings, number):
 
         indicator = indicator*2
 
-        output = ""
-
-        for c in indicator:
-            output += machine.character_input(c)
+        output = machine.encrypt(indicator)
 
         indicators.append(output)
 
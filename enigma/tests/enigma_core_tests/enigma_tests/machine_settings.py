@@ -0,0 +1,62 @@
+import copy
+
+MACHINE_SETTINGS = [
+    ("WEHRMACHT", {
+        "reflector":"UKW-B",
+        "rotor_types":{"RS":"III","RM":"II","RF":"I"},
+        "rotor_settings":{"RS":"X","RM":"D","RF":"P"},
+        "ring_settings":{"RS":"C","RM":"Q","RF":"Z"},
+        "plugboard_mode":'S',
+        "plugboard_connections":[["A","B"],["C","D"],["E","F"],["G","H"]]
+    }),
+    ("LUFTWAFFE", {
+        "reflector":"UKW-C",
+        "rotor_types":{"RS":"VI","RM":"VIII","RF":"VII"},
+        "rotor_settings":{"RS":"A","RM":"L","RF":"K"},
+        "ring_settings":{"RS":"B","RM":"A","RF":"F"},
+        "plugboard_mode":'U',
+        "uhr_box_setting":7,
+        "plugboard_connections":{
+            "01A":"A","02A":"B","03A":"C","04A":"D","05A":"E",
+            "06A":"F","07A":"G","08A":"H","09A":"I","10A":"J",
+            "01B":"K","02B":"L","03B":"M","04B":"N","05B":"O",
+            "06B":"P","07B":"Q","08B":"R","09B":"S","10B":"T"
+        }
+    }),
+    ("ENIGMA M3 Kriegsmarine", {
+        "reflector":"UKW-B",
+        "rotor_types":{"RS":"I","RM":"II","RF":"III"},
+        "rotor_settings":{"RS":"A","RM":"D","RF":"U"},
+        "turnover_flag":False
+    }),
+    ("ENIGMA M3 Kriegsmarine", {
+        "reflector":"UKW-C",
+        "rotor_types":{"RS":"V","RM":"VI","RF":"VIII"},
+        "rotor_settings":{"RS":"Z","RM":"Z","RF":"L"}
+    }),
+    ("ENIGMA M4 u-boat", {
+        "reflector":"UKW-C",
+        "rotor_types":{"R4":"Gamma","RS":"V","RM":"VI","RF":"IV"},
+        "rotor_settings":{"R4":"Q","RS":"E","RM":"Z","RF":"H"},
+        "ring_settings":{"R4":"D","RS":"A","RM":"M","RF":"T"},
+        "plugboard_mode":'S',
+        "plugboard_connections":[["Q","W"],["E","R"],["T","Z"]]
+    })
+]
+
+
+def machine_settings():
+    """
+    Returns a list of machine type and settings pairs covering every machine
+    type, both plugboard modes, both turnover modes and two notch rotors.
+    The settings are copied so a test may change them.
+    """
+    return copy.deepcopy(MACHINE_SETTINGS)
+
+
+def settings_for(machine_type):
+    """
+    Takes a machine type. Returns a copy of the first shared settings for
+    that machine type.
+    """
+    return next(settings for m, settings in machine_settings() if m == machine_type)
@@ -0,0 +1,74 @@
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.enigma_core.batch_enigma import BatchEnigma, np
+from tests.enigma_core_tests.enigma_tests.machine_settings import machine_settings
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchEnigma(unittest.TestCase):
+
+    MESSAGE = "Wetterbericht fuer die Biskaya 0600 Uhr" * 30
+
+    # settings only the batch tests use, on top of the shared settings.
+    BATCH_SETTINGS = [
+        ("WEHRMACHT", {
+            "reflector":"UKW-A",
+            "rotor_types":{"RS":"V","RM":"IV","RF":"II"},
+            "rotor_settings":{"RS":"Z","RM":"J","RF":"D"},
+            "ring_settings":{"RS":"E","RM":"B","RF":"Y"},
+            "plugboard_mode":'S',
+            "plugboard_connections":[["A","Z"],["Q","P"],["M","N"]]
+        }),
+        ("LUFTWAFFE", {
+            "reflector":"UKW-D",
+            "rotor_types":{"RS":"VI","RM":"VII","RF":"VIII"},
+            "rotor_settings":{"RS":"C","RM":"L","RF":"X"},
+            "turnover_flag":False
+        }),
+        ("ENIGMA M4 u-boat", {
+            "reflector":"UKW-B",
+            "rotor_types":{"R4":"Beta","RS":"II","RM":"IV","RF":"I"},
+            "rotor_settings":{"R4":"V","RS":"J","RM":"N","RF":"A"},
+            "ring_settings":{"R4":"A","RS":"A","RM":"A","RF":"V"}
+        })
+    ]
+
+    def machine_settings(self):
+        """
+        Returns a dictionary of machine type to a list of settings covering
+        turnovers, ring settings, plugboard modes and the M4 R4 position.
+        """
+        settings = {}
+        for machine_type, machine in machine_settings() + self.BATCH_SETTINGS:
+            settings.setdefault(machine_type, []).append(machine)
+        return settings
+
+    def test_batch_matches_character_input(self):
+        """
+        Tests each row of the batch output matches character_input for a
+        machine made with the same settings.
+        """
+        for machine_type, settings_list in self.machine_settings().items():
+            batch = BatchEnigma(machine_type, settings_list)
+            output = batch.encrypt(self.MESSAGE)
+
+            self.assertEqual(output.shape[0], len(settings_list))
+            self.assertEqual(output.dtype, np.uint8)
+
+            for row, settings in zip(BatchEnigma.to_strings(output), settings_list):
+                machine = make_machine(machine_type, settings)
+                expected = ''.join(machine.character_input(c) or '' for c in self.MESSAGE)
+                self.assertEqual(row, expected)
+
+    def test_batch_continues_between_calls(self):
+        """
+        Tests that encrypting a message in two parts gives the same output as
+        encrypting it in one part.
+        """
+        settings_list = self.machine_settings()["ENIGMA M4 u-boat"]
+        b1 = BatchEnigma("ENIGMA M4 u-boat", settings_list)
+        b2 = BatchEnigma("ENIGMA M4 u-boat", settings_list)
+        whole = b1.encrypt(self.MESSAGE)
+        half = len(self.MESSAGE) // 2
+        parts = np.concatenate([b2.encrypt(self.MESSAGE[:half]), b2.encrypt(self.MESSAGE[half:])], axis=1)
+        self.assertTrue((whole == parts).all())
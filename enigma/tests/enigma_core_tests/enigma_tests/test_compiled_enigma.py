@@ -0,0 +1,138 @@
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.scrambler.exceptions.exceptions import ScramblerNotValid
+from tests.enigma_core_tests.enigma_tests.machine_settings import machine_settings
+
+
+class TestCompiledEnigma(unittest.TestCase):
+
+    MESSAGE = ("The quick brown fox jumps over the lazy dog 0123456789! "
+               "Wetterbericht fuer die Biskaya, keine besonderen Ereignisse.") * 40
+
+    def reference_output(self, machine, message):
+        """
+        Returns the output of character_input for each character of the
+        message with the None results discarded.
+        """
+        output = ""
+        for c in message:
+            o = machine.character_input(c)
+            if o:
+                output += o
+        return output
+
+    def test_encrypt_matches_character_input(self):
+        """
+        Tests the compiled enigma gives the same output as character_input
+        for all machine types.
+        """
+        for machine_type, settings in machine_settings():
+            machine = make_machine(machine_type, settings)
+            compiled = machine.compile()
+            output = compiled.encrypt(self.MESSAGE)
+            self.assertEqual(output, self.reference_output(machine, self.MESSAGE))
+
+    def test_character_input_matches_machine(self):
+        """
+        Tests the compiled character_input returns None for characters that
+        are not on the keyboard and matches the machine otherwise.
+        """
+        for machine_type, settings in machine_settings():
+            machine = make_machine(machine_type, settings)
+            compiled = machine.compile()
+            for c in "aZ9 .?ıb":
+                self.assertEqual(compiled.character_input(c), machine.character_input(c))
+
+    def test_compile_does_not_change_machine(self):
+        """
+        Tests that encrypting with the compiled enigma does not step the
+        machine it was compiled from.
+        """
+        machine_type, settings = machine_settings()[0]
+        machine = make_machine(machine_type, settings)
+        rotor_settings = machine.settings["rotor_settings"]
+        machine.compile().encrypt(self.MESSAGE)
+        self.assertEqual(machine.settings["rotor_settings"], rotor_settings)
+
+    def test_compile_invalid_machine(self):
+        """
+        This is a failing test for compiling a machine without a reflector.
+        """
+        machine = make_machine("WEHRMACHT")
+        self.assertRaises(ScramblerNotValid, machine.compile)
+
+    def test_machine_encrypt(self):
+        """
+        Tests Enigma.encrypt gives the same output and leaves the machine in
+        the same state as character_input.
+        """
+        for machine_type, settings in machine_settings():
+            m1 = make_machine(machine_type, settings)
+            m2 = make_machine(machine_type, settings)
+            self.assertEqual(m1.encrypt(self.MESSAGE), self.reference_output(m2, self.MESSAGE))
+            self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+            self.assertEqual(m1.encrypt("ANOTHERMESSAGE"), self.reference_output(m2, "ANOTHERMESSAGE"))
+
+    def test_machine_encrypt_bytes(self):
+        """
+        Tests Enigma.encrypt_bytes gives the same output as character_input.
+        """
+        for machine_type, settings in machine_settings():
+            m1 = make_machine(machine_type, settings)
+            m2 = make_machine(machine_type, settings)
+            buf = self.MESSAGE.encode('ascii') + bytes(range(256))
+            output = self.reference_output(m2, buf.decode('latin-1'))
+            self.assertEqual(m1.encrypt_bytes(buf), output.encode('ascii'))
+
+    def test_machine_encrypt_incomplete_plugboard(self):
+        """
+        Tests Enigma.encrypt, encrypt_bytes and encrypt_indices give the same
+        output as character_input for an incomplete Uhr box plugboard that
+        can not be compiled.
+        """
+        settings = {
+            "reflector":"UKW-C",
+            "rotor_types":{"RS":"VI","RM":"VIII","RF":"VII"},
+            "plugboard_mode":'U',
+            "uhr_box_setting":7,
+            "plugboard_connections":{"01A":"A","02A":"B","01B":"K"}
+        }
+        m1 = make_machine("LUFTWAFFE", settings)
+        m2 = make_machine("LUFTWAFFE", settings)
+        self.assertFalse(m1.plugboard.valid_plugboard())
+        self.assertRaises(ValueError, m1.compile)
+        self.assertEqual(m1.encrypt(self.MESSAGE), self.reference_output(m2, self.MESSAGE))
+        self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+        buf = b"Wetterbericht 0123"
+        self.assertEqual(m1.encrypt_bytes(buf), self.reference_output(m2, buf.decode('ascii')).encode('ascii'))
+        indices = [(i * 7) % 26 for i in range(100)]
+        self.assertEqual(m1.encrypt_indices(indices), bytes(m2.integer_input(i) for i in indices))
+        self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+
+    def test_machine_encrypt_indices(self):
+        """
+        Tests Enigma.encrypt_indices gives the same output and leaves the
+        machine in the same state as integer_input for bytes, arrays and
+        lists of indexes.
+        """
+        from array import array
+        indices = [(i * 7) % 26 for i in range(1000)]
+        for machine_type, settings in machine_settings():
+            m1 = make_machine(machine_type, settings)
+            m2 = make_machine(machine_type, settings)
+            expected = bytes(m2.integer_input(i) for i in indices)
+            self.assertEqual(m1.encrypt_indices(bytes(indices[:300])), expected[:300])
+            self.assertEqual(m1.encrypt_indices(array('i', indices[300:600])), expected[300:600])
+            self.assertEqual(m1.encrypt_indices(indices[600:]), expected[600:])
+            self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+
+    def test_machine_encrypt_indices_invalid(self):
+        """
+        This is a failing test for indexes that are not in 0-25.
+        """
+        machine_type, settings = machine_settings()[0]
+        machine = make_machine(machine_type, settings)
+        rotor_settings = machine.settings["rotor_settings"]
+        self.assertRaises(ValueError, machine.encrypt_indices, [0, 26])
+        self.assertRaises(ValueError, machine.encrypt_indices, [-1])
+        self.assertEqual(machine.settings["rotor_settings"], rotor_settings)
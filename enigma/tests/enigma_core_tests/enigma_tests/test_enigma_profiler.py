@@ -0,0 +1,85 @@
+import json
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.enigma_core.enigma import Enigma
+from enigma_core.enigma_core.enigma_profiler import STAGES
+from tests.enigma_core_tests.enigma_tests.machine_settings import settings_for
+
+
+class TestEnigmaProfiler(unittest.TestCase):
+
+    MESSAGE = "Wetterbericht fuer die Biskaya" * 5
+
+    SETTINGS = settings_for("ENIGMA M4 u-boat")
+
+    def encrypt(self, machine):
+        """
+        Takes a machine and returns the message through character_input.
+        """
+        return ''.join(machine.character_input(c) or '' for c in self.MESSAGE)
+
+    def test_profiled_output(self):
+        """
+        Tests the profiled machine gives the same output as a machine that
+        is not profiled, with and without the permutation cache.
+        """
+        for cache_size in (0, 26):
+            expected = self.encrypt(make_machine("ENIGMA M4 u-boat", self.SETTINGS))
+            machine = make_machine("ENIGMA M4 u-boat", self.SETTINGS)
+            machine.scrambler.permutation_cache_size = cache_size
+            machine.enable_profiling()
+            self.assertEqual(self.encrypt(machine), expected)
+
+    def test_profiled_signal_path(self):
+        """
+        Tests the rotor pass is timed over the scrambler signal path with the
+        R4 rotor folded into the reflector.
+        """
+        machine = make_machine("ENIGMA M4 u-boat", self.SETTINGS)
+        profiler = machine.enable_profiling()
+        calls = []
+        path = machine.scrambler._make_signal_path()
+        lh_outputs = tuple((lambda f: lambda i: calls.append(i) or f(i))(f) for f in path[0])
+        machine.scrambler._signal_path = (lh_outputs,) + path[1:]
+
+        machine.character_input('A')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(profiler.report()["reflector"]["calls"], 1)
+
+    def test_stage_counts(self):
+        """
+        Tests each stage is counted once for each key press and the keyboard
+        once for each character.
+        """
+        machine = make_machine("ENIGMA M4 u-boat", self.SETTINGS)
+        profiler = machine.enable_profiling()
+        self.encrypt(machine)
+        machine.integer_input(0)
+        report = profiler.report()
+        keyed = len(machine.keyboard.clean_input_string(self.MESSAGE)) + 1
+
+        self.assertEqual(tuple(report), STAGES)
+        self.assertEqual(report["keyboard"]["calls"], len(self.MESSAGE))
+        for stage in STAGES[1:]:
+            self.assertEqual(report[stage]["calls"], keyed)
+            self.assertGreater(report[stage]["ns"], 0)
+        self.assertEqual(json.loads(profiler.to_json()), report)
+
+        profiler.reset()
+        self.assertEqual(profiler.report()["stepping"]["calls"], 0)
+
+    def test_disable_profiling(self):
+        """
+        Tests disabling profiling restores the class methods and stops
+        recording.
+        """
+        machine = make_machine("ENIGMA M4 u-boat", self.SETTINGS)
+        profiler = machine.enable_profiling()
+        machine.character_input('A')
+        machine.disable_profiling()
+
+        self.assertNotIn("character_input", vars(machine))
+        self.assertEqual(machine.character_input.__func__, Enigma.character_input)
+        machine.character_input('A')
+        self.assertEqual(profiler.report()["keyboard"]["calls"], 1)
+        self.assertIs(machine.enable_profiling(), profiler)
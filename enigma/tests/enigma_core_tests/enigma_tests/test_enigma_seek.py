@@ -0,0 +1,55 @@
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.scrambler.exceptions.exceptions import SteppingStateError
+from tests.enigma_core_tests.enigma_tests.machine_settings import machine_settings
+
+
+class TestEnigmaSeek(unittest.TestCase):
+
+    MESSAGE = "WETTERBERICHTFUERDIEBISKAYAKEINEBESONDERENEREIGNISSE" * 20
+
+    def test_seek_matches_stepping(self):
+        """
+        Tests encrypting from seek(n) gives the same output as encrypting the
+        whole message and keeping the output from n on.
+        """
+        for machine_type, settings in machine_settings():
+            machine = make_machine(machine_type, settings)
+            whole = machine.encrypt(self.MESSAGE)
+            for n in [0, 1, 25, 26, 27, 300, 677, len(self.MESSAGE) - 1]:
+                machine.seek(n)
+                self.assertEqual(machine.encrypt(self.MESSAGE[n:]), whole[n:])
+
+    def test_advance_and_rewind(self):
+        """
+        Tests advance and rewind move the rotors forwards and backwards along
+        the stepping sequence.
+        """
+        for machine_type, settings in machine_settings():
+            m1 = make_machine(machine_type, settings)
+            m2 = make_machine(machine_type, settings)
+            m1.advance(500)
+            m2.encrypt(self.MESSAGE[:500])
+            self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+            m1.rewind(200)
+            m2.seek(300)
+            self.assertEqual(m1.settings["rotor_settings"], m2.settings["rotor_settings"])
+
+    def test_rewind_start_state(self):
+        """
+        This is a failing test for rewinding from a start only state where
+        the middle rotor rests on its turnover notch.
+        """
+        machine = make_machine("WEHRMACHT", {
+            "reflector":"UKW-B",
+            "rotor_types":{"RS":"I","RM":"II","RF":"III"},
+            "rotor_settings":{"RS":"A","RM":"E","RF":"A"}
+        })
+        self.assertRaises(SteppingStateError, machine.rewind, 1)
+
+    def test_seek_without_origin(self):
+        """
+        This is a failing test for seeking a machine that has no origin.
+        """
+        machine = make_machine("WEHRMACHT")
+        self.assertRaises(SteppingStateError, machine.seek, 10)
@@ -0,0 +1,66 @@
+import unittest
+from enigma_core.factory import make_machine
+from tests.enigma_core_tests.enigma_tests.machine_settings import machine_settings
+
+
+class TestEnigmaSnapshot(unittest.TestCase):
+
+    MESSAGE = "DASOBERKOMMANDODERWEHRMACHTGIBTBEKANNT" * 10
+
+    def test_snapshot_restore(self):
+        """
+        Tests a restored machine gives the same output and settings as when
+        the snapshot was taken.
+        """
+        for machine_type, settings in machine_settings():
+            machine = make_machine(machine_type, settings)
+            state = machine.snapshot()
+            expected_settings = machine.settings
+            output = machine.encrypt(self.MESSAGE)
+            machine.restore(state)
+            self.assertEqual(machine.settings, expected_settings)
+            self.assertEqual(machine.encrypt(self.MESSAGE), output)
+
+    def test_restore_changed_devices(self):
+        """
+        Tests restoring a snapshot after the rotors, reflector and plugboard
+        have been changed.
+        """
+        machine_type, settings = machine_settings()[0]
+        machine = make_machine(machine_type, settings)
+        state = machine.snapshot()
+        output = machine.encrypt(self.MESSAGE)
+
+        machine.settings = {
+            "reflector":"UKW-A",
+            "rotor_types":{"RS":"IV","RM":"V","RF":"I"},
+            "ring_settings":{"RS":"Q","RM":"Q","RF":"Q"},
+            "plugboard_mode":'S',
+            "plugboard_connections":[["X","Y"]]
+        }
+        machine.restore(state)
+        self.assertEqual(machine.encrypt(self.MESSAGE), output)
+
+    def test_clone(self):
+        """
+        Tests a clone gives the same output and does not share state with the
+        original machine.
+        """
+        for machine_type, settings in machine_settings():
+            machine = make_machine(machine_type, settings)
+            machine.encrypt("ABC")
+            clone = machine.clone()
+            self.assertEqual(clone.settings, machine.settings)
+            output = clone.encrypt(self.MESSAGE)
+            self.assertNotEqual(clone.settings["rotor_settings"], machine.settings["rotor_settings"])
+            self.assertEqual(machine.encrypt(self.MESSAGE), output)
+            clone.seek(3)
+            self.assertEqual(clone.encrypt(self.MESSAGE), output)
+
+    def test_restore_other_machine_type(self):
+        """
+        This is a failing test for restoring a snapshot from another machine
+        type.
+        """
+        state = make_machine("WEHRMACHT").snapshot()
+        self.assertRaises(ValueError, make_machine("LUFTWAFFE").restore, state)
@@ -1,5 +1,6 @@
 import unittest
 from enigma_core.settings.settings import EQUIPMENT_DICT, LETTERS, NUMBERS
+from enigma_core.plugboard.plugboard import Plugboard
 from enigma_core.plugboard.stecker_plugboard import SteckerPlugboard
 from enigma_core.plugboard.exceptions import SocketIDError
 
@@ -174,3 +175,68 @@ class TestSteckerPlugboard(unittest.TestCase):
         self.assertEqual(pb.character_set, NUMBERS)
 
         self.assertEqual(pb.character_set_flag, 'N')
+
+    def test_incremental_updates(self):
+        """
+        Tests the contact arrays patched by connect, disconnect, swap and
+        undo are the same as fully rebuilt contact arrays.
+        """
+        import random
+        rng = random.Random(7)
+        pb = self.make_plugboard('L')
+        history = []
+
+        for _ in range(500):
+            s1, s2 = rng.sample(LETTERS, 2)
+            history.append((dict(pb.sockets), bytes(pb.lg_contact_arr)))
+            operation = rng.choice(["connect", "disconnect", "swap"])
+            if operation == "connect": pb.connect(s1, s2)
+            elif operation == "disconnect": pb.disconnect(s1)
+            else: pb.swap(s1, s2)
+            lg, sm = bytes(pb.lg_contact_arr), bytes(pb.sm_contact_arr)
+            pb._make_translation_arrays()
+            self.assertEqual(lg, bytes(pb.lg_contact_arr))
+            self.assertEqual(sm, bytes(pb.sm_contact_arr))
+            for s in LETTERS:
+                self.assertEqual(pb.sockets[pb.sockets[s]], s)
+
+        for sockets, lg in reversed(history[-100:]):
+            pb.undo()
+            self.assertEqual(pb.sockets, sockets)
+            self.assertEqual(bytes(pb.lg_contact_arr), lg)
+
+    def test_swap_apply(self):
+        """
+        Tests swap exchanges the connected sockets and that apply is undone in
+        one step and is reverted if an operation is not valid.
+        """
+        pb = self.make_plugboard('L')
+        pb.make_connections([['A','B'],['C','D']])
+        pb.swap('A','C')
+        self.assertEqual(pb.connected(), [['A','D'],['B','C']])
+        pb.swap('A','Z')
+        self.assertEqual(pb.connected(), [['B','C'],['D','Z']])
+
+        pb.apply([("connect","E","F"), ("disconnect","B"), ("swap","E","G")])
+        self.assertEqual(pb.connected(), [['D','Z'],['F','G']])
+        pb.undo()
+        self.assertEqual(pb.connected(), [['B','C'],['D','Z']])
+
+        self.assertRaises(SocketIDError, pb.apply, [("connect","X","Y"), ("connect","X","#")])
+        self.assertEqual(pb.connected(), [['B','C'],['D','Z']])
+        self.assertRaises(ValueError, pb.apply, [("rotate","X")])
+
+        pb.clear()
+        self.assertRaises(ValueError, pb.undo)
+        self.assertEqual(bytes(pb.lg_contact_arr), bytes(range(26)))
+
+    def test_incomplete_plugboard(self):
+        """
+        Tests a plugboard subclass without the change hooks can not be made.
+        """
+        class IncompletePlugboard(Plugboard):
+
+            def _connect(self, changes, *args):
+                pass
+
+        self.assertRaises(TypeError, IncompletePlugboard)
@@ -208,4 +208,61 @@ class TestUhrBoxPlugboard(unittest.TestCase):
 
         pb.make_connections(conns)
 
-        
\ No newline at end of file
+        
+    def test_incremental_updates(self):
+        """
+        Tests the contact arrays patched by connect, disconnect, swap and
+        undo are the same as fully rebuilt contact arrays.
+        """
+        import random
+        rng = random.Random(11)
+        pb = self.make_uhr_box_plugboard()
+        pb.rotor_setting = 13
+        plug_ids = UhrBox.PLUG_A_IDS + UhrBox.PLUG_B_IDS
+        history = []
+
+        for _ in range(500):
+            s1, s2 = rng.sample(LETTERS, 2)
+            history.append((dict(pb.uhr_plugs_map), bytes(pb.lg_contact_arr), bytes(pb.sm_contact_arr)))
+            operation = rng.choice(["connect", "connect", "disconnect", "swap"])
+            if operation == "connect": pb.connect(rng.choice(plug_ids), s1)
+            elif operation == "disconnect": pb.disconnect(s1)
+            else: pb.swap(s1, s2)
+            lg, sm = bytes(pb.lg_contact_arr), bytes(pb.sm_contact_arr)
+            pb._make_translation_arrays()
+            self.assertEqual(lg, bytes(pb.lg_contact_arr))
+            self.assertEqual(sm, bytes(pb.sm_contact_arr))
+            self.assertEqual(sorted(pb.uhr_plugs_map.keys()), sorted(plug_ids))
+            sockets = [s for s in pb.uhr_plugs_map.values() if s]
+            self.assertEqual(len(sockets), len(set(sockets)))
+
+        for uhr_plugs_map, lg, sm in reversed(history[-100:]):
+            pb.undo()
+            self.assertEqual(pb.uhr_plugs_map, uhr_plugs_map)
+            self.assertEqual(bytes(pb.lg_contact_arr), lg)
+            self.assertEqual(bytes(pb.sm_contact_arr), sm)
+
+    def test_setting_tables(self):
+        """
+        Tests the contact arrays looked up for each uhr box setting are the
+        same as contact arrays made through the uhr box contact ids, also
+        after the plug connections change.
+        """
+        pb = self.make_uhr_box_plugboard()
+        conns = {plug_id: LETTERS[i] for i, plug_id in enumerate(UhrBox.PLUG_A_IDS + UhrBox.PLUG_B_IDS)}
+        pb.make_connections(conns)
+
+        for swap in (None, ('B', 'Z'), ('D', 'F')):
+            if swap:
+                pb.swap(*swap)
+            for setting in range(UhrBox.POSITIONS):
+                pb.rotor_setting = setting
+                lg, sm = list(range(26)), list(range(26))
+                for plug_id, socket_id in pb.uhr_plugs_map.items():
+                    if socket_id:
+                        for contact_type, arr in (('LG', lg), ('SM', sm)):
+                            other = pb.uhr_plugs_map[pb.ub.connected_contact_id(plug_id, contact_type)[0]]
+                            if other:
+                                arr[LETTERS.index(socket_id)] = LETTERS.index(other)
+                self.assertEqual(list(pb.lg_contact_arr), lg)
+                self.assertEqual(list(pb.sm_contact_arr), sm)
@@ -421,3 +421,12 @@ class TestCollection(unittest.TestCase):
                     collection_dict["ROTORS_STATIC"],
                     static_rotors
                 )
+
+    def test_machine_devices(self):
+        """
+        Tests the machine devices read from the equipment settings are the
+        same as the collection dict of a collection for that machine.
+        """
+        for machine in self.settings_machine_list():
+            c = self.make_default_collection(machine)
+            self.assertEqual(Collection.machine_devices(machine), c.collection_dict())
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.scrambler.exceptions.exceptions import PermutationTableError
+from enigma_core.scrambler.permutation_tables.permutation_tables import (HEADER_SIZE,
+                                                                        TABLE_SIZE,
+                                                                        PermutationTable,
+                                                                        generate_table,
+                                                                        generate_tables,
+                                                                        scrambler_table)
+
+
+class TestPermutationTables(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_table_matches(self, machine):
+        """
+        Takes a machine. Generates the table for its scrambler and tests the
+        table permutations match the scrambler permutations as it steps.
+        """
+        reflector, rotors, r4 = scrambler_table(machine.scrambler)
+        path = generate_table(machine.machine_type, reflector, rotors, self.directory, r4)
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE + TABLE_SIZE)
+
+        with PermutationTable.load(self.directory, machine.scrambler) as table:
+            self.assertEqual(table.key.split(' ')[0], reflector)
+            for _ in range(700):
+                machine.scrambler.rotor_turnover()
+                permutation = bytes(machine.scrambler.permutation())
+                self.assertEqual(table.scrambler_permutation(machine.scrambler), permutation)
+                state = sum(machine.scrambler.get_device(p).core_offset() * m
+                            for p, m in (("RS", 676), ("RM", 26), ("RF", 1)))
+                self.assertEqual(bytes(table.row(state)), permutation)
+
+    def test_three_rotor_table(self):
+        """
+        Tests a three rotor machine table with ring settings.
+        """
+        self.assert_table_matches(make_machine("WEHRMACHT", {
+            "reflector":"UKW-C",
+            "rotor_types":{"RS":"V","RM":"I","RF":"IV"},
+            "rotor_settings":{"RS":"Q","RM":"D","RF":"U"},
+            "ring_settings":{"RS":"B","RM":"X","RF":"K"}
+        }))
+
+    def test_m4_table(self):
+        """
+        Tests an M4 table with the R4 rotor folded into the reflector.
+        """
+        self.assert_table_matches(make_machine("ENIGMA M4 u-boat", {
+            "reflector":"UKW-B",
+            "rotor_types":{"R4":"Gamma","RS":"VIII","RM":"VI","RF":"V"},
+            "rotor_settings":{"R4":"Q","RS":"Y","RM":"L","RF":"R"},
+            "ring_settings":{"R4":"H","RS":"B","RM":"Z","RF":"E"}
+        }))
+
+    def test_generate_tables(self):
+        """
+        Tests a table is generated for every rotor order and reflector and
+        that an M4 needs the R4 rotor.
+        """
+        paths = generate_tables("WEHRMACHT", self.directory, reflectors=["UKW-B"])
+        self.assertEqual(len(paths), 60)
+        self.assertIn(os.path.join(self.directory, "UKW-B_III_I_V.perm"), paths)
+        self.assertRaises(PermutationTableError, generate_tables, "ENIGMA M4 u-boat", self.directory)
+
+    def test_invalid_table(self):
+        """
+        This is a failing test for files that are not permutation tables.
+        """
+        for content in (b"", b"ENIGPERM" + bytes(100)):
+            path = os.path.join(self.directory, "bad.perm")
+            with open(path, 'wb') as f:
+                f.write(content)
+            self.assertRaises(PermutationTableError, PermutationTable, path)
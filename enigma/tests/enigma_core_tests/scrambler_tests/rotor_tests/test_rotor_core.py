@@ -1,4 +1,8 @@
 import unittest
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from enigma_core.scrambler.devices.rotor.rotor import Rotor
 from enigma_core.scrambler.devices.rotor.rotor_core import RotorInputIndexError
 from enigma_core.settings.settings import LETTERS, NUMBERS
@@ -96,4 +100,63 @@ class TestRotorCore(unittest.TestCase):
 
         rotor = self.make_rotor(wire_list=wire_list)
 
-        self.assertEqual(rotor.core.current_wiring_characters(), wire_list)
\ No newline at end of file
+        self.assertEqual(rotor.core.current_wiring_characters(), wire_list)
+
+    def test_shared_translation_maps(self):
+        """
+        Tests rotors with the same wiring share their translation maps and
+        that the maps give the output of the wiring for each core offset.
+        """
+        wire_list = list("EKMFLGDQVZNTOWYHXUSPAIBRCJ")
+        r1 = self.make_rotor(wire_list=wire_list)
+        r2 = self.make_rotor(rotor_id="OTHER", wire_list=list(wire_list))
+
+        self.assertIs(r1.core._lh_translation_map, r2.core._lh_translation_map)
+        self.assertIs(r1.core._rh_translation_map, r2.core._rh_translation_map)
+
+        for offset in range(26):
+            r1.rotor_setting = LETTERS[offset]
+            for index in range(26):
+                expected = (LETTERS.index(wire_list[(index + offset) % 26]) - offset) % 26
+                self.assertEqual(r1.core.lh_output(index), expected)
+                self.assertEqual(r1.core.rh_output(expected), index)
+
+    def test_flat_tables(self):
+        """
+        Tests the flat tables hold the translation map for each core offset
+        and the unchecked outputs match the checked outputs.
+        """
+        wire_list = list("EKMFLGDQVZNTOWYHXUSPAIBRCJ")
+        rotor = self.make_rotor(wire_list=wire_list)
+        core = rotor.core
+
+        self.assertEqual(len(core.lh_table), 26*26)
+        self.assertEqual(core.lh_table, b''.join(core._lh_translation_map))
+        self.assertEqual(core.rh_table, b''.join(core._rh_translation_map))
+
+        for ring in ('A', 'F'):
+            rotor.ring_setting = ring
+            for setting in LETTERS:
+                rotor.rotor_setting = setting
+                for index in range(26):
+                    self.assertEqual(core.lh_output_unchecked(index), core.lh_output(index))
+                    self.assertEqual(core.rh_output_unchecked(index), core.rh_output(index))
+
+        self.assertRaises(RotorInputIndexError, core.lh_output, 1.0)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_integer_like_index(self):
+        """
+        Tests integer like indexes such as numpy integers are valid inputs and
+        indexes that are not integers are not.
+        """
+        rotor = self.make_rotor(wire_list=list("EKMFLGDQVZNTOWYHXUSPAIBRCJ"))
+        core = rotor.core
+
+        for index in range(26):
+            self.assertEqual(core.lh_output(np.int64(index)), core.lh_output(index))
+            self.assertEqual(core.rh_output(np.uint8(index)), core.rh_output(index))
+        self.assertTrue(core.valid_input_index(True))
+        self.assertRaises(RotorInputIndexError, core.lh_output, np.int64(26))
+        self.assertRaises(RotorInputIndexError, core.lh_output, np.float64(1.0))
+        self.assertRaises(RotorInputIndexError, core.lh_output, "1")
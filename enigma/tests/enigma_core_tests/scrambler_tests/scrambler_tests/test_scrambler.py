@@ -262,4 +262,111 @@ class TestScrambler(unittest.TestCase):
 
             s.rotor_types = rotors_dict
 
-            rotors_dict = s.rotor_types
\ No newline at end of file
+            rotors_dict = s.rotor_types
+
+    def test_permutation_cache(self):
+        """
+        Tests the cached output is the same as the uncached output and that
+        the cache is bounded and cleared when a device changes.
+        """
+        s1 = self.make_default_scrambler("WEHRMACHT")
+        s2 = self.make_default_scrambler("WEHRMACHT")
+        settings = {
+            "reflector":"UKW-B",
+            "rotor_types":{"RS":"I","RM":"II","RF":"III"},
+            "rotor_settings":{"RS":"A","RM":"D","RF":"U"},
+            "ring_settings":{"RS":"B","RM":"C","RF":"D"}
+        }
+        s1.settings = settings
+        s2.settings = settings
+        s1.permutation_cache_size = 4
+
+        for _ in range(60):
+            self.assertEqual([s1.keyed_input(i % 26) for i in range(2)] + [s1.output(i) for i in range(26)],
+                             [s2.keyed_input(i % 26) for i in range(2)] + [s2.output(i) for i in range(26)])
+            self.assertLessEqual(len(s1._permutation_cache), 4)
+
+        s1.ring_settings = {"RF":"Q"}
+        s2.ring_settings = {"RF":"Q"}
+        self.assertEqual(s1.permutation(), tuple(s2.output(i) for i in range(26)))
+
+        s1.set_device("REF", "UKW-A")
+        self.assertEqual(len(s1._permutation_cache), 0)
+        s2.set_device("REF", "UKW-A")
+        self.assertEqual(s1.permutation(), tuple(s2.output(i) for i in range(26)))
+
+        # the cached permutation can not be changed by a caller.
+        permutation = s1.permutation()
+        self.assertIsInstance(permutation, tuple)
+        self.assertIs(s1.permutation(), permutation)
+        self.assertEqual(s1.output(0), s2.output(0))
+
+        self.assertRaises(ValueError, setattr, s1, "permutation_cache_size", -1)
+
+    def test_signal_path(self):
+        """
+        Tests the scrambler output through the unchecked rotor core outputs
+        is the same as passing the signal through the checked device outputs,
+        also after a device is changed.
+        """
+        from enigma_core.scrambler.exceptions.exceptions import ScramblerNotValid, RotorInputIndexError
+        s = self.make_default_scrambler("ENIGMA M4 u-boat")
+        self.assertRaises(ScramblerNotValid, s.output, 0)
+        s.settings = {
+            "reflector":"UKW-B",
+            "rotor_types":{"R4":"Beta","RS":"II","RM":"IV","RF":"I"},
+            "rotor_settings":{"R4":"V","RS":"J","RM":"N","RF":"A"},
+            "ring_settings":{"R4":"A","RS":"A","RM":"A","RF":"V"}
+        }
+        positions = ["RF", "RM", "RS", "R4"]
+
+        def checked_output(index):
+            for position in positions:
+                index = s.get_device(position).core.lh_output(index)
+            index = s.get_device("REF").output(index)
+            for position in reversed(positions):
+                index = s.get_device(position).core.rh_output(index)
+            return index
+
+        for _ in range(2):
+            for _ in range(30):
+                s.rotor_turnover()
+                self.assertEqual([s.output(i) for i in range(26)], [checked_output(i) for i in range(26)])
+            s.set_device("REF", "UKW-C")
+            s.set_device("R4", "Gamma")
+
+        self.assertRaises(RotorInputIndexError, s.output, 26)
+        self.assertRaises(RotorInputIndexError, s.output, 1.0)
+
+        class IntegerLike:
+            def __init__(self, value):
+                self.value = value
+
+            def __index__(self):
+                return self.value
+
+        self.assertEqual([s.output(IntegerLike(i)) for i in range(26)], [checked_output(i) for i in range(26)])
+
+    def test_static_rotor_folding(self):
+        """
+        Tests the M4 output with the R4 rotor folded into the reflector
+        follows changes to the R4 rotor and ring settings.
+        """
+        s = self.make_default_scrambler("ENIGMA M4 u-boat")
+        s.settings = {
+            "reflector":"UKW-C",
+            "rotor_types":{"R4":"Gamma","RS":"VIII","RM":"VI","RF":"V"}
+        }
+
+        def checked_output(index):
+            for position in ["RF", "RM", "RS", "R4"]:
+                index = s.get_device(position).core.lh_output(index)
+            index = s.get_device("REF").output(index)
+            for position in ["R4", "RS", "RM", "RF"]:
+                index = s.get_device(position).core.rh_output(index)
+            return index
+
+        for r4_setting, r4_ring in [("A", "A"), ("Q", "A"), ("Q", "H"), ("Z", "C")]:
+            s.rotor_settings = {"R4":r4_setting}
+            s.ring_settings = {"R4":r4_ring}
+            self.assertEqual([s.output(i) for i in range(26)], [checked_output(i) for i in range(26)])
@@ -0,0 +1,125 @@
+import unittest
+from enigma_core.factory import make_machine
+from enigma_core.settings.settings import LETTERS
+from enigma_core.scrambler.stepping.stepping_schedule import SteppingSchedule
+
+
+class TestSteppingSchedule(unittest.TestCase):
+
+    def make_machine(self, rotor_settings, turnover_flag=True):
+        """
+        Returns a WEHRMACHT machine with rotors I, II, III and the provided
+        rotor settings string for RS, RM and RF.
+        """
+        return make_machine("WEHRMACHT", {
+            "reflector":"UKW-B",
+            "rotor_types":{"RS":"I","RM":"II","RF":"III"},
+            "rotor_settings":dict(zip(["RS","RM","RF"], rotor_settings)),
+            "turnover_flag":turnover_flag
+        })
+
+    def rotor_settings(self, scrambler):
+        """
+        Returns the RS, RM and RF rotor settings as a string.
+        """
+        return ''.join(scrambler.rotor_settings[p] for p in ["RS","RM","RF"])
+
+    def test_double_step(self):
+        """
+        Tests the middle rotor steps again with the slow rotor when it is on
+        its turnover notch.
+        """
+        machine = self.make_machine("ADU")
+        settings = []
+        for _ in range(3):
+            machine.scrambler.rotor_turnover()
+            settings.append(self.rotor_settings(machine.scrambler))
+        self.assertEqual(settings, ["ADV","AEW","BFX"])
+
+    def test_known_message(self):
+        """
+        Tests the Scharnhorst message of 26 December 1943 decrypts to its
+        published plain text. The middle rotor starts on its Z notch so the
+        message depends on the double step.
+        """
+        machine = make_machine("ENIGMA M3 Kriegsmarine", {
+            "reflector":"UKW-B",
+            "rotor_types":{"RS":"III","RM":"VI","RF":"VIII"},
+            "ring_settings":{"RS":"A","RM":"H","RF":"M"},
+            "rotor_settings":{"RS":"U","RM":"Z","RF":"V"},
+            "plugboard_mode":'S',
+            "plugboard_connections":[["A","N"],["E","Z"],["H","K"],["I","J"],["L","R"],
+                                     ["M","Q"],["O","T"],["P","V"],["S","W"],["U","X"]]
+        })
+        cipher_text = ("YKAENZAPMSCHZBFOCUVMRMDPYCOFHADZIZMEFXTHFLOLPZLFGGBOTGOX"
+                       "GRETDWTJIQHLMXVJWKZUASTR")
+        plain_text = ("STEUEREJTANAFJORDJANSTANDORTQUAAACCCVIERNEUNNEUNZWOFAHRTZ"
+                      "WONULSMXXSCHARNHORSTHCO")
+        output = ''.join(machine.character_input(c) for c in cipher_text)
+        self.assertEqual(output, plain_text)
+
+    def test_period(self):
+        """
+        Tests the period for single notch rotors is 26*25*26 and that start
+        states off the cycle join it within two key presses.
+        """
+        schedule = SteppingSchedule.schedule([LETTERS.index('E')], [LETTERS.index('V')])
+        cycle = set(schedule.cycle(0))
+        for state in range(26**3):
+            self.assertEqual(schedule.period(state), 26*25*26)
+            self.assertIn(schedule.state_after(state, 2), cycle)
+
+    def test_no_turnover_period(self):
+        """
+        Tests only the fast rotor steps when the turnover flag is False.
+        """
+        schedule = SteppingSchedule.schedule([4], [21], False)
+        self.assertEqual(schedule.period(0), 26)
+        self.assertEqual(schedule.state_after(SteppingSchedule.state(3, 4, 21), 27),
+                         SteppingSchedule.state(3, 4, 22))
+
+    def test_schedule_is_shared(self):
+        """
+        Tests schedules for the same notches are made only once.
+        """
+        s1 = SteppingSchedule.schedule([4], [21])
+        s2 = SteppingSchedule.schedule((4,), (21,))
+        self.assertIs(s1, s2)
+
+    def test_state_after_matches_stepping(self):
+        """
+        Tests state_after and sequence give the same states as stepping one
+        key press at a time.
+        """
+        schedule = SteppingSchedule.schedule([4, 17], [12, 25])
+        for start in [0, 4*26 + 3, SteppingSchedule.state(9, 4, 12), 17575]:
+            state = start
+            states = []
+            for n in range(1, 20000):
+                state = schedule.step(state)
+                states.append(state)
+                if n % 997 == 0 or n < 30:
+                    self.assertEqual(schedule.state_after(start, n), state)
+            self.assertEqual(schedule.sequence(start, len(states)), states)
+        self.assertRaises(ValueError, schedule.state_after, 0, -1)
+
+    def test_scrambler_schedule_follows_rotor_types(self):
+        """
+        Tests the scrambler schedule changes when the rotors change.
+        """
+        machine = self.make_machine("AAA")
+        s1 = machine.scrambler.stepping_schedule()
+        machine.scrambler.rotor_types = {"RM":"IV","RF":"V"}
+        s2 = machine.scrambler.stepping_schedule()
+        self.assertIsNot(s1, s2)
+        self.assertEqual(s2.rm_notches, (LETTERS.index('J'),))
+        self.assertEqual(s2.rf_notches, (LETTERS.index('Z'),))
+
+    def test_state_before(self):
+        """
+        Tests state_before undoes state_after for states on the cycle.
+        """
+        schedule = SteppingSchedule.schedule([4], [21])
+        state = SteppingSchedule.state(0, 3, 20)
+        for n in [0, 1, 2, 26, 651, 16899, 16900, 40000]:
+            self.assertEqual(schedule.state_before(schedule.state_after(state, n), n), state)
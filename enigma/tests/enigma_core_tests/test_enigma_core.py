@@ -6,4 +6,11 @@ from tests.enigma_core_tests.scrambler_tests.collection_tests.test_collection im
 from tests.enigma_core_tests.scrambler_tests.scrambler_tests.test_scrambler import TestScrambler
 from tests.enigma_core_tests.plugboard_tests.stecker_plugboard_tests.test_stecker_plugboard import TestSteckerPlugboard
 from tests.enigma_core_tests.plugboard_tests.uhr_box_plugboard_tests.uhr_box_plugboard_tests import TestUhrBoxPlugboard
-from tests.enigma_core_tests.enigma_tests.enigma_tests import TestEnigmaCore
\ No newline at end of file
+from tests.enigma_core_tests.enigma_tests.enigma_tests import TestEnigmaCore
+from tests.enigma_core_tests.enigma_tests.test_compiled_enigma import TestCompiledEnigma
+from tests.enigma_core_tests.enigma_tests.test_batch_enigma import TestBatchEnigma
+from tests.enigma_core_tests.scrambler_tests.stepping_tests.test_stepping_schedule import TestSteppingSchedule
+from tests.enigma_core_tests.enigma_tests.test_enigma_seek import TestEnigmaSeek
+from tests.enigma_core_tests.enigma_tests.test_enigma_snapshot import TestEnigmaSnapshot
+from tests.enigma_core_tests.enigma_tests.test_enigma_profiler import TestEnigmaProfiler
+from tests.enigma_core_tests.scrambler_tests.permutation_tables_tests.test_permutation_tables import TestPermutationTables
@@ -1 +1,6 @@
-from tests.enigma_core_tests.test_enigma_core import *
\ No newline at end of file
+from tests.enigma_core_tests.test_enigma_core import *
+from tests.turing_bombe_tests.test_register_engine import TestRegisterEngine
+from tests.turing_bombe_tests.test_turing_bombe import TestTuringBombe
+from tests.turing_bombe_tests.test_bombe_log import TestBombeLog
+from tests.turing_bombe_tests.test_bombe_progress import TestBombeProgress
+from tests.turing_bombe_tests.test_turing_bombe_cli import TestTuringBombeCli
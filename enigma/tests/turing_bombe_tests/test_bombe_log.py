@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import unittest
+from turing_bombe.bombe_log import HEADER_SIZE, LETTERS, RECORD, BombeLog, read_binary_log
+from turing_bombe.turing_bombe import TuringBombe
+
+PERMUTATION = "UKW-B_III_II_I"
+
+STOPS_LOG = "UKW-B_III_II_I AAW AC BD EG FH IK NP WW XX YY \n"
+
+REGISTERS_LOG = """UKW-B_III_II_I AAW
+Test Register E: Test Wire G
+  ABCDEFGHIJ_LM_OPQRST__WXY_
+  ABCDEFGHIJKLMNOPQRSTUVWXYZ
+A --|-----------------------=
+B --------------------------=
+C --------------------------=
+D -|------------------------=
+E ------|-------------------=
+F -------|------------------=
+G ----|---------------------=
+H -----|--------------------=
+I ----------|---------------=
+J --------------------------=
+K --------------------------
+L --------------------------=
+M --------------------------=
+N --------------------------
+O --------------------------=
+P -------------|------------=
+Q --------------------------=
+R --------------------------=
+S --------------------------=
+T --------------------------=
+U --------------------------
+V --------------------------
+W ----------------------|---=
+X -----------------------|--=
+Y ------------------------|-=
+Z --------------------------
+
+"""
+
+
+class TestBombeLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def stops(self):
+        """
+        Returns a list of (stop, registers) tuples.
+        """
+        stops = []
+        for position, wire, pairs in (("AAW", "G", [("A","C"),("E","G")]),
+                                      ("LKT", "M", [("E","M"),("P","U")]),
+                                      ("ZZZ", "A", [("A","A")])):
+            registers = [0]*26
+            for c1, c2 in pairs:
+                registers[LETTERS.index(c1)] |= 1 << LETTERS.index(c2)
+                registers[LETTERS.index(c2)] |= 1 << LETTERS.index(c1)
+            stop = {
+                "permutation":PERMUTATION,
+                "position":position,
+                "settings":{"RS":position[0],"RM":position[1],"RF":position[2]},
+                "test_wire":wire,
+                "stecker_pairs":pairs
+            }
+            stops.append((stop, registers))
+        return stops
+
+    def test_text_layout(self):
+        """
+        Tests the text logs of a stop keep the stops log and registers log
+        layout of the bombe.
+        """
+        bombe = TuringBombe("WEATHERFORECASTBISCAY", "YHXBDYCWCJAQPBLMHMBGP", PERMUTATION, "E",
+                            log_directory=self.directory)
+        bombe.solve_range(20, 30, False)
+        with open(os.path.join(self.directory, f"{PERMUTATION}_stops.log")) as f:
+            self.assertEqual(f.read(), STOPS_LOG)
+        with open(os.path.join(self.directory, f"{PERMUTATION}_registers.log")) as f:
+            self.assertEqual(f.read(), REGISTERS_LOG)
+
+    def test_binary_round_trip(self):
+        """
+        Tests stops written to a binary log by two logs appending to one file
+        are read back with one header.
+        """
+        stops = self.stops()
+        # two logs appending to one file, the header is written once.
+        for part in (stops[:2], stops[2:]):
+            with BombeLog(PERMUTATION, self.directory, "binary") as log:
+                for stop, registers in part:
+                    log.write_stop(stop, registers)
+
+        path = os.path.join(self.directory, f"{PERMUTATION}_stops.bin")
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE + len(stops) * RECORD.size)
+        records = list(read_binary_log(path))
+        self.assertEqual(len(records), len(stops))
+        for (position, wire, registers), (stop, expected) in zip(records, stops):
+            rs, rm, rf = (LETTERS.index(c) for c in stop["position"])
+            self.assertEqual(position, rs*676 + rm*26 + rf)
+            self.assertEqual(LETTERS[wire], stop["test_wire"])
+            self.assertEqual(list(registers), expected)
+
+    def test_read_binary_log_invalid(self):
+        """
+        This is a failing test for reading a file that is not a binary stop
+        log.
+        """
+        path = os.path.join(self.directory, "not_a_log.bin")
+        with open(path, 'wb') as f:
+            f.write(b"\0" * HEADER_SIZE)
+        with self.assertRaises(ValueError):
+            list(read_binary_log(path))
+
+    def test_jsonl(self):
+        """
+        Tests each stop is written as one JSON line with its register masks.
+        """
+        stops = self.stops()
+        with BombeLog(PERMUTATION, self.directory, "jsonl") as log:
+            for stop, registers in stops:
+                log.write_stop(stop, registers)
+
+        with open(os.path.join(self.directory, f"{PERMUTATION}_stops.jsonl")) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), len(stops))
+        for record, (stop, registers) in zip(records, stops):
+            self.assertEqual(record["position"], stop["position"])
+            self.assertEqual(record["test_wire"], stop["test_wire"])
+            self.assertEqual([tuple(pair) for pair in record["stecker_pairs"]], stop["stecker_pairs"])
+            self.assertEqual(record["registers"], registers)
+
+    def test_buffering(self):
+        """
+        Tests records are buffered until the log is flushed.
+        """
+        stop, registers = self.stops()[0]
+        log = BombeLog(PERMUTATION, self.directory, "binary")
+        log.write_stop(stop, registers)
+        path = log.path("_stops.bin")
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE)
+        log.flush()
+        self.assertEqual(os.path.getsize(path), HEADER_SIZE + RECORD.size)
+        log.close()
+
+    def test_invalid_format(self):
+        """
+        This is a failing test for an unknown log format.
+        """
+        with self.assertRaises(ValueError):
+            BombeLog(PERMUTATION, self.directory, "csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import unittest
+from unittest import mock
+from turing_bombe.bombe_progress import BombeProgress
+
+
+class TestBombeProgress(unittest.TestCase):
+
+    def make_progress(self, clock, total=1000, interval=1.0):
+        """
+        Takes a list of the perf_counter values. Returns a BombeProgress
+        writing to a string stream with its start time the first value.
+        """
+        self.clock = clock
+        with mock.patch("turing_bombe.bombe_progress.time.perf_counter", side_effect=self.next_time):
+            return BombeProgress(total, interval, io.StringIO())
+
+    def next_time(self):
+        """
+        Returns the next perf_counter value.
+        """
+        return self.clock.pop(0)
+
+    def update(self, progress, positions):
+        """
+        Takes a BombeProgress and a list of position counts. Updates the
+        progress with each count.
+        """
+        with mock.patch("turing_bombe.bombe_progress.time.perf_counter", side_effect=self.next_time):
+            for n in positions:
+                progress.update(n)
+
+    def test_throttling(self):
+        """
+        Tests a progress line is written at most once every interval seconds.
+        """
+        progress = self.make_progress([100.0])
+        # updates at 100.2, 100.5 and 100.9 are inside the first second. The
+        # update at 101.0 writes a line, reading the clock again, and the next
+        # line is due at 102.0.
+        self.clock.extend([100.2, 100.5, 100.9, 101.0, 101.0, 101.5, 101.9, 102.0, 102.0])
+        self.update(progress, [100, 100, 100, 100, 100, 100, 100])
+        lines = progress.stream.getvalue().splitlines()
+        self.assertEqual(lines, [
+            "400/1000 positions 400 positions/s ETA 0:00:01",
+            "700/1000 positions 350 positions/s ETA 0:00:00"
+        ])
+        self.assertEqual(self.clock, [])
+
+    def test_finish(self):
+        """
+        Tests finish writes the final line even inside the interval.
+        """
+        progress = self.make_progress([0.0], total=500)
+        self.clock.extend([0.5])
+        self.update(progress, [500])
+        self.assertEqual(progress.stream.getvalue(), "")
+        self.clock.extend([2.0])
+        with mock.patch("turing_bombe.bombe_progress.time.perf_counter", side_effect=self.next_time):
+            progress.finish()
+        self.assertEqual(progress.stream.getvalue(), "500/500 positions 250 positions/s ETA 0:00:00\n")
+
+    def test_line(self):
+        """
+        Tests the rate and ETA of the progress line.
+        """
+        progress = self.make_progress([0.0], total=17576*2)
+        progress.done = 7000
+        self.assertEqual(progress.line(10.0), "7000/35152 positions 700 positions/s ETA 0:00:40")
+        progress.done = 0
+        self.assertEqual(progress.line(0.0), "0/35152 positions 0 positions/s ETA 0:00:00")
+        progress.done = 1
+        self.assertEqual(progress.line(1.0), "1/35152 positions 1 positions/s ETA 9:45:51")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import random
+import unittest
+from enigma_core.scrambler.permutation_tables.permutation_tables import make_table
+from turing_bombe.register_engine import FULL_REGISTER, LETTERS, RegisterEngine
+
+PLAIN_TEXT = "WEATHERFORECASTBISCAY"
+CIPHER_TEXT = "YHXBDYCWCJAQPBLMHMBGP"
+
+
+def reference_check_stop(plain_text, cipher_text, scramblers, test_register):
+    """
+    Takes a crib, the scramblers as lists of output letters and a test
+    register letter. Returns the stop test wire and stecker pairs or None
+    with the recursive register tracing the bombe used before the register
+    engine.
+    """
+    menu = sorted(set(plain_text + cipher_text))
+    cables = {c: [] for c in menu}
+    for i, (p, c) in enumerate(zip(plain_text, cipher_text)):
+        cables[p].append((i, c))
+        cables[c].append((i, p))
+
+    def trace(registers, cable, wire, wires):
+        wires.append(f"{cable}{wire}")
+        registers[cable][LETTERS.index(wire)] = True
+        for position, conn_cable in cables[cable]:
+            conn_wire = scramblers[position][wire]
+            if f"{conn_cable}{conn_wire}" not in wires:
+                trace(registers, conn_cable, conn_wire, wires)
+
+    def registers_for(wire):
+        registers = {l: [False]*26 for l in LETTERS}
+        trace(registers, test_register, wire, [])
+        return registers
+
+    def pairs(registers):
+        found = set()
+        for c1 in menu:
+            if True in registers[c1]:
+                found.add(tuple(sorted((c1, LETTERS[registers[c1].index(True)]))))
+        return sorted(found)
+
+    if registers_for("A")[test_register].count(True) == 26:
+        return None
+    for l in LETTERS:
+        registers = registers_for(l)
+        if registers[test_register].count(True) == 25:
+            for c in menu:
+                registers[c] = [not b for b in registers[c]]
+        if registers[test_register].count(True) != 1:
+            continue
+        if any(registers[c].count(True) > 1 for c in menu):
+            continue
+        steckers = {}
+        contradiction = False
+        for c1 in menu:
+            if True in registers[c1]:
+                c2 = LETTERS[registers[c1].index(True)]
+                if steckers.get(c1, c2) != c2 or steckers.get(c2, c1) != c1:
+                    contradiction = True
+                steckers[c1] = c2
+                steckers[c2] = c1
+        found = pairs(registers)
+        consecutive = any(abs(ord(c1) - ord(c2)) in (1, 25) for c1, c2 in found)
+        if not contradiction and not consecutive:
+            return l, found
+    return None
+
+
+class TestRegisterEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = make_table("WEHRMACHT", "UKW-B", ("III", "II", "I"))
+
+    def setUp(self):
+        self.engine = RegisterEngine(PLAIN_TEXT, CIPHER_TEXT)
+
+    def scramblers(self, rs, rm, rf):
+        """
+        Takes the RS, RM and RF offsets of a bombe position. Returns the
+        scrambler for each crib position.
+        """
+        rows = []
+        for position in range(len(PLAIN_TEXT)):
+            start = (rs*676 + rm*26 + (rf + position) % 26) * 26
+            rows.append(self.table[start:start + 26])
+        return rows
+
+    def registers(self, pairs):
+        """
+        Takes a list of letter pairs. Returns register masks with each letter
+        register lit on the other letter wire.
+        """
+        registers = [0]*26
+        for c1, c2 in pairs:
+            registers[LETTERS.index(c1)] |= 1 << LETTERS.index(c2)
+            registers[LETTERS.index(c2)] |= 1 << LETTERS.index(c1)
+        return registers
+
+    def test_menu(self):
+        """
+        Tests the menu holds each crib letter and each crib position joins
+        its plain text and cipher text letters.
+        """
+        self.assertEqual(self.engine.menu, sorted(LETTERS.index(c) for c in set(PLAIN_TEXT + CIPHER_TEXT)))
+        # each crib position joins both its letters.
+        for cable, connections in enumerate(self.engine.connections):
+            for position, conn_cable in connections:
+                pair = {PLAIN_TEXT[position], CIPHER_TEXT[position]}
+                self.assertEqual(pair, {LETTERS[cable], LETTERS[conn_cable]})
+
+    def test_propagate(self):
+        """
+        Tests a signal on any lit wire lights the same registers, as the
+        scramblers are reciprocal.
+        """
+        scramblers = self.scramblers(0, 0, 22)
+        registers = self.engine.propagate(scramblers, LETTERS.index("E"), LETTERS.index("G"))
+        # every lit wire is reached back through the reciprocal scramblers.
+        for cable in range(26):
+            for wire in range(26):
+                if registers[cable] >> wire & 1:
+                    self.assertEqual(self.engine.propagate(scramblers, cable, wire), registers)
+
+    def test_check_stop(self):
+        """
+        Tests the two stops of the WEATHERFORECASTBISCAY crib give the test
+        wire and stecker pairs of the recursive bombe.
+        """
+        stop = self.engine.check_stop(self.scramblers(0, 0, 22), LETTERS.index("E"))
+        self.assertIsNotNone(stop)
+        wire, registers = stop
+        self.assertEqual(LETTERS[wire], "G")
+        self.assertEqual(registers[LETTERS.index("E")], 1 << LETTERS.index("G"))
+        self.assertEqual(self.engine.stecker_pairs(registers), [
+            ("A","C"),("B","D"),("E","G"),("F","H"),("I","K"),("N","P"),("W","W"),("X","X"),("Y","Y")
+        ])
+
+        stop = self.engine.check_stop(self.scramblers(11, 10, 19), LETTERS.index("E"))
+        wire, registers = stop
+        self.assertEqual(LETTERS[wire], "M")
+        self.assertEqual(self.engine.stecker_pairs(registers), [
+            ("A","V"),("D","Z"),("E","M"),("F","W"),("G","S"),("H","Q"),("I","L"),("J","Y"),("K","X"),("P","U")
+        ])
+
+    def test_check_stop_no_stop(self):
+        """
+        Tests positions around the first stop are not stops.
+        """
+        for rf in (0, 1, 2, 21, 23):
+            self.assertIsNone(self.engine.check_stop(self.scramblers(0, 0, rf), LETTERS.index("E")))
+
+    def test_stecker_pairs(self):
+        """
+        Tests the stecker pairs are taken from the lowest live wire of each
+        menu register.
+        """
+        registers = self.registers([("E","G"),("A","C"),("Y","Y")])
+        self.assertEqual(self.engine.stecker_pairs(registers), [("A","C"),("E","G"),("Y","Y")])
+        # the lowest live wire of each menu register is its stecker partner.
+        registers[LETTERS.index("T")] = 1 << LETTERS.index("B") | 1 << LETTERS.index("D")
+        self.assertIn(("B","T"), self.engine.stecker_pairs(registers))
+        # registers that are not menu letters are ignored.
+        registers = [0]*26
+        registers[LETTERS.index("Z")] = 1 << LETTERS.index("N")
+        self.assertEqual(self.engine.stecker_pairs(registers), [])
+
+    def test_no_consecutive_steckers(self):
+        """
+        Tests stecker pairs of consecutive letters, Z and A included, are
+        rejected.
+        """
+        self.assertTrue(self.engine.no_consecutive_steckers(self.registers([("A","C"),("E","G")])))
+        self.assertTrue(self.engine.no_consecutive_steckers(self.registers([("W","W")])))
+        self.assertFalse(self.engine.no_consecutive_steckers(self.registers([("A","B")])))
+        self.assertFalse(self.engine.no_consecutive_steckers(self.registers([("E","D")])))
+        self.assertFalse(self.engine.no_consecutive_steckers(self.registers([("Z","A")])))
+
+    def test_valid_registers_and_contradictions(self):
+        """
+        Tests menu registers with more than one live wire and letters
+        steckered to two letters are rejected.
+        """
+        registers = self.registers([("A","C"),("E","G")])
+        self.assertTrue(self.engine.valid_registers(registers))
+        self.assertTrue(self.engine.no_contradictions(registers))
+        registers[LETTERS.index("A")] = FULL_REGISTER
+        self.assertFalse(self.engine.valid_registers(registers))
+        registers = self.registers([("A","C")])
+        registers[LETTERS.index("C")] = 1 << LETTERS.index("E")
+        self.assertFalse(self.engine.no_contradictions(registers))
+
+    def test_random_cribs_match_reference(self):
+        """
+        Tests check_stop gives the same stops as the recursive register
+        tracing for random cribs and positions.
+        """
+        rng = random.Random(1942)
+        checked = 0
+        while checked < 8:
+            plain_text = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(8, 16)))
+            cipher_text = ''.join(rng.choice([l for l in LETTERS if l != p]) for p in plain_text)
+            engine = RegisterEngine(plain_text, cipher_text)
+            test_register = plain_text[0]
+            for _ in range(40):
+                rs, rm, rf = (rng.randrange(26) for _ in range(3))
+                rows = []
+                for position in range(len(plain_text)):
+                    start = (rs*676 + rm*26 + (rf + position) % 26) * 26
+                    rows.append(self.table[start:start + 26])
+                letter_rows = [{LETTERS[i]: LETTERS[o] for i, o in enumerate(row)} for row in rows]
+
+                expected = reference_check_stop(plain_text, cipher_text, letter_rows, test_register)
+                stop = engine.check_stop(rows, LETTERS.index(test_register))
+                if stop is not None:
+                    stop = (LETTERS[stop[0]], engine.stecker_pairs(stop[1]))
+                self.assertEqual(stop, expected)
+            checked += 1
+
+
+if __name__ == '__main__':
+    unittest.main()
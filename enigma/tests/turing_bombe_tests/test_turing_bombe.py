@@ -0,0 +1,154 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from enigma_core.scrambler.permutation_tables.permutation_tables import generate_table
+from turing_bombe.bombe_progress import BombeProgress
+from turing_bombe.turing_bombe import TuringBombe, solve_positions
+
+PLAIN_TEXT = "WEATHERFORECASTBISCAY"
+CIPHER_TEXT = "YHXBDYCWCJAQPBLMHMBGP"
+
+
+class TestTuringBombe(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def make_bombe(self, test_register="E", plain_text=PLAIN_TEXT, cipher_text=CIPHER_TEXT):
+        """
+        Returns a bombe for the UKW-B_III_II_I permutation with the crib and
+        test register provided or the WEATHERFORECASTBISCAY crib.
+        """
+        return TuringBombe(plain_text, cipher_text, "UKW-B_III_II_I", test_register)
+
+    def test_solve_stops(self):
+        """
+        Tests the full run of the WEATHERFORECASTBISCAY crib gives its two
+        stops and logs them.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            stops = self.make_bombe().solve()
+        self.assertEqual([(stop["settings"], stop["stecker_pairs"]) for stop in stops], [
+            ({"RS":"A","RM":"A","RF":"W"},
+             [("A","C"),("B","D"),("E","G"),("F","H"),("I","K"),("N","P"),("W","W"),("X","X"),("Y","Y")]),
+            ({"RS":"L","RM":"K","RF":"T"},
+             [("A","V"),("D","Z"),("E","M"),("F","W"),("G","S"),("H","Q"),("I","L"),("J","Y"),("K","X"),("P","U")])
+        ])
+        with open(os.path.join("bombe_logs", "UKW-B_III_II_I_stops.log")) as f:
+            self.assertEqual(f.read(), ("UKW-B_III_II_I AAW AC BD EG FH IK NP WW XX YY \n"
+                                        "UKW-B_III_II_I LKT AV DZ EM FW GS HQ IL JY KX PU \n"))
+
+    def test_solve_range(self):
+        """
+        Tests a range starting part way through the RF positions, which
+        rewires the scramblers at the start and at the RF wrap, gives the
+        stop in that range.
+        """
+        stops = self.make_bombe().solve_range(20, 60, False)
+        self.assertEqual([stop["settings"] for stop in stops], [{"RS":"A","RM":"A","RF":"W"}])
+
+    def test_solve_positions(self):
+        """
+        Tests the process pool task returns the permutation, the number of
+        positions tested and the stops of its range.
+        """
+        task = (PLAIN_TEXT, CIPHER_TEXT, "UKW-B_III_II_I", "E", 7714, 7716, None, "bombe_logs", "text")
+        permutation, positions, stops = solve_positions(task)
+        self.assertEqual((permutation, positions), ("UKW-B_III_II_I", 2))
+        self.assertEqual([stop["settings"] for stop in stops], [{"RS":"L","RM":"K","RF":"T"}])
+
+    def test_json_stream(self):
+        """
+        Tests each stop is written to the JSON stream as one JSON line with
+        the permutation, position, rotor settings, test wire and stecker
+        pairs, and that the progress counts every position.
+        """
+        stream = io.StringIO()
+        progress = BombeProgress(40, stream=io.StringIO())
+        stops = self.make_bombe().solve_range(20, 60, False, progress, stream)
+        self.assertEqual(progress.done, 40)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0]), {
+            "permutation":"UKW-B_III_II_I",
+            "position":"AAW",
+            "settings":{"RS":"A","RM":"A","RF":"W"},
+            "test_wire":"G",
+            "stecker_pairs":[["A","C"],["B","D"],["E","G"],["F","H"],["I","K"],["N","P"],["W","W"],["X","X"],["Y","Y"]]
+        })
+        self.assertEqual(json.loads(lines[0])["position"], stops[0]["position"])
+
+    def test_table_directory(self):
+        """
+        Tests a bombe reading its scramblers from a mapped permutation table
+        gives the same stops and closes the table at the end of each range.
+        """
+        os.mkdir("tables")
+        generate_table("WEHRMACHT", "UKW-B", ("III", "II", "I"), "tables")
+        bombe = TuringBombe(PLAIN_TEXT, CIPHER_TEXT, "UKW-B_III_II_I", "E", "tables")
+        table = bombe._permutation_table
+        self.assertIsNotNone(table)
+        stops = bombe.solve_range(20, 30, False)
+        self.assertEqual([stop["settings"] for stop in stops], [{"RS":"A","RM":"A","RF":"W"}])
+        # the mapped table is closed at the end of the range and mapped
+        # again by the next range.
+        self.assertTrue(table._mmap.closed)
+        self.assertIsNone(bombe._permutation_table)
+        stops = bombe.solve_range(7714, 7716, False)
+        self.assertEqual([stop["settings"]["RF"] for stop in stops], ["W", "T"])
+        self.assertIsNone(bombe._permutation_table)
+
+    def test_table_cache(self):
+        """
+        Tests bombes for the same permutation share the table made in memory
+        and bombes for another permutation do not.
+        """
+        b1 = self.make_bombe()
+        b2 = self.make_bombe()
+        b3 = TuringBombe(PLAIN_TEXT, CIPHER_TEXT, "UKW-C_III_II_I", "E")
+        self.assertIs(b1._table, b2._table)
+        self.assertIsNot(b1._table, b3._table)
+        self.assertEqual(b1.solve_range(20, 30, False), b2.solve_range(20, 30, False))
+
+    def test_lower_case_crib(self):
+        """
+        Tests a lower case crib and test register give the same stops as the
+        upper case crib.
+        """
+        stops = self.make_bombe("e", PLAIN_TEXT.lower(), CIPHER_TEXT.lower()).solve_range(0, 26, False)
+        self.assertEqual([stop["settings"] for stop in stops], [{"RS":"A","RM":"A","RF":"W"}])
+
+    def test_test_register_not_in_menu(self):
+        """
+        This is a failing test for a test register that is not a letter of
+        the crib.
+        """
+        with self.assertRaises(Exception):
+            self.make_bombe("Z")
+        with self.assertRaises(Exception):
+            self.make_bombe("1")
+
+    def test_invalid_crib(self):
+        """
+        This is a failing test for cribs of different lengths, with letters
+        that are not A-Z or with the same letter at an index of both texts.
+        """
+        with self.assertRaises(Exception):
+            self.make_bombe(cipher_text=CIPHER_TEXT[:-1])
+        with self.assertRaises(Exception):
+            self.make_bombe(cipher_text=CIPHER_TEXT[:-1] + "1")
+        with self.assertRaises(Exception):
+            self.make_bombe(cipher_text=PLAIN_TEXT[0] + CIPHER_TEXT[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
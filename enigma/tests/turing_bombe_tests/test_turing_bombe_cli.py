@@ -0,0 +1,80 @@
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from enigma_cli.turing_bombe_cli.turing_bombe_cli import TuringBombeCli
+
+PLAIN_TEXT = "WEATHERFORECASTBISCAY"
+CIPHER_TEXT = "YHXBDYCWCJAQPBLMHMBGP"
+PERMUTATIONS = ["UKW-B_III_II_I", "UKW-C_III_II_I"]
+
+
+class TestTuringBombeCli(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Runs the serial quiet run once. It is solve_range(0, 17576) for each
+        permutation in turn.
+        """
+        cls.tmp = tempfile.TemporaryDirectory()
+        cli = cls.make_cli(1, True)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            cls.serial_stops = cli._solve_quiet(PLAIN_TEXT, CIPHER_TEXT, PERMUTATIONS, "E")
+        cls.serial_lines = stdout.getvalue().splitlines()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    @classmethod
+    def make_cli(cls, workers, quiet):
+        """
+        Returns a turing bombe command with the number of workers and quiet
+        flag provided, logging to a temporary directory.
+        """
+        cli = TuringBombeCli(argparse.ArgumentParser())
+        cli._workers = workers
+        cli._quiet = quiet
+        cli._log_directory = cls.tmp.name
+        return cli
+
+    def solve_parallel(self, quiet):
+        """
+        Takes the quiet flag. Returns the stops and stdout lines of a run
+        with 2 workers.
+        """
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            stops = self.make_cli(2, quiet)._solve_parallel(PLAIN_TEXT, CIPHER_TEXT, PERMUTATIONS, "E")
+        return stops, stdout.getvalue().splitlines()
+
+    def test_solve_parallel(self):
+        """
+        Tests the stops of a run with 2 workers over two permutations are the
+        stops of the serial run, in the same order, and are printed in the
+        stops log layout.
+        """
+        stops, lines = self.solve_parallel(False)
+        self.assertEqual(len(self.serial_stops), 5)
+        self.assertEqual(stops, self.serial_stops)
+        self.assertEqual(lines, [f"{stop['permutation']} {stop['position']} "
+                                 + ' '.join(f"{c1}{c2}" for c1, c2 in stop["stecker_pairs"])
+                                 for stop in self.serial_stops])
+
+    def test_quiet_lines(self):
+        """
+        Tests the serial and the 2 worker quiet runs write the same JSON line
+        stops to stdout.
+        """
+        stops, lines = self.solve_parallel(True)
+        self.assertEqual(lines, self.serial_lines)
+        self.assertEqual([json.loads(line)["position"] for line in lines],
+                         [stop["position"] for stop in self.serial_stops])
+
+
+if __name__ == '__main__':
+    unittest.main()
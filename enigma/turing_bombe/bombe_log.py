@@ -0,0 +1,175 @@
+"""
+BOMBE LOG
+
+Stop log writer for one bombe permutation. Log files are opened on the first
+stop and kept open until the log is closed. Records are buffered and written
+with one write call for a whole number of records, so processes appending to
+the same files do not split each others records.
+
+Log formats.
+
+    text    <permutation>_stops.log and <permutation>_registers.log in the
+            bombe log layout.
+    jsonl   <permutation>_stops.jsonl with one JSON line for each stop with
+            the register masks.
+    binary  <permutation>_stops.bin with a HEADER_SIZE byte header of the
+            magic bytes, the format version, the length of the permutation
+            and the permutation, then a RECORD for each stop of the rotor
+            position value RS*676 + RM*26 + RF, the test wire index and the
+            26 register masks.
+"""
+
+import json
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_DIRECTORY = "bombe_logs"
+LOG_FORMATS = ("text", "jsonl", "binary")
+BUFFER_SIZE = 1 << 16
+
+MAGIC = b"BOMBELOG"
+VERSION = 1
+HEADER_SIZE = 64
+RECORD = struct.Struct("<HB26I")
+
+LETTERS = [chr(i) for i in range(65, 91)]
+
+
+def read_binary_log(path: str) -> Iterator[Tuple[int, int, Tuple[int, ...]]]:
+    """
+    Takes the path of a binary stop log. Yields a tuple of the rotor position
+    value, test wire index and register masks for each stop. Raises a
+    ValueError if the file is not a binary stop log.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC or header[len(MAGIC)] != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} binary stop log")
+        while True:
+            record = f.read(RECORD.size)
+            if len(record) < RECORD.size:
+                return
+            position, wire, *registers = RECORD.unpack(record)
+            yield position, wire, tuple(registers)
+
+
+class BombeLog:
+    """
+    Buffered stop log files for one permutation.
+    """
+
+    def __init__(self,
+            permutation: str,
+            directory: str=DEFAULT_DIRECTORY,
+            log_format: str="text",
+            buffer_size: int=BUFFER_SIZE
+        ) -> None:
+        """
+        Takes the permutation, the log directory, the log format and the
+        number of bytes buffered for each file before it is written. Makes the
+        log directory. Raises a ValueError for an unknown log format.
+        """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"{log_format} is not a valid log format. Must be one of {', '.join(LOG_FORMATS)}")
+        self.permutation = permutation
+        self.directory = directory
+        self.log_format = log_format
+        self.buffer_size = buffer_size
+        self._files: Dict[str, int] = {}
+        self._buffers: Dict[str, List[bytes]] = {}
+        self._sizes: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self) -> "BombeLog":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_stop(self, stop: Dict, registers: List[int], registers_str: Optional[str]=None) -> None:
+        """
+        Takes a stop dictionary, the register masks and for the text format
+        the registers layout string. Buffers the stop records.
+        """
+        if self.log_format == "text":
+            steckers = ''.join(f"{c1}{c2} " for c1, c2 in stop["stecker_pairs"])
+            self._write("_stops.log", f"{self.permutation} {stop['position']} {steckers}\n".encode())
+            self._write("_registers.log",
+                        f"{self.permutation} {stop['position']}\n{registers_str}\n".encode())
+        elif self.log_format == "jsonl":
+            record = dict(stop, registers=list(registers))
+            self._write("_stops.jsonl", (json.dumps(record, separators=(',', ':')) + "\n").encode())
+        else:
+            rs, rm, rf = (LETTERS.index(c) for c in stop["position"])
+            wire = LETTERS.index(stop["test_wire"])
+            self._write("_stops.bin", RECORD.pack(rs*676 + rm*26 + rf, wire, *registers))
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records of every file.
+        """
+        for suffix in self._buffers:
+            self._flush(suffix)
+
+    def close(self) -> None:
+        """
+        Writes the buffered records and closes the files. Files are opened
+        again by the next stop.
+        """
+        self.flush()
+        for fd in self._files.values():
+            os.close(fd)
+        self._files = {}
+        self._buffers = {}
+        self._sizes = {}
+
+    def path(self, suffix: str) -> str:
+        """
+        Takes a log file suffix and returns the log file path.
+        """
+        return os.path.join(self.directory, f"{self.permutation}{suffix}")
+
+    def _write(self, suffix: str, record: bytes) -> None:
+        """
+        Takes a log file suffix and the bytes of one record. Buffers the
+        record, writing the buffer when it is full.
+        """
+        if suffix not in self._files:
+            self._open(suffix)
+        self._buffers[suffix].append(record)
+        self._sizes[suffix] += len(record)
+        if self._sizes[suffix] >= self.buffer_size:
+            self._flush(suffix)
+
+    def _flush(self, suffix: str) -> None:
+        """
+        Takes a log file suffix and writes its buffered records with one
+        write call.
+        """
+        if self._buffers[suffix]:
+            os.write(self._files[suffix], b''.join(self._buffers[suffix]))
+            self._buffers[suffix] = []
+            self._sizes[suffix] = 0
+
+    def _open(self, suffix: str) -> None:
+        """
+        Takes a log file suffix and opens the file for appending. A new binary
+        log gets its header, only the process that makes the file writes it.
+        """
+        path = self.path(suffix)
+        flags = os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+        if suffix == "_stops.bin":
+            try:
+                fd = os.open(path, flags | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                fd = os.open(path, flags)
+            else:
+                key = self.permutation.encode('ascii')
+                header = MAGIC + bytes([VERSION, len(key)]) + key
+                os.write(fd, header + bytes(HEADER_SIZE - len(header)))
+        else:
+            fd = os.open(path, flags | os.O_CREAT, 0o644)
+        self._files[suffix] = fd
+        self._buffers[suffix] = []
+        self._sizes[suffix] = 0
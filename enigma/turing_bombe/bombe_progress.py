@@ -0,0 +1,74 @@
+"""
+BOMBE PROGRESS
+
+Periodic progress line for quiet bombe runs. The number of positions done,
+the rate in positions per second and the estimated time to the end of the
+run are written at most once every interval seconds, so the progress output
+does not limit the run.
+"""
+
+import sys
+import time
+from typing import Optional, TextIO
+
+PROGRESS_INTERVAL = 1.0
+
+
+class BombeProgress:
+    """
+    Positions done, rate and ETA for one bombe run.
+    """
+
+    def __init__(self, total: int, interval: float=PROGRESS_INTERVAL, stream: Optional[TextIO]=None) -> None:
+        """
+        Takes the total number of positions of the run, the seconds between
+        progress lines and the stream to write them to, stderr if None.
+        """
+        self.total = total
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.done = 0
+        self._start = time.perf_counter()
+        self._next = self._start + interval
+
+    def update(self, positions: int=1) -> None:
+        """
+        Takes a number of positions done and writes a progress line if the
+        interval has passed since the last one.
+        """
+        self.done += positions
+        if time.perf_counter() >= self._next:
+            self.write()
+
+    def finish(self) -> None:
+        """
+        Writes the final progress line.
+        """
+        self.write()
+
+    def write(self) -> None:
+        """
+        Writes a progress line and sets the time of the next one.
+        """
+        now = time.perf_counter()
+        self._next = now + self.interval
+        self.stream.write(self.line(now - self._start) + "\n")
+        self.stream.flush()
+
+    def rate(self, seconds: float) -> float:
+        """
+        Takes the seconds since the run started and returns the positions per
+        second.
+        """
+        return self.done / seconds if seconds > 0 else 0.0
+
+    def line(self, seconds: float) -> str:
+        """
+        Takes the seconds since the run started and returns the progress line.
+        """
+        rate = self.rate(seconds)
+        eta = (self.total - self.done) / rate if rate else 0.0
+        minutes, secs = divmod(int(eta), 60)
+        hours, minutes = divmod(minutes, 60)
+        return (f"{self.done}/{self.total} positions {rate:.0f} positions/s "
+                f"ETA {hours}:{minutes:02}:{secs:02}")
@@ -0,0 +1,176 @@
+"""
+REGISTER ENGINE
+
+Register and signal propagation core of the Turing bombe.
+
+The menu joins the cables of the crib letters with a scrambler at each crib
+position. Each of the 26 cables has a register of 26 wires, held as a 26 bit
+integer mask where bit i is wire i. Sending a signal on a wire of the test
+register lights every (cable, wire) reached through the scramblers, and
+through the diagonal board when it is used.
+
+Propagation uses a worklist of (cable, wire) pairs instead of recursion. The
+register masks are also the bitset of visited (cable, wire) pairs, a pair is
+added to the worklist only when its bit is first set.
+
+Scramblers are given for each test as a sequence indexed by crib position of
+lists of the output index for each input index.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+LETTERS = [chr(i) for i in range(65, 91)]
+
+FULL_REGISTER = (1 << 26) - 1
+
+Scramblers = Sequence[Sequence[int]]
+
+
+def wire_count(register: int) -> int:
+    """
+    Takes a register mask and returns the number of live wires.
+    """
+    return bin(register).count("1")
+
+
+def lowest_wire(register: int) -> int:
+    """
+    Takes a register mask with at least one live wire and returns the index
+    of the lowest live wire.
+    """
+    return (register & -register).bit_length() - 1
+
+
+class RegisterEngine:
+    """
+    Menu, register masks and stop test for one crib.
+    """
+
+    def __init__(self, plain_text: str, cipher_text: str, diagonal_board: bool=False) -> None:
+        """
+        Takes the plain text and cipher text of an upper case A-Z crib and the
+        diagonal board flag. Wires the menu.
+        """
+        self.diagonal_board = diagonal_board
+        self.menu = sorted(set(LETTERS.index(c) for c in plain_text + cipher_text))
+        self.menu_mask = 0
+        for cable in self.menu:
+            self.menu_mask |= 1 << cable
+
+        # (position, connected cable) for each scrambler joined to a cable.
+        self.connections: List[List[Tuple[int, int]]] = [[] for _ in range(26)]
+        for position, (p, c) in enumerate(zip(plain_text, cipher_text)):
+            p, c = LETTERS.index(p), LETTERS.index(c)
+            self.connections[p].append((position, c))
+            self.connections[c].append((position, p))
+
+    def propagate(self, scramblers: Scramblers, cable: int, wire: int) -> List[int]:
+        """
+        Takes the scramblers, a cable index and a wire index. Returns the list
+        of 26 register masks after sending a signal on that wire.
+        """
+        connections = self.connections
+        diagonal_board = self.diagonal_board
+        menu_mask = self.menu_mask
+
+        registers = [0]*26
+        registers[cable] = 1 << wire
+        worklist = [(cable, wire)]
+        while worklist:
+            cable, wire = worklist.pop()
+            if (diagonal_board and cable != wire and menu_mask >> wire & 1
+                    and not registers[wire] >> cable & 1):
+                registers[wire] |= 1 << cable
+                worklist.append((wire, cable))
+            for position, conn_cable in connections[cable]:
+                conn_wire = scramblers[position][wire]
+                bit = 1 << conn_wire
+                if not registers[conn_cable] & bit:
+                    registers[conn_cable] |= bit
+                    worklist.append((conn_cable, conn_wire))
+        return registers
+
+    def check_stop(self, scramblers: Scramblers, test_register: int) -> Optional[Tuple[int, List[int]]]:
+        """
+        Takes the scramblers and the test register cable index. Returns a
+        tuple of the test wire and the register masks for a stop or None.
+        A stop is a test wire leaving one live wire in the test register, or
+        25 with the menu registers inverted, with at most one live wire in
+        each menu register, no contradicting stecker pairs and no stecker
+        pairs of consecutive letters.
+        """
+        # the scramblers are reciprocal so every connection works both ways
+        # and a signal on any wire lit by an earlier test wire lights the
+        # same registers, propagate once for each set of test register wires.
+        closures: List[Optional[List[int]]] = [None]*26
+        for wire in range(26):
+            registers = closures[wire]
+            if registers is None:
+                registers = self.propagate(scramblers, test_register, wire)
+                lit = registers[test_register]
+                while lit:
+                    closures[lowest_wire(lit)] = registers
+                    lit &= lit - 1
+            if registers[test_register] == FULL_REGISTER:
+                return None
+
+            registers = list(registers)
+            if wire_count(registers[test_register]) == 25:
+                for cable in self.menu:
+                    registers[cable] ^= FULL_REGISTER
+            if (wire_count(registers[test_register]) == 1
+                    and self.valid_registers(registers)
+                    and self.no_contradictions(registers)
+                    and self.no_consecutive_steckers(registers)):
+                return wire, registers
+        return None
+
+    def valid_registers(self, registers: List[int]) -> bool:
+        """
+        Takes the register masks and returns True if every menu register has
+        0 or 1 live wires.
+        """
+        for cable in self.menu:
+            register = registers[cable]
+            if register & (register - 1):
+                return False
+        return True
+
+    def no_contradictions(self, registers: List[int]) -> bool:
+        """
+        Takes the register masks and returns True if no letter is steckered
+        to two different letters.
+        """
+        pairs = {}
+        for c1 in self.menu:
+            register = registers[c1]
+            if not register:
+                continue
+            c2 = lowest_wire(register)
+            if pairs.get(c1, c2) != c2 or pairs.get(c2, c1) != c1:
+                return False
+            pairs[c1] = c2
+            pairs[c2] = c1
+        return True
+
+    def no_consecutive_steckers(self, registers: List[int]) -> bool:
+        """
+        Takes the register masks and returns True if no stecker pair is two
+        consecutive letters, with Z and A counted as consecutive.
+        """
+        for c1, c2 in self.stecker_pairs(registers):
+            if (ord(c2) - ord(c1)) % 26 in (1, 25):
+                return False
+        return True
+
+    def stecker_pairs(self, registers: List[int]) -> List[Tuple[str, str]]:
+        """
+        Takes the register masks and returns the sorted list of stecker pair
+        tuples from the lowest live wire of each menu register.
+        """
+        pairs = set()
+        for c1 in self.menu:
+            register = registers[c1]
+            if register:
+                pairs.add(tuple(sorted((LETTERS[c1], LETTERS[lowest_wire(register)]))))
+        return sorted(pairs)
@@ -13,61 +13,159 @@ PLAIN TEXT:             WEATHERFORECASTBISCAY
 CIPHER TEXT:            YHXBDYCWCJAQPBLMHMBGP
 
 
-Store bombe log files in directory named bombe_logs
+Store bombe log files in directory named bombe_logs, or the log directory
+given to the bombe.
 
 Log files.
 1. stops log.
 2. registers log.
+
+The logs are written by a BombeLog which keeps the files open for the run and
+buffers the records. The log format is text for the stops and registers
+logs, jsonl or binary.
+
+A quiet run does not print each position. Progress lines of the positions
+done, rate and ETA are written to stderr and each stop is written to stdout
+as a JSON line with the permutation, position, rotor settings, test wire and
+stecker pairs.
 """
 
-from enigma_core.factory import make_machine
+from enigma_core.scrambler.permutation_tables.permutation_tables import PermutationTable, make_table, table_name
 from enigma_core.validators.scrambler_validators import ScramblerValidators, PermutationError
 from enigma_tools.setting_tools.setting_tools import RotorSettings
-from collections import deque
+from turing_bombe.bombe_log import BombeLog, DEFAULT_DIRECTORY
+from turing_bombe.bombe_progress import BombeProgress
+from turing_bombe.register_engine import RegisterEngine
 from pprint import pprint
+import functools
+import json
 import os
+import sys
+
+POSITIONS = 26*26*26
+# tables made in memory kept for reuse, see bombe_table.
+TABLE_CACHE_SIZE = 4
+
+
+def solve_positions(task):
+    """
+    Takes a tuple of the plain text, cipher text, permutation, test register,
+    the first and end rotor position values, the table directory, the log
+    directory and the log format. Solves the positions without printing
+    them. Returns a tuple of the permutation, the number of positions tested
+    and the list of stops. Used as a process pool task.
+    """
+    (plain_text, cipher_text, permutation, test_register, start, stop,
+     table_directory, log_directory, log_format) = task
+    turing_bombe = TuringBombe(plain_text, cipher_text, permutation, test_register,
+                               table_directory, log_directory, log_format)
+    return permutation, stop - start, turing_bombe.solve_range(start, stop, False)
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def bombe_table(reflector, rotors):
+    """
+    Takes a reflector id and a tuple of the RS, RM and RF rotor ids. Returns
+    the permutation table of the bombe rotors made in memory. The tables are
+    cached, so the bombes for the position ranges of one permutation solved
+    in the same process make the table once.
+    """
+    return make_table("WEHRMACHT", reflector, rotors)
+
+
+def stop_json(stop):
+    """
+    Takes a stop dictionary and returns it as a JSON line without the line
+    end.
+    """
+    return json.dumps(stop, separators=(',', ':'))
 
 
 class TuringBombe:
 
     LETTERS = [chr(i) for i in range(65, 91)]
 
-    def __init__(self, plain_text, cipher_text, permutation, test_register):
+    def __init__(self, plain_text, cipher_text, permutation, test_register, table_directory=None,
+                 log_directory=DEFAULT_DIRECTORY, log_format="text"):
         self._plain_text = plain_text
         self._cipher_text = cipher_text
         self._permutation = permutation
         self._test_register = test_register
         self._diagonal_board = False
-        self._cables = None
-        self._registers = {l:[False for i in range(26)] for l in self.LETTERS}
+        self._engine = None
+        self._registers = [0]*26
         self._stops = []
         self._scramblers = None
+        self._table_directory = table_directory
+        self._log_directory = log_directory
+        self._log_format = log_format
+        self._log = None
+        self._permutation_table = None
+        self._table = None
+        self._rows = None
         self._menu_chars = None
         self._bombe_str = None
-        self._machine = make_machine("WEHRMACHT")
         self._rotor_settings_gen = RotorSettings('L', 3)
         self._perm = self._valid_permutation()
+        self._valid_crib()
         self._menu_characters()
         self._initialize_bombe()
         self._initialize_logs()
-        self._valid_crib()
 
-    def solve(self):
+    def solve(self, quiet=False):
+        """
+        Takes a quiet flag. Tests every rotor position of the permutation,
+        printing each position, or with quiet True writing progress lines
+        and JSON line stops. Returns the list of stops.
+        """
+        if not quiet:
+            return self.solve_range(0, POSITIONS)
+
+        progress = BombeProgress(POSITIONS)
+        stops = self.solve_range(0, POSITIONS, False, progress, sys.stdout)
+        progress.finish()
+        return stops
+
+    def solve_range(self, start, stop, verbose=True, progress=None, json_stream=None):
+        """
+        Takes the first and end rotor position values, RS*676 + RM*26 + RF,
+        a verbose flag, a BombeProgress and a stream for JSON line stops.
+        Tests each position in the range, printing it if verbose is True,
+        updating the progress if given and writing each stop to the JSON
+        stream if given. The log files and a memory mapped permutation
+        table are closed at the end of the range. Returns the list of stops.
+        """
+        if self._table is None:
+            self._load_table()
+        try:
+            return self._solve_range(start, stop, verbose, progress, json_stream)
+        finally:
+            self._log.close()
+            self._close_table()
+
+    def _solve_range(self, start, stop, verbose, progress, json_stream):
         """
         
         """
-        while True:
-            # make scramblers
-            self._wire_scramblers()
-            for _ in range(26):
-                self._bombe_str = self._bombe_settings_str()
-                self._check_stop()
-                self._scramblers.rotate(-1)
+        stops = len(self._stops)
+        for value in range(start, stop):
+            self._rotor_settings_gen.value = value
+            if value == start or value % 26 == 0:
+                # make scramblers
+                self._wire_scramblers()
+            # the scrambler at crib position i has RF offset RF + i.
+            rf = value % 26
+            self._scramblers = self._rows[rf:rf + len(self._plain_text)]
+            self._bombe_str = self._bombe_settings_str()
+            self._check_stop()
+            if verbose:
                 print(self._bombe_str)
-                try:
-                    self._rotor_settings_gen.inc()
-                except StopIteration:
-                    return self._stops
+            if progress:
+                progress.update()
+            if json_stream and len(self._stops) > stops:
+                json_stream.write(stop_json(self._stops[-1]) + "\n")
+                stops = len(self._stops)
+        return self._stops
 
     def _valid_crib(self):
         """
@@ -86,7 +184,7 @@ class TuringBombe:
                 err_msg = f"Character {l} in plain text is not valid. Must be A-Z."
                 raise Exception(err_msg)
 
-        for i in self._cipher_text:
+        for l in self._cipher_text:
             if l not in self.LETTERS:
                 err_msg = f"Character {l} in cipher text is not valid. Must be A-Z."
                 raise Exception(err_msg)
@@ -98,6 +196,12 @@ class TuringBombe:
                            f"from the letter in the cipher text at the same index.")
                 raise Exception(err_msg)
 
+        self._test_register = self._test_register.upper()
+        if self._test_register not in self._plain_text + self._cipher_text:
+            err_msg = (f"Test register {self._test_register} is not a menu letter. "
+                       f"The test register must be a letter of the plain text or cipher text.")
+            raise Exception(err_msg)
+
     def _menu_characters(self):
         """
         
@@ -131,249 +235,97 @@ class TuringBombe:
         """
         
         """
-        # initialize enigma machine.
+        # load scrambler permutation table.
         # wire bombe.
-        self._initialize_machine()
+        self._load_table()
         self._wire_bombe()
-        
-    def _initialize_machine(self):
-        """
-        
-        """
-        perm_dict = self._perm[1]
-        settings = {
-            "reflector":perm_dict["REF"],
-            "rotor_types":{
-                "RS":perm_dict["ROT_RS"],
-                "RM":perm_dict["ROT_RM"],
-                "RF":perm_dict["ROT_RF"]
-            },
-            "ring_settings":{"RS":"A","RM":"A","RS":"A"},
-            "turnover_flag":False
-        }
-        self._machine.settings = settings
-        self._set_machine()
 
-    def _set_machine(self):
+    def _load_table(self):
         """
-        
+        Loads the permutation table of the permutation from the table
+        directory if it has been generated there, otherwise takes the table
+        from bombe_table.
+        The bombe rotors have ring setting A so the rotor offsets are the
+        core offsets of the table.
         """
-        rot_settings = self._rotor_settings_gen.settings
-        settings = {
-            "rotor_settings":{
-                "RS":rot_settings["RS"],
-                "RM":rot_settings["RM"],
-                "RF":rot_settings["RF"]
-            }
-        }
-        self._machine.settings = settings
+        perm_dict = self._perm[1]
+        reflector = perm_dict["REF"]
+        rotors = (perm_dict["ROT_RS"], perm_dict["ROT_RM"], perm_dict["ROT_RF"])
 
-    def _wire_bombe(self):
-        """
-        
-        """
-        self._cables = {c:[] for c in self._menu_chars}
+        path = None
+        if self._table_directory:
+            path = os.path.join(self._table_directory, table_name(reflector, rotors))
 
-        for i in range(len(self._plain_text)):
-            p = self._plain_text[i]
-            c = self._cipher_text[i]
-            self._cables[p].append(
-                {
-                    "position":i,
-                    "cable":c
-                }
-            )
-            self._cables[c].append(
-                {
-                    "position":i,
-                    "cable":p
-                }
-            )
+        if path and os.path.isfile(path):
+            self._permutation_table = PermutationTable(path)
+            self._table = self._permutation_table.table
+        else:
+            self._table = bombe_table(reflector, rotors)
 
-    def _wire_scramblers(self):
+    def _close_table(self):
         """
-        
+        Closes a memory mapped permutation table. It is mapped again by the
+        next solve_range. A table made in memory is kept.
         """
-        self._set_machine()
-        scramblers = []
-
-        for _ in range(26):
-            scrambler = {}
-            for cin in self.LETTERS:
-                cout = self._machine.non_keyed_input(cin)
-                scrambler[cin] = cout
-            scramblers.append(scrambler)
-            self._machine.character_input('A')
-
-        self._scramblers = deque(scramblers)
+        if self._permutation_table is not None:
+            self._table = None
+            self._permutation_table.close()
+            self._permutation_table = None
 
-    def _trace_paths(self, cable, wire):
+    def _wire_bombe(self):
         """
         
         """
-        wires = []
-        self._trace_path(cable, wire, wires)
+        self._engine = RegisterEngine(self._plain_text, self._cipher_text, self._diagonal_board)
 
-    def _trace_path(self, cable, wire, wires):
+    def _wire_scramblers(self):
         """
-        
+        Takes the 26 RF permutations for the RS and RM offsets of the current
+        position from the table. The rows are repeated so the scramblers for
+        every crib position are one slice from any RF offset.
         """
-        # record cable and wire in wires.
-        wires.append(f"{cable}{wire}")
-        # set this wire in this cables register to True.
-        self._registers[cable][self.LETTERS.index(wire)] = True
-        # if diagonal board applicable set wire in connected cable.
-        if (cable != wire) and wire in self._menu_chars and f"{wire}{cable}" not in wires and self._diagonal_board:
-            self._trace_path(wire, cable, wires)
-        # for scrambler connected to cable trace path in connected cables.
-        for scrambler_dict in self._cables[cable]:
-            position = scrambler_dict["position"]
-            conn_cable = scrambler_dict["cable"]
-            scrambler = self._scramblers[position]
-            conn_wire = scrambler[wire]
-            if f"{conn_cable}{conn_wire}" not in wires:
-                self._trace_path(conn_cable, conn_wire, wires)
+        value = self._rotor_settings_gen.value
+        start = (value - value % 26) * 26
+        table = self._table
+        rows = [bytes(table[start + rf*26:start + rf*26 + 26]) for rf in range(26)]
+        self._rows = rows * (len(self._plain_text) // 26 + 2)
 
     def _check_stop(self):
         """
         
         """
-        self._reset_registers()
-        self._trace_paths(self._test_register, 'A')
-        if (self._registers[self._test_register].count(True) == 26):
+        test_register = self.LETTERS.index(self._test_register)
+        stop = self._engine.check_stop(self._scramblers, test_register)
+        if stop is None:
             return False
-        else:
-            # check for 1 or 25 wires
-            for l in self.LETTERS:
-                self._reset_registers()
-                self._trace_paths(self._test_register, l)
-                if (self._registers[self._test_register].count(True) == 25):
-                    # make 1 wire in each registry live and look for contradictions.
-                    self._invert_registers()
-                if (self._registers[self._test_register].count(True) == 1):
-                    if self._valid_registers() and self._no_contradictions() and self._no_consecutive_steckers():
-                        self._record_stop_settings()
-                        self._record_stop(l)
-                        break
-                
-    def _valid_registers(self):
-        """
-        
-        """
-        for c in self._menu_chars:
-            if self._registers[c].count(True) not in [0,1]:
-                return False
-        return True
-
-    def _invert_registers(self):
-        """
-        
-        """
-        for c in self._menu_chars:
-            register = self._registers[c]
-            for i in range(len(register)):
-                if register[i] == True:
-                    register[i] = False
-                elif register[i] == False:
-                    register[i] = True
-
-    def _reset_registers(self):
-        """
-        
-        """
-        self._registers = {l:[False for i in range(26)] for l in self.LETTERS}
-
-    def _no_contradictions(self):
-        """
-        
-        """
-        pairs = {}
-
-        for c1 in self._menu_chars:
-            try:
-                ind = self._registers[c1].index(True)
-            except ValueError:
-                continue
-            else:
-                c2 = self.LETTERS[ind]
-
-                if (c1 in pairs.keys() and c2 != pairs[c1]) or (c2 in pairs.keys() and c1 != pairs[c2]):
-                    return False
-                else:
-                    pairs[c1] = c2
-                    pairs[c2] = c1
-        return True
-    
-    def _no_consecutive_steckers(self):
-        """
-        
-        """
-        steckers = self._stecker_pairs()
-
-        for pair in steckers:
-            n1 = ord(pair[0])
-            n2 = ord(pair[1])
-            if (n1 == 65 and n2 == 90) or (n1 == 90 and n2 == 65):
-                return False
-            elif n2 == n1+1 or n2 == n1-1:
-                return False
+        wire, self._registers = stop
+        self._record_stop_settings(self.LETTERS[wire])
+        self._record_stop(self.LETTERS[wire])
         return True
 
-    def _stecker_pairs(self):
+    def _record_stop_settings(self, c):
         """
         
         """
-        stecker_pairs = []
-
-        for c1 in self._menu_chars:
-            try:
-                ind = self._registers[c1].index(True)
-            except ValueError:
-                continue
-            else:
-                c2 = self.LETTERS[ind]
-                pair = [c1,c2]
-                pair.sort()
-                stecker_pairs.append(pair)
-
-        stecker_pairs = [tuple(pair) for pair in set(tuple(pair) for pair in stecker_pairs)]
-        stecker_pairs = sorted(stecker_pairs, key=lambda x: x[0])
-
-        return stecker_pairs
-
-    def _record_stop_settings(self):
-        """
-        
-        """
-        steckers = self._stecker_pairs()
+        steckers = self._engine.stecker_pairs(self._registers)
 
         stop = {
+            "permutation":self._permutation,
+            "position":self._bombe_settings_str(),
             "settings":self._rotor_settings_gen.settings,
+            "test_wire":c,
             "stecker_pairs":steckers
         }
         self._stops.append(stop)
 
-        steckers_str = f""
-
-        for pair in steckers:
-            steckers_str += f"{pair[0]}{pair[1]} "
-        
-        fpath = os.path.join("bombe_logs",f"{self._permutation}_stops.log")
-
-        with open(fpath,"a+") as f:
-            f.write(f"{self._permutation} {self._bombe_settings_str()} {steckers_str}\n")
-
     def _record_stop(self, c):
         """
         
         """
-        registers_str = f"{self._permutation} {self._bombe_settings_str()}\n"
-        registers_str += self._registers_str(c)
-
-        fpath = os.path.join("bombe_logs",f"{self._permutation}_registers.log")
-
-        with open(fpath, "a+") as f:
-            f.write(f"{registers_str}\n")
+        registers_str = None
+        if self._log.log_format == "text":
+            registers_str = self._registers_str(c)
+        self._log.write_stop(self._stops[-1], self._registers, registers_str)
 
     def _registers_str(self, c):
         """
@@ -393,11 +345,11 @@ class TuringBombe:
         """
         reg_str = f"{l} "
 
-        register = self._registers[l]
-        for b in register:
-            if b:
+        register = self._registers[self.LETTERS.index(l)]
+        for i in range(26):
+            if register >> i & 1:
                 reg_str += '|'
-            elif not b:
+            else:
                 reg_str += '-'
         if l in self._menu_chars:
             reg_str += '='
@@ -440,5 +392,4 @@ class TuringBombe:
         """
         
         """
-        if not os.path.isdir("bombe_logs"):
-            os.mkdir("bombe_logs")
+        self._log = BombeLog(self._permutation, self._log_directory, self._log_format)
@@ -13,6 +13,7 @@ class SheetDataGenerator:
         
         """
         self._machine_obj = make_machine("WEHRMACHT")
+        self._machine_obj.scrambler.permutation_cache_size = 26
 
     def data(self, settings):
         """
@@ -48,10 +49,12 @@ class SheetDataGenerator:
             while True:
                 rot_set = rot_set_gen.settings
                 setting_data = {"G1":[],"G2":[],"G3":[]}
+                self._machine_obj.settings = {"rotor_settings":rotor_settings}
+                self._machine_obj.settings = {"rotor_settings":rot_set}
+                state = self._machine_obj.snapshot()
                 for letter in self.LETTERS:
                     inpt = letter*6
-                    self._machine_obj.settings = {"rotor_settings":rotor_settings}
-                    self._machine_obj.settings = {"rotor_settings":rot_set}
+                    self._machine_obj.restore(state)
                     outp = ""
                     for l in inpt:
                         outp += self._machine_obj.character_input(l)